@@ -20,19 +20,35 @@ import sys
 import os
 import argparse
 import json
+from functools import lru_cache
 from pathlib import Path
+from typing import List, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Add project root to path
-project_root = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(project_root))
+project_root = str(Path(__file__).parent.parent.parent)
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+# The openclaw_stock package pulls in pandas/akshare/requests, so it is imported
+# inside each command rather than here; `--help` and argument errors stay fast.
+
+# Table layouts for the selector commands, bound once at import time
+_SHORT_HEADER = "{:<6}{:<10}{:<20}{:<12}{:<10}{}".format(
+    'Rank', 'Symbol', 'Name', 'Price', 'Score', 'Signals')
+_SHORT_PRICE_FMT = "{:<12.2f}".format
+_SHORT_SCORE_FMT = "{:<10}".format
 
-from src.openclaw_stock import (
-    analyze_stock,
-    short_term_stock_selector,
-    long_term_stock_selector,
-    setup_alert,
-    fetch_realtime_quote,
-)
+_LONG_HEADER = "{:<6}{:<10}{:<16}{:<10}{:<8}{:<8}{:<8}".format(
+    'Rank', 'Symbol', 'Name', 'Price', 'PE', 'ROE', 'Score')
+_LONG_PRICE_FMT = "{:<10.2f}".format
+_LONG_SCORE_FMT = "{:<8}".format
+_RATIO_FMT = "{:.2f}".format
+_PERCENT_FMT = "{:.2f}%".format
 
 
 def cmd_analyze(args):
@@ -40,6 +56,8 @@ def cmd_analyze(args):
     print(f"Analyzing {args.market}:{args.symbol}...")
 
     try:
+        from src.openclaw_stock import analyze_stock
+
         result = analyze_stock(
             symbol=args.symbol,
             market=args.market,
@@ -50,22 +68,34 @@ def cmd_analyze(args):
         basic = result.get('basic_info', {})
         prediction = result.get('prediction', {})
 
-        print("\n" + "="*60)
-        print(f"股票: {basic.get('name', 'N/A')} ({args.symbol})")
-        print(f"当前价格: {basic.get('current_price', 'N/A')}")
-        print(f"涨跌幅: {basic.get('change_pct', 'N/A')}%")
-        print("="*60)
+        summary = (
+            "\n" + "="*60 + "\n"
+            f"股票: {basic.get('name', 'N/A')} ({args.symbol})\n"
+            f"当前价格: {basic.get('current_price', 'N/A')}\n"
+            f"涨跌幅: {basic.get('change_pct', 'N/A')}%\n"
+            + "="*60 + "\n"
+        )
 
         if prediction:
-            print(f"\n预测趋势: {prediction.get('trend_cn', 'N/A')}")
-            print(f"概率: {prediction.get('probability', 0) * 100:.0f}%")
-            print(f"目标价格区间: {prediction.get('target_price_low', 'N/A')} - {prediction.get('target_price_high', 'N/A')}")
-            print(f"操作建议: {prediction.get('recommendation', 'N/A')}")
+            summary += (
+                f"\n预测趋势: {prediction.get('trend_cn', 'N/A')}\n"
+                f"概率: {prediction.get('probability', 0) * 100:.0f}%\n"
+                f"目标价格区间: {prediction.get('target_price_low', 'N/A')} - {prediction.get('target_price_high', 'N/A')}\n"
+                f"操作建议: {prediction.get('recommendation', 'N/A')}\n"
+            )
+
+        sys.stdout.write(summary)
 
         # Save full result to file if requested
         if args.output:
-            with open(args.output, 'w', encoding='utf-8') as f:
-                json.dump(result, f, ensure_ascii=False, indent=2)
+            if orjson is not None:
+                Path(args.output).write_bytes(orjson.dumps(
+                    result,
+                    option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+                ))
+            else:
+                with open(args.output, 'w', encoding='utf-8') as f:
+                    json.dump(result, f, ensure_ascii=False, indent=2)
             print(f"\nFull result saved to: {args.output}")
 
         return 0
@@ -80,6 +110,9 @@ def cmd_select_short(args):
     print(f"Running short-term stock selection (top {args.top_n})...")
 
     try:
+        import pandas as pd
+        from src.openclaw_stock import short_term_stock_selector
+
         df = short_term_stock_selector(
             min_price=args.min_price,
             max_price=args.max_price,
@@ -91,15 +124,25 @@ def cmd_select_short(args):
             print("No stocks found matching criteria.")
             return 0
 
-        # Print results
-        print("\n" + "="*80)
-        print(f"{'Rank':<6}{'Symbol':<10}{'Name':<20}{'Price':<12}{'Score':<10}{'Signals'}")
-        print("="*80)
-
-        for idx, row in df.iterrows():
-            rank = idx + 1
-            print(f"{rank:<6}{row['symbol']:<10}{row['name'][:18]:<20}"
-                  f"{row['price']:<12.2f}{row['total_score']:<10}{row['signals'][:30]}")
+        # Print results (header and rows in a single write)
+        header = [
+            "",
+            "="*80,
+            _SHORT_HEADER,
+            "="*80,
+        ]
+
+        # Format whole columns at once instead of iterating rows
+        rank = pd.Series(df.index + 1, index=df.index).astype(str)
+        lines = (
+            rank.str.ljust(6)
+            + df['symbol'].astype(str).str.ljust(10)
+            + df['name'].astype(str).str.slice(0, 18).str.ljust(20)
+            + df['price'].map(_SHORT_PRICE_FMT)
+            + df['total_score'].map(_SHORT_SCORE_FMT)
+            + df['signals'].astype(str).str.slice(0, 30)
+        )
+        sys.stdout.write("\n".join(header + lines.tolist()) + "\n")
 
         # Save to file if requested
         if args.output:
@@ -118,6 +161,9 @@ def cmd_select_long(args):
     print(f"Running long-term stock selection (top {args.top_n})...")
 
     try:
+        import pandas as pd
+        from src.openclaw_stock import long_term_stock_selector
+
         df = long_term_stock_selector(
             min_roe=args.min_roe,
             max_pe=args.max_pe,
@@ -129,17 +175,29 @@ def cmd_select_long(args):
             print("No stocks found matching criteria.")
             return 0
 
-        # Print results
-        print("\n" + "="*90)
-        print(f"{'Rank':<6}{'Symbol':<10}{'Name':<16}{'Price':<10}{'PE':<8}{'ROE':<8}{'Score':<8}")
-        print("="*90)
-
-        for idx, row in df.iterrows():
-            rank = idx + 1
-            pe = f"{row['pe_ttm']:.2f}" if pd.notna(row.get('pe_ttm')) else 'N/A'
-            roe = f"{row['roe']:.2f}%" if pd.notna(row.get('roe')) else 'N/A'
-            print(f"{rank:<6}{row['symbol']:<10}{row['name'][:14]:<16}"
-                  f"{row['price']:<10.2f}{pe:<8}{roe:<8}{row['total_score']:<8}")
+        # Print results (header and rows in a single write)
+        header = [
+            "",
+            "="*90,
+            _LONG_HEADER,
+            "="*90,
+        ]
+
+        # Format whole columns at once instead of iterating rows
+        missing = pd.Series(float('nan'), index=df.index)
+        pe_ttm = df.get('pe_ttm', missing)
+        roe = df.get('roe', missing)
+        rank = pd.Series(df.index + 1, index=df.index).astype(str)
+        lines = (
+            rank.str.ljust(6)
+            + df['symbol'].astype(str).str.ljust(10)
+            + df['name'].astype(str).str.slice(0, 14).str.ljust(16)
+            + df['price'].map(_LONG_PRICE_FMT)
+            + pe_ttm.map(_RATIO_FMT).where(pe_ttm.notna(), 'N/A').str.ljust(8)
+            + roe.map(_PERCENT_FMT).where(roe.notna(), 'N/A').str.ljust(8)
+            + df['total_score'].map(_LONG_SCORE_FMT)
+        )
+        sys.stdout.write("\n".join(header + lines.tolist()) + "\n")
 
         # Save to file if requested
         if args.output:
@@ -158,6 +216,8 @@ def cmd_alert_setup(args):
     print(f"Setting up alert for {args.symbol}...")
 
     try:
+        from src.openclaw_stock import setup_alert
+
         # Parse condition
         condition = {}
         if ':' in args.condition:
@@ -173,12 +233,14 @@ def cmd_alert_setup(args):
             expires_in_hours=args.expires
         )
 
-        print(f"\nAlert setup successfully!")
-        print(f"Alert ID: {alert_id}")
-        print(f"Symbol: {args.symbol}")
-        print(f"Type: {args.type}")
-        print(f"Condition: {args.condition}")
-        print(f"Notification: {args.notify}")
+        sys.stdout.write(
+            f"\nAlert setup successfully!\n"
+            f"Alert ID: {alert_id}\n"
+            f"Symbol: {args.symbol}\n"
+            f"Type: {args.type}\n"
+            f"Condition: {args.condition}\n"
+            f"Notification: {args.notify}\n"
+        )
 
         return 0
 
@@ -187,7 +249,9 @@ def cmd_alert_setup(args):
         return 1
 
 
-def main():
+@lru_cache(maxsize=1)
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the CLI parser once; repeated in-process calls reuse it"""
     parser = argparse.ArgumentParser(
         description='Stock Analysis and Selection Tool',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -251,7 +315,13 @@ Examples:
                              help='Expiration time in hours (default: 24)')
     alert_parser.set_defaults(func=cmd_alert_setup)
 
-    args = parser.parse_args()
+    return parser
+
+
+def parse_args_and_dispatch(argv: Optional[List[str]] = None) -> int:
+    """Parse explicit argv (defaults to sys.argv) and run the selected command"""
+    parser = _build_parser()
+    args = parser.parse_args(argv)
 
     if not args.command:
         parser.print_help()
@@ -260,5 +330,9 @@ Examples:
     return args.func(args)
 
 
+def main():
+    return parse_args_and_dispatch()
+
+
 if __name__ == '__main__':
     sys.exit(main())
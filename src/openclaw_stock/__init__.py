@@ -34,82 +34,104 @@ OpenClaw Stock Research - 股票分析与选股系统
 __version__ = "1.0.0"
 __author__ = "OpenClaw Team"
 
+import importlib
+from typing import Any, Dict
+
 # 核心接口导出
+#
+# 各子模块会间接导入 pandas/akshare 等重量级依赖，这里按 PEP 562
+# 在首次访问时才导入对应子模块，`import openclaw_stock` 本身保持轻量。
+_LAZY_IMPORTS: Dict[str, str] = {
+    # 数据采集接口 (4.1节)
+    **dict.fromkeys([
+        # 行情数据
+        "fetch_market_data",
+        "fetch_realtime_quote",
+        "fetch_kline_data",
+        "MarketDataCollector",
+        # 财务数据
+        "fetch_financial_data",
+        "fetch_financial_report",
+        "FinancialDataCollector",
+        # 资金流向
+        "fetch_fund_flow",
+        "fetch_capital_flow",
+        "fetch_north_bound_flow",
+        "FundFlowCollector",
+        # 新闻数据
+        "fetch_stock_news",
+        "NewsDataCollector",
+    ], ".data"),
+
+    # 指标计算接口 (4.2节)
+    **dict.fromkeys([
+        # 技术指标
+        "calculate_technical_indicators",
+        "calculate_support_resistance",
+        "TechnicalAnalyzer",
+        # 基本面指标
+        "calculate_fundamental_indicators",
+        "FundamentalAnalyzer",
+        # 综合分析
+        "analyze_stock",
+        "StockAnalyzer",
+        "PredictionResult",
+    ], ".analysis"),
+
+    # 选股接口 (4.3节)
+    **dict.fromkeys([
+        # 短期选股
+        "short_term_stock_selector",
+        "ShortTermSelector",
+        "TechnicalBreakthroughStrategy",
+        "CapitalDrivenStrategy",
+        "EventDrivenStrategy",
+        "SentimentResonanceStrategy",
+        # 中长期选股
+        "long_term_stock_selector",
+        "LongTermSelector",
+        "ValueInvestingStrategy",
+        "GrowthInvestingStrategy",
+        "TrendInvestingStrategy",
+        "DistressReversalStrategy",
+        # 评分模型
+        "ScoringModel",
+    ], ".selection"),
+
+    # 预警接口 (4.5节)
+    **dict.fromkeys([
+        "setup_alert",
+        "remove_alert",
+        "list_alerts",
+        "AlertSystem",
+        "PriceAlert",
+        "VolumeAlert",
+        "TechnicalAlert",
+    ], ".alert"),
+
+    # 数据模型（纯字典版本）
+    **dict.fromkeys([
+        "create_stock_symbol",
+        "create_realtime_quote",
+        "create_fundamental_data",
+        "create_capital_flow_data",
+    ], ".core.models"),
+}
+
+
+def __getattr__(name: str) -> Any:
+    """首次访问时导入接口所在子模块，并缓存到模块命名空间"""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
 
-# 数据采集接口 (4.1节)
-from .data import (
-    # 行情数据
-    fetch_market_data,
-    fetch_realtime_quote,
-    fetch_kline_data,
-    MarketDataCollector,
-    # 财务数据
-    fetch_financial_data,
-    fetch_financial_report,
-    FinancialDataCollector,
-    # 资金流向
-    fetch_fund_flow,
-    fetch_capital_flow,
-    fetch_north_bound_flow,
-    FundFlowCollector,
-    # 新闻数据
-    fetch_stock_news,
-    NewsDataCollector,
-)
-
-# 指标计算接口 (4.2节)
-from .analysis import (
-    # 技术指标
-    calculate_technical_indicators,
-    calculate_support_resistance,
-    TechnicalAnalyzer,
-    # 基本面指标
-    calculate_fundamental_indicators,
-    FundamentalAnalyzer,
-    # 综合分析
-    analyze_stock,
-    StockAnalyzer,
-    PredictionResult,
-)
-
-# 选股接口 (4.3节)
-from .selection import (
-    # 短期选股
-    short_term_stock_selector,
-    ShortTermSelector,
-    TechnicalBreakthroughStrategy,
-    CapitalDrivenStrategy,
-    EventDrivenStrategy,
-    SentimentResonanceStrategy,
-    # 中长期选股
-    long_term_stock_selector,
-    LongTermSelector,
-    ValueInvestingStrategy,
-    GrowthInvestingStrategy,
-    TrendInvestingStrategy,
-    DistressReversalStrategy,
-    # 评分模型
-    ScoringModel,
-)
-
-# 预警接口 (4.5节)
-from .alert import (
-    setup_alert,
-    remove_alert,
-    list_alerts,
-    AlertSystem,
-    PriceAlert,
-    VolumeAlert,
-    TechnicalAlert,
-)
-
-# 数据模型（纯字典版本）
-from .core.models import (
-    create_stock_symbol,
-    create_realtime_quote,
-    create_fundamental_data,
-    create_capital_flow_data,
-)
 
 __all__ = [
     # 版本信息
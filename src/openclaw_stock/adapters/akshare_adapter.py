@@ -4,8 +4,9 @@ AkShare数据适配器
 封装AkShare库的调用，统一数据格式和错误处理
 """
 
-from typing import Optional, Literal, List, Dict, Any
-from datetime import datetime
+from functools import partial
+from typing import Optional, Literal, Dict, Any, Callable, ClassVar, Tuple
+from datetime import datetime, timedelta
 import pandas as pd
 
 try:
@@ -13,11 +14,14 @@ try:
 except ImportError:
     ak = None
 
-from ..core.exceptions import DataSourceError, SymbolNotFoundError
+from ..core.exceptions import DataSourceError
 from ..utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# A股代码首位 -> 交易所前缀，未列出的默认为深市
+_MARKET_PREFIX = {"6": "sh"}
+
 
 class AKShareAdapter:
     """
@@ -26,6 +30,12 @@ class AKShareAdapter:
     封装所有AkShare原始调用，提供统一的接口和数据格式
     """
 
+    _instance: ClassVar[Optional["AKShareAdapter"]] = None
+    _initialized = False
+
+    # akshare 模块在导入本模块时加载一次，各方法直接访问，无需逐次检查
+    _ak: ClassVar[Any] = ak
+
     # 市场代码映射
     MARKET_MAP = {
         "sh": "sh",
@@ -40,30 +50,38 @@ class AKShareAdapter:
         "monthly": "monthly"
     }
 
+    # 复权方式
+    ADJUSTS = ("", "qfq", "hfq")
+
+    # 未指定开始日期时默认回看的自然日数（与 AKShareAdapterEM 一致）
+    DEFAULT_LOOKBACK_DAYS = 400
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
     def __init__(self):
+        if self._initialized:
+            return
+        if self._ak is None:
+            logger.error("[AKShareAdapter] 无法导入AkShare，请安装 akshare 或调用 enable_akshare()")
+            raise DataSourceError("无法导入AkShare，请安装 akshare")
         self._cache: Dict[str, Any] = {}
-        self._ak = None  # 延迟导入akshare
+        # (period, adjust) 组合有限，预先绑定好参数，调用时只需传代码和日期
+        self._hist_variants: Dict[Tuple[str, str], Callable[..., pd.DataFrame]] = {}
+        self._hk_hist_variants: Dict[Tuple[str, str], Callable[..., pd.DataFrame]] = {}
+        for period in self.PERIOD_MAP:
+            for adjust in self.ADJUSTS:
+                self._hist_variants[(period, adjust)] = partial(
+                    self._ak.stock_zh_a_hist, period=period, adjust=adjust
+                )
+                self._hk_hist_variants[(period, adjust)] = partial(
+                    self._ak.stock_hk_hist, period=period, adjust=adjust
+                )
+        self._initialized = True
 
 
-def _get_ak(self):
-    """延迟导入akshare"""
-    global ak
-    if self._ak is None:
-        if ak is not None:
-            self._ak = ak
-        else:
-            try:
-                import akshare as ak_module
-            except ImportError as e:
-                logger.error(f"[AKShareAdapter] 无法导入AkShare: {str(e)}")
-                raise DataSourceError(f"无法导入AkShare： {str(e)}")
-            else:
-                ak = ak_module
-                self._ak = ak_module
-        if self._ak:
-            logger.debug("[AKShareAdapter] AkShare库加载成功")
-    return self._ak
-
     def _format_hk_symbol(self, symbol: str) -> str:
         """
         格式化港股代码
@@ -76,7 +94,10 @@ def _get_ak(self):
         Returns:
             格式化后的代码
         """
-        return symbol.lstrip("0") or "0"
+        try:
+            return str(int(symbol))
+        except ValueError:
+            return symbol
 
     def get_stock_zh_a_spot(self) -> pd.DataFrame:
         """
@@ -86,13 +107,12 @@ def _get_ak(self):
             DataFrame包含所有A股的实时行情
         """
         try:
-            ak = self._get_ak()
             logger.debug("[AKShareAdapter] 获取A股实时行情...")
-            df = ak.stock_zh_a_spot_em()
-            logger.info(f"[AKShareAdapter] 成功获取A股实时行情，共{len(df)}条记录")
+            df = self._ak.stock_zh_a_spot_em()
+            logger.info("[AKShareAdapter] 成功获取A股实时行情，共%d条记录", len(df))
             return df
         except Exception as e:
-            logger.error(f"[AKShareAdapter] 获取A股行情失败: {str(e)}")
+            logger.error("[AKShareAdapter] 获取A股行情失败: %s", e)
             raise DataSourceError(f"获取A股行情失败: {str(e)}")
 
     def get_stock_hk_spot(self) -> pd.DataFrame:
@@ -103,22 +123,27 @@ def _get_ak(self):
             DataFrame包含港股的实时行情
         """
         try:
-            ak = self._get_ak()
             logger.debug("[AKShareAdapter] 获取港股实时行情...")
-            df = ak.stock_hk_spot_em()
-            logger.info(f"[AKShareAdapter] 成功获取港股实时行情，共{len(df)}条记录")
+            df = self._ak.stock_hk_spot_em()
+            logger.info("[AKShareAdapter] 成功获取港股实时行情，共%d条记录", len(df))
             return df
         except Exception as e:
-            logger.error(f"[AKShareAdapter] 获取港股行情失败: {str(e)}")
+            logger.error("[AKShareAdapter] 获取港股行情失败: %s", e)
             raise DataSourceError(f"获取港股行情失败: {str(e)}")
 
+    def _default_start_date(self, lookback_days: Optional[int] = None) -> str:
+        """按回看天数推算默认开始日期（YYYYMMDD）"""
+        days = lookback_days or self.DEFAULT_LOOKBACK_DAYS
+        return (datetime.now() - timedelta(days=days)).strftime("%Y%m%d")
+
     def get_stock_zh_a_hist(
         self,
         symbol: str,
         period: Literal["daily", "weekly", "monthly"] = "daily",
         start_date: Optional[str] = None,
         end_date: Optional[str] = None,
-        adjust: Literal["", "qfq", "hfq"] = "qfq"
+        adjust: Literal["", "qfq", "hfq"] = "qfq",
+        lookback_days: Optional[int] = None
     ) -> pd.DataFrame:
         """
         获取A股历史K线数据
@@ -126,36 +151,36 @@ def _get_ak(self):
         Args:
             symbol: 股票代码（如 "000001"）
             period: K线周期（daily/weekly/monthly）
-            start_date: 开始日期（YYYYMMDD）
+            start_date: 开始日期（YYYYMMDD），未指定时按 lookback_days 推算
             end_date: 结束日期（YYYYMMDD）
             adjust: 复权方式（""-不复权, qfq-前复权, hfq-后复权）
+            lookback_days: 未指定开始日期时回看的自然日数，默认 DEFAULT_LOOKBACK_DAYS；
+                需要完整历史时显式传入 start_date="19700101"
 
         Returns:
             DataFrame包含K线数据
         """
         try:
-            ak = self._get_ak()
-            logger.debug(f"[AKShareAdapter] 获取 {symbol} 的 {period} K线数据...")
+            logger.debug("[AKShareAdapter] 获取 %s 的 %s K线数据...", symbol, period)
 
-            # 设置默认日期范围
+            # 设置默认日期范围（默认只回看 lookback_days，不请求完整历史）
             if not start_date:
-                start_date = "19700101"
+                start_date = self._default_start_date(lookback_days)
             if not end_date:
                 end_date = datetime.now().strftime("%Y%m%d")
 
-            df = ak.stock_zh_a_hist(
-                symbol=symbol,
+            fetch = self._hist_variants.get((period, adjust)) or partial(
+                self._ak.stock_zh_a_hist,
                 period=self.PERIOD_MAP.get(period, "daily"),
-                start_date=start_date,
-                end_date=end_date,
                 adjust=adjust
             )
+            df = fetch(symbol=symbol, start_date=start_date, end_date=end_date)
 
-            logger.info(f"[AKShareAdapter] 成功获取 {symbol} 的 {len(df)} 条K线数据")
+            logger.info("[AKShareAdapter] 成功获取 %s 的 %d 条K线数据", symbol, len(df))
             return df
 
         except Exception as e:
-            logger.error(f"[AKShareAdapter] 获取K线数据失败: {str(e)}")
+            logger.error("[AKShareAdapter] 获取K线数据失败: %s", e)
             raise DataSourceError(f"获取{symbol}的K线数据失败: {str(e)}")
 
     def get_stock_hk_hist(
@@ -164,7 +189,8 @@ def _get_ak(self):
         period: Literal["daily", "weekly", "monthly"] = "daily",
         start_date: Optional[str] = None,
         end_date: Optional[str] = None,
-        adjust: Literal["", "qfq", "hfq"] = "qfq"
+        adjust: Literal["", "qfq", "hfq"] = "qfq",
+        lookback_days: Optional[int] = None
     ) -> pd.DataFrame:
         """
         获取港股历史K线数据
@@ -172,39 +198,38 @@ def _get_ak(self):
         Args:
             symbol: 股票代码（如 "00700"）
             period: K线周期
-            start_date: 开始日期（YYYYMMDD）
+            start_date: 开始日期（YYYYMMDD），未指定时按 lookback_days 推算
             end_date: 结束日期（YYYYMMDD）
             adjust: 复权方式
+            lookback_days: 未指定开始日期时回看的自然日数，默认 DEFAULT_LOOKBACK_DAYS
 
         Returns:
             DataFrame包含K线数据
         """
         try:
-            ak = self._get_ak()
-            logger.debug(f"[AKShareAdapter] 获取港股 {symbol} 的 {period} K线数据...")
+            logger.debug("[AKShareAdapter] 获取港股 %s 的 %s K线数据...", symbol, period)
 
-            # 设置默认日期范围
+            # 设置默认日期范围（默认只回看 lookback_days，不请求完整历史）
             if not start_date:
-                start_date = "19700101"
+                start_date = self._default_start_date(lookback_days)
             if not end_date:
                 end_date = datetime.now().strftime("%Y%m%d")
 
             # 港股代码处理（去除前导零）
             symbol_clean = self._format_hk_symbol(symbol)
 
-            df = ak.stock_hk_hist(
-                symbol=symbol_clean,
+            fetch = self._hk_hist_variants.get((period, adjust)) or partial(
+                self._ak.stock_hk_hist,
                 period=self.PERIOD_MAP.get(period, "daily"),
-                start_date=start_date,
-                end_date=end_date,
                 adjust=adjust
             )
+            df = fetch(symbol=symbol_clean, start_date=start_date, end_date=end_date)
 
-            logger.info(f"[AKShareAdapter] 成功获取港股 {symbol} 的 {len(df)} 条K线数据")
+            logger.info("[AKShareAdapter] 成功获取港股 %s 的 %d 条K线数据", symbol, len(df))
             return df
 
         except Exception as e:
-            logger.error(f"[AKShareAdapter] 获取港股K线数据失败: {str(e)}")
+            logger.error("[AKShareAdapter] 获取港股K线数据失败: %s", e)
             raise DataSourceError(f"获取港股{symbol}的K线数据失败: {str(e)}")
 
     def get_stock_individual_info_em(self, symbol: str) -> pd.DataFrame:
@@ -218,13 +243,12 @@ def _get_ak(self):
             DataFrame包含个股信息
         """
         try:
-            ak = self._get_ak()
-            logger.debug(f"[AKShareAdapter] 获取 {symbol} 的基本面数据...")
-            df = ak.stock_individual_info_em(symbol=symbol)
-            logger.info(f"[AKShareAdapter] 成功获取 {symbol} 的基本面数据")
+            logger.debug("[AKShareAdapter] 获取 %s 的基本面数据...", symbol)
+            df = self._ak.stock_individual_info_em(symbol=symbol)
+            logger.info("[AKShareAdapter] 成功获取 %s 的基本面数据", symbol)
             return df
         except Exception as e:
-            logger.error(f"[AKShareAdapter] 获取基本面数据失败: {str(e)}")
+            logger.error("[AKShareAdapter] 获取基本面数据失败: %s", e)
             raise DataSourceError(f"获取{symbol}的基本面数据失败: {str(e)}")
 
     def get_stock_hsgt_hist_em(self) -> pd.DataFrame:
@@ -235,13 +259,12 @@ def _get_ak(self):
             DataFrame包含北向资金数据
         """
         try:
-            ak = self._get_ak()
             logger.debug("[AKShareAdapter] 获取北向资金数据...")
-            df = ak.stock_hsgt_hist_em()
-            logger.info(f"[AKShareAdapter] 成功获取北向资金数据，共{len(df)}条记录")
+            df = self._ak.stock_hsgt_hist_em()
+            logger.info("[AKShareAdapter] 成功获取北向资金数据，共%d条记录", len(df))
             return df
         except Exception as e:
-            logger.error(f"[AKShareAdapter] 获取北向资金数据失败: {str(e)}")
+            logger.error("[AKShareAdapter] 获取北向资金数据失败: %s", e)
             raise DataSourceError(f"获取北向资金数据失败: {str(e)}")
 
     def get_stock_fund_flow_individual(self, symbol: str) -> pd.DataFrame:
@@ -255,41 +278,42 @@ def _get_ak(self):
             DataFrame包含资金流向数据
         """
         try:
-            ak = self._get_ak()
-            logger.debug(f"[AKShareAdapter] 获取 {symbol} 的资金流向数据...")
+            logger.debug("[AKShareAdapter] 获取 %s 的资金流向数据...", symbol)
 
             # 市场前缀处理
-            if symbol.startswith("6"):
-                symbol_full = f"sh{symbol}"
-            else:
-                symbol_full = f"sz{symbol}"
+            symbol_full = f"{_MARKET_PREFIX.get(symbol[:1], 'sz')}{symbol}"
 
-            df = ak.stock_fund_flow_individual(symbol=symbol_full)
-            logger.info(f"[AKShareAdapter] 成功获取 {symbol} 的资金流向数据")
+            df = self._ak.stock_fund_flow_individual(symbol=symbol_full)
+            logger.info("[AKShareAdapter] 成功获取 %s 的资金流向数据", symbol)
             return df
 
         except Exception as e:
-            logger.error(f"[AKShareAdapter] 获取资金流向数据失败: {str(e)}")
+            logger.error("[AKShareAdapter] 获取资金流向数据失败: %s", e)
             raise DataSourceError(f"获取{symbol}的资金流向数据失败: {str(e)}")
 
 
-# 全局适配器实例
-_adapter: Optional[AKShareAdapter] = None
+def enable_akshare() -> None:
+    """
+    加载 akshare 并绑定到 AKShareAdapter
 
+    用于导入本模块时 akshare 尚未安装、之后才可用的场景（如运行时激活虚拟环境）
 
-def get_adapter() -> AKShareAdapter:
+    Raises:
+        DataSourceError: akshare 仍无法导入
     """
-    获取全局AKShare适配器实例
+    global ak
+    try:
+        import akshare as ak_module
+    except ImportError as e:
+        logger.error("[AKShareAdapter] 无法导入AkShare: %s", e)
+        raise DataSourceError(f"无法导入AkShare： {str(e)}")
+    ak = ak_module
+    AKShareAdapter._ak = ak_module
+    logger.debug("[AKShareAdapter] AkShare库加载成功")
 
-    使用单例模式确保适配器只被初始化一次
 
-    Returns:
-        AKShareAdapter实例
-    """
-    global _adapter
-    if _adapter is None:
-        _adapter = AKShareAdapter()
-    return _adapter
+# 获取全局AKShare适配器实例（类本身即单例工厂）
+get_adapter = AKShareAdapter
 
 
 def reset_adapter():
@@ -298,5 +322,4 @@ def reset_adapter():
 
     主要用于测试场景，清除适配器缓存
     """
-    global _adapter
-    _adapter = None
+    AKShareAdapter._instance = None
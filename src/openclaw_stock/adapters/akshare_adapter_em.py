@@ -4,24 +4,210 @@ AkShare数据适配器 - 东方财富版本
 使用东方财富数据源（更稳定）
 """
 
-from typing import Optional, Literal, Dict, Any
-from datetime import datetime
+from typing import Optional, Literal, Dict, Any, Callable, Tuple, List, Union, Iterable, ClassVar, Iterator
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+import asyncio
+import importlib.util
+import logging
+import os
+import threading
+import time
+import numpy as np
 import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
+try:
+    import polars as pl
+except ImportError:
+    pl = None
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+from ..core.config import get_config
 from ..core.exceptions import DataSourceError
 from ..utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# A股代码首位 -> 交易所前缀，未列出的默认为深市
+_MARKET_PREFIX = {"6": "sh"}
+
+# akshare 内部直接调用 requests.get/post，不复用连接；
+# 适配器调用期间将其临时指向带连接池的会话
+_POOL_LOCK = threading.Lock()
+_POOL_DEPTH = 0
+_POOL_SESSION: Optional[requests.Session] = None
+_ORIGINAL_REQUESTS: Dict[str, Callable[..., requests.Response]] = {}
+
+
+@contextmanager
+def pooled_requests() -> Iterator[requests.Session]:
+    """
+    在上下文内让 requests.get/post 复用 keep-alive 连接池
+
+    采用引用计数，支持嵌套和多线程并发进入（如 batch_hist）；
+    最后一个调用方退出时恢复原始函数。
+
+    示例:
+        with pooled_requests():
+            df = ak.stock_zh_a_hist(symbol="000001")
+    """
+    global _POOL_DEPTH, _POOL_SESSION
+    with _POOL_LOCK:
+        if _POOL_SESSION is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=32,
+                pool_maxsize=32,
+                max_retries=Retry(total=3, backoff_factor=0.3)
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _POOL_SESSION = session
+        if _POOL_DEPTH == 0:
+            _ORIGINAL_REQUESTS["get"] = requests.get
+            _ORIGINAL_REQUESTS["post"] = requests.post
+            requests.get = _POOL_SESSION.get
+            requests.post = _POOL_SESSION.post
+        _POOL_DEPTH += 1
+
+    try:
+        yield _POOL_SESSION
+    finally:
+        with _POOL_LOCK:
+            _POOL_DEPTH -= 1
+            if _POOL_DEPTH == 0:
+                requests.get = _ORIGINAL_REQUESTS.pop("get")
+                requests.post = _ORIGINAL_REQUESTS.pop("post")
+
+
+def batch_format_symbols(symbols: Iterable[str]) -> List[str]:
+    """
+    批量为A股代码添加交易所前缀
+
+    对整个代码列表做向量化处理，供全市场资金流向等批量请求一次性预处理；
+    已带 sh/sz 前缀的代码保持不变。
+
+    参数:
+        symbols: 股票代码（如 ["600000", "000001", "sz300750"]）
+
+    返回:
+        带前缀的代码列表（如 ["sh600000", "sz000001", "sz300750"]）
+    """
+    arr = np.char.strip(np.asarray(list(symbols), dtype=str))
+    if arr.size == 0:
+        return []
+    has_prefix = np.char.startswith(arr, "sh") | np.char.startswith(arr, "sz")
+    prefix = np.where(np.char.startswith(arr, "6"), "sh", "sz")
+    return np.where(has_prefix, arr, np.char.add(prefix, arr)).tolist()
+
 
 class AKShareAdapterEM:
-    """使用东方财富数据源的适配器"""
+    """
+    使用东方财富数据源的适配器
+
+    每种 return_type 只创建一个实例，重复调用 AKShareAdapterEM() 返回同一对象，
+    共享 akshare 模块引用和数据缓存。
+    """
+
+    # return_type -> 已初始化的实例
+    _instances: ClassVar[Dict[str, "AKShareAdapterEM"]] = {}
+    _initialized = False
+
+    # 数据项 -> (akshare函数名, 描述, 缓存类别)
+    _AK_SPEC: Dict[str, Tuple[str, str, str]] = {
+        "zh_a_spot": ("stock_zh_a_spot_em", "A股实时行情", "spot"),
+        "hk_spot": ("stock_hk_spot_em", "港股实时行情", "spot"),
+        "zh_a_hist": ("stock_zh_a_hist", "K线数据", "hist"),
+        "hk_hist": ("stock_hk_hist_em", "港股K线数据", "hist"),
+        "individual_info": ("stock_individual_info_em", "基本信息", "fundamental"),
+        "hsgt_hist": ("stock_hsgt_hist_em", "北向资金历史数据", "capital_flow"),
+        "fund_flow": ("stock_fund_flow_individual", "资金流向数据", "capital_flow"),
+        "fund_flow_rank": ("stock_individual_fund_flow_rank", "全市场个股资金流向", "capital_flow"),
+    }
+
+    # 可持久化到磁盘的复权方式：前复权(qfq)会在每次除权后改写全部历史价格，不能增量追加
+    PERSIST_ADJUST = ("", "hfq")
+
+    # 未指定开始日期时默认回看的自然日数（约一年多的日线，足够覆盖年线和常用指标）
+    DEFAULT_LOOKBACK_DAYS = 400
+
+    # get_ohlcv_array 返回数组的列顺序
+    OHLCV_COLUMNS = ("开盘", "最高", "最低", "收盘", "成交量")
+
+    # 各类数据的进程内缓存有效期（秒）
+    CACHE_TTL = {
+        "spot": 5.0,
+        "hist": 3600.0,
+        "fundamental": 86400.0,
+        "capital_flow": 60.0,
+    }
+
+    # 进程内缓存最多保留的条目数，超出时淘汰最久未使用的条目。
+    # 适配器是进程级单例，K线缓存键含日期，全市场扫描时不设上限会一直持有数千份K线
+    CACHE_MAX_ENTRIES = 512
+
+    def __new__(cls, return_type: Literal["pandas", "polars"] = "pandas"):
+        instance = cls._instances.get(return_type)
+        if instance is None:
+            instance = super().__new__(cls)
+        return instance
+
+    def __init__(self, return_type: Literal["pandas", "polars"] = "pandas"):
+        """
+        初始化适配器
 
-    def __init__(self):
-        self._cache: Dict[str, Any] = {}
+        参数:
+            return_type: 返回的 DataFrame 类型，"polars" 需要安装 polars 和 pyarrow
+        """
+        if self._initialized:
+            return
+        if return_type not in ("pandas", "polars"):
+            raise ValueError(f"return_type 只能为 pandas 或 polars: {return_type}")
+        if return_type == "polars" and pl is None:
+            raise ValueError("return_type='polars' 需要安装 polars 和 pyarrow: pip install polars pyarrow")
+
+        self.return_type = return_type
+        # 键 -> (写入时间, 数据)，按最近使用顺序排列
+        self._cache: "OrderedDict[Tuple, Tuple[float, Any]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        # _AK_SPEC 数据项 -> 已绑定的 akshare 函数，首次调用时解析
+        self._ak_funcs: Dict[str, Callable[..., pd.DataFrame]] = {}
         self._ak = None
+        self._kline_dir = self._resolve_kline_dir()
         self._import_akshare()
 
+        # 初始化成功后才登记为单例，导入失败时下次调用会重试
+        self._initialized = True
+        type(self)._instances[return_type] = self
+
+    def _resolve_kline_dir(self) -> Optional[Path]:
+        """
+        获取日K线磁盘缓存目录
+
+        从环境变量 KLINE_CACHE_PATH 读取；未设置或未安装 pyarrow 时不启用
+
+        返回:
+            缓存目录，未启用时返回 None
+        """
+        path = get_config().get("KLINE_CACHE_PATH")
+        if not path:
+            return None
+        if importlib.util.find_spec("pyarrow") is None:
+            logger.warning("[AKShareAdapterEM] 已设置 KLINE_CACHE_PATH 但未安装 pyarrow，K线磁盘缓存未启用")
+            return None
+        kline_dir = Path(path).expanduser()
+        kline_dir.mkdir(parents=True, exist_ok=True)
+        return kline_dir
+
     def _import_akshare(self):
         """导入 akshare"""
         try:
@@ -29,41 +215,199 @@ class AKShareAdapterEM:
             self._ak = ak
             logger.info("[AKShareAdapterEM] akshare 导入成功")
         except ImportError as e:
-            logger.error(f"[AKShareAdapterEM] 无法导入 akshare: {e}")
+            logger.error("[AKShareAdapterEM] 无法导入 akshare: %s", e)
             raise DataSourceError(f"无法导入 akshare: {e}")
 
+    def _cached(
+        self,
+        key: Tuple,
+        ttl: float,
+        loader: Callable[[], pd.DataFrame],
+        columns: Optional[List[str]] = None,
+        downcast: bool = False
+    ) -> pd.DataFrame:
+        """
+        按 TTL 缓存数据源调用结果
+
+        同一筛选流程内重复请求相同数据时只访问一次网络；
+        返回副本，避免调用方修改缓存中的 DataFrame。
+
+        参数:
+            key: 缓存键（方法名 + 调用参数）
+            ttl: 缓存有效期（秒）
+            loader: 缓存未命中时调用的加载函数
+            columns: 只返回这些列（缓存中保留完整数据）
+            downcast: 是否将浮点列降为 float32、代码列转为 category
+
+        返回:
+            DataFrame: 数据副本（return_type="polars" 时为 polars.DataFrame）
+        """
+        return self._to_output(self._cached_frame(key, ttl, loader), columns, downcast)
+
+    def _cached_frame(
+        self,
+        key: Tuple,
+        ttl: float,
+        loader: Callable[[], pd.DataFrame]
+    ) -> pd.DataFrame:
+        """按 TTL 缓存数据源调用结果，返回缓存中的 pandas 数据本身（调用方不得修改）"""
+        now = time.monotonic()
+        df = self._cache_get(key, ttl, now)
+        if df is not None:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("[AKShareAdapterEM] 命中缓存: %s", key[0])
+            return df
+
+        df = loader()
+        self._cache_put(key, df, now)
+        return df
+
+    def _cache_get(self, key: Tuple, ttl: float, now: float) -> Optional[Any]:
+        """读取有效期内的缓存条目并标记为最近使用，不存在或已过期时返回 None（过期条目随即删除）"""
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            if now - entry[0] >= ttl:
+                del self._cache[key]
+                return None
+            self._cache.move_to_end(key)
+            return entry[1]
+
+    def _cache_put(self, key: Tuple, value: Any, now: float) -> None:
+        """写入缓存条目，超出 CACHE_MAX_ENTRIES 时淘汰最久未使用的条目"""
+        with self._cache_lock:
+            self._cache[key] = (now, value)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.CACHE_MAX_ENTRIES:
+                self._cache.popitem(last=False)
+
+    def _to_output(
+        self,
+        df: pd.DataFrame,
+        columns: Optional[List[str]] = None,
+        downcast: bool = False
+    ) -> Any:
+        """将缓存中的 pandas 数据裁剪、降精度并转换为调用方需要的类型（返回副本）"""
+        if columns is not None:
+            df = df.filter(items=columns)
+        elif downcast or self.return_type != "polars":
+            df = df.copy()
+
+        if downcast:
+            for col in df.select_dtypes("float64").columns:
+                df[col] = pd.to_numeric(df[col], downcast="float")
+            if "代码" in df.columns:
+                df["代码"] = df["代码"].astype("category")
+
+        if self.return_type == "polars":
+            return pl.from_pandas(df, rechunk=True)
+        return df
+
+    def clear_cache(self) -> None:
+        """清空进程内数据缓存"""
+        with self._cache_lock:
+            self._cache.clear()
+
+    def _fetch(
+        self,
+        name: str,
+        subject: str = "",
+        *,
+        columns: Optional[List[str]] = None,
+        downcast: bool = False,
+        **kwargs: Any
+    ) -> pd.DataFrame:
+        """
+        按 _AK_SPEC 调用 akshare 函数
+
+        统一处理缓存、日志和异常转换，各 get_* 方法只负责整理参数。
+
+        参数:
+            name: _AK_SPEC 中的数据项名称
+            subject: 日志和错误信息中的对象（如股票代码）
+            columns: 只返回这些列
+            downcast: 是否降低数值精度以节省内存
+            **kwargs: 传给 akshare 函数的参数
+
+        返回:
+            DataFrame: akshare 返回的数据
+
+        Raises:
+            DataSourceError: 数据源访问失败
+        """
+        return self._to_output(self._fetch_frame(name, subject, **kwargs), columns, downcast)
+
+    def _fetch_frame(self, name: str, subject: str = "", **kwargs: Any) -> pd.DataFrame:
+        """同 _fetch，但返回缓存中的 pandas 数据本身，供需要先在 pandas 上切片的方法使用"""
+        key = (name, *sorted(kwargs.items()))
+        return self._cached_frame(
+            key,
+            self.CACHE_TTL[self._AK_SPEC[name][2]],
+            lambda: self._call(name, subject, **kwargs)
+        )
+
+    def _call(self, name: str, subject: str = "", **kwargs: Any) -> pd.DataFrame:
+        """直接请求 _AK_SPEC 中的 akshare 函数（不经过缓存），失败时转换为 DataSourceError"""
+        func_name, desc, _ = self._AK_SPEC[name]
+        try:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("[AKShareAdapterEM] 使用 %s 获取%s%s...", func_name, subject, desc)
+            func = self._ak_funcs.get(name)
+            if func is None:
+                func = self._ak_funcs[name] = getattr(self._ak, func_name)
+            with pooled_requests():
+                df = func(**kwargs)
+            logger.info("[AKShareAdapterEM] 成功获取%s%s，共%d条记录", subject, desc, len(df))
+            return df
+        except Exception as e:
+            logger.error("[AKShareAdapterEM] 获取%s%s失败: %s", subject, desc, e)
+            raise DataSourceError(f"获取{subject}{desc}失败: {e}")
+
     def _format_symbol_for_em(self, symbol: str, market: str) -> str:
         """格式化股票代码为东方财富格式"""
         if market == "hk":
-            # 港股不需要前导零
-            return symbol.lstrip("0") or "0"
+            # 港股不需要前导零（"00700" -> "700", "00000" -> "0"）
+            try:
+                return str(int(symbol))
+            except ValueError:
+                return symbol
         # A股直接使用代码
         return symbol
 
-    def get_stock_zh_a_spot(self) -> pd.DataFrame:
+    def _default_start_date(self, lookback_days: Optional[int] = None) -> str:
+        """按回看天数推算默认开始日期（YYYYMMDD）"""
+        days = lookback_days or self.DEFAULT_LOOKBACK_DAYS
+        return (datetime.now() - timedelta(days=days)).strftime("%Y%m%d")
+
+    def get_stock_zh_a_spot(
+        self,
+        columns: Optional[List[str]] = None,
+        downcast: bool = False
+    ) -> pd.DataFrame:
         """使用东方财富获取A股实时行情
 
         注意: 新浪财经数据源经常被限制，所以直接使用东方财富数据源
+
+        参数:
+            columns: 只返回这些列（如 ["代码", "名称", "最新价", "涨跌幅"]），默认全部
+            downcast: 浮点列降为 float32、代码列转为 category，
+                适合全市场横截面计算；需要精确报价时保持默认 False
         """
-        try:
-            logger.debug("[AKShareAdapterEM] 使用 stock_zh_a_spot_em (东方财富) 获取A股实时行情...")
-            df = self._ak.stock_zh_a_spot_em()
-            logger.info(f"[AKShareAdapterEM] 成功从东方财富获取A股实时行情，共{len(df)}条记录")
-            return df
-        except Exception as e:
-            logger.error(f"[AKShareAdapterEM] 东方财富数据源失败: {e}")
-            raise DataSourceError(f"获取A股行情失败: {e}")
+        return self._fetch("zh_a_spot", columns=columns, downcast=downcast)
 
-    def get_stock_hk_spot(self) -> pd.DataFrame:
-        """使用东方财富获取港股实时行情"""
-        try:
-            logger.debug("[AKShareAdapterEM] 使用 stock_hk_spot_em 获取港股实时行情...")
-            df = self._ak.stock_hk_spot_em()
-            logger.info(f"[AKShareAdapterEM] 成功获取港股实时行情，共{len(df)}条记录")
-            return df
-        except Exception as e:
-            logger.error(f"[AKShareAdapterEM] 获取港股行情失败: {e}")
-            raise DataSourceError(f"获取港股行情失败: {e}")
+    def get_stock_hk_spot(
+        self,
+        columns: Optional[List[str]] = None,
+        downcast: bool = False
+    ) -> pd.DataFrame:
+        """使用东方财富获取港股实时行情
+
+        参数:
+            columns: 只返回这些列，默认全部
+            downcast: 浮点列降为 float32、代码列转为 category
+        """
+        return self._fetch("hk_spot", columns=columns, downcast=downcast)
 
     def get_stock_zh_a_hist(
         self,
@@ -71,30 +415,141 @@ class AKShareAdapterEM:
         period: Literal["daily", "weekly", "monthly"] = "daily",
         start_date: Optional[str] = None,
         end_date: Optional[str] = None,
-        adjust: Literal["", "qfq", "hfq"] = "qfq"
+        adjust: Literal["", "qfq", "hfq"] = "qfq",
+        lookback_days: Optional[int] = None
     ) -> pd.DataFrame:
         """使用东方财富获取A股历史K线数据
 
         使用 stock_zh_a_hist 函数（东方财富数据源）
+
+        参数:
+            start_date: 开始日期（YYYYMMDD），未指定时按 lookback_days 推算
+            lookback_days: 未指定开始日期时回看的自然日数，默认 DEFAULT_LOOKBACK_DAYS；
+                需要完整历史时显式传入 start_date="19700101"
+
+        启用 KLINE_CACHE_PATH 时，不复权/后复权的日线会持久化为 Feather 文件，
+        后续调用只增量请求缓存最后一天之后的数据。
         """
-        try:
-            logger.debug(f"[AKShareAdapterEM] 使用 stock_zh_a_hist 获取 {symbol} 的K线数据...")
+        start_date = start_date or self._default_start_date(lookback_days)
+        end_date = end_date or datetime.now().strftime("%Y%m%d")
+
+        if self._kline_dir is not None and period == "daily" and adjust in self.PERSIST_ADJUST:
+            return self._cached(
+                ("zh_a_hist_persisted", symbol, start_date, end_date, adjust),
+                self.CACHE_TTL["hist"],
+                lambda: self._load_persisted_hist(symbol, start_date, end_date, adjust)
+            )
+
+        return self._fetch(
+            "zh_a_hist",
+            subject=symbol,
+            symbol=symbol,
+            period=period,
+            start_date=start_date,
+            end_date=end_date,
+            adjust=adjust
+        )
+
+    def get_ohlcv_array(self, symbol: str, **kwargs: Any) -> np.ndarray:
+        """
+        获取A股K线的 OHLCV 数值矩阵，供 talib 等数值库直接使用
+
+        参数:
+            symbol: 股票代码
+            **kwargs: 传给 get_stock_zh_a_hist 的参数（period/start_date/adjust 等）
 
-            # 直接使用 akshare 的 stock_zh_a_hist 函数
-            df = self._ak.stock_zh_a_hist(
+        返回:
+            np.ndarray: 形状为 (N, 5) 的只读 float64 数组，列顺序见 OHLCV_COLUMNS。
+                按列主序存储，arr[:, 3] 等单列本身即为连续内存，传给 talib 时无需复制；
+                结果与 K 线同样按 hist 有效期缓存
+        """
+        key = ("ohlcv", symbol, *sorted(kwargs.items()))
+        now = time.monotonic()
+        arr = self._cache_get(key, self.CACHE_TTL["hist"], now)
+        if arr is not None:
+            return arr
+
+        df = self.get_stock_zh_a_hist(symbol, **kwargs)
+        arr = np.asfortranarray(df[list(self.OHLCV_COLUMNS)].to_numpy(), dtype=np.float64)
+        arr.flags.writeable = False
+        self._cache_put(key, arr, now)
+        return arr
+
+    def _load_persisted_hist(
+        self,
+        symbol: str,
+        start_date: str,
+        end_date: str,
+        adjust: str
+    ) -> pd.DataFrame:
+        """
+        从磁盘缓存读取日K线，只请求缺失的部分并写回
+
+        缓存已覆盖开始日期时，从缓存最后一天（含，盘中写入的当日K线会被刷新）
+        请求到结束日期；否则请求完整区间后与缓存合并。
+
+        参数:
+            symbol: 股票代码
+            start_date: 开始日期（YYYYMMDD）
+            end_date: 结束日期（YYYYMMDD）
+            adjust: 复权方式（"" 或 "hfq"）
+
+        返回:
+            DataFrame: [start_date, end_date] 区间内的K线数据
+        """
+        path = self._kline_dir / f"{symbol}_daily_{adjust or 'none'}.feather"
+        start_ts, end_ts = pd.Timestamp(start_date), pd.Timestamp(end_date)
+
+        cached = None
+        if path.exists():
+            try:
+                cached = pd.read_feather(path)
+            except Exception as e:
+                logger.warning("[AKShareAdapterEM] 读取K线缓存失败，重新获取: %s: %s", path, e)
+
+        fetch_start = None
+        if cached is None or cached.empty:
+            cached = None
+            fetch_start, fetch_end = start_ts, end_ts
+        else:
+            dates = pd.to_datetime(cached["日期"])
+            first, last = dates.iloc[0], dates.iloc[-1]
+            if first > start_ts:
+                fetch_start, fetch_end = start_ts, max(end_ts, last)
+            elif end_ts >= last:
+                fetch_start, fetch_end = last, end_ts
+
+        full = cached
+        if fetch_start is not None:
+            fresh = self._call(
+                "zh_a_hist",
+                subject=symbol,
                 symbol=symbol,
-                period=period,
-                start_date=start_date or "19700101",
-                end_date=end_date or datetime.now().strftime("%Y%m%d"),
+                period="daily",
+                start_date=fetch_start.strftime("%Y%m%d"),
+                end_date=fetch_end.strftime("%Y%m%d"),
                 adjust=adjust
             )
-
-            logger.info(f"[AKShareAdapterEM] 成功获取 {symbol} 的 {len(df)} 条K线数据")
-            return df
-
+            full = fresh if cached is None else pd.concat([cached, fresh], ignore_index=True)
+            dates = pd.to_datetime(full["日期"])
+            full = full[~dates.duplicated(keep="last")]
+            full = full.iloc[pd.to_datetime(full["日期"]).argsort(kind="stable")].reset_index(drop=True)
+            self._write_feather(full, path)
+        elif logger.isEnabledFor(logging.DEBUG):
+            logger.debug("[AKShareAdapterEM] 命中K线磁盘缓存: %s", path.name)
+
+        dates = pd.to_datetime(full["日期"])
+        return full[(dates >= start_ts) & (dates <= end_ts)].reset_index(drop=True)
+
+    def _write_feather(self, df: pd.DataFrame, path: Path) -> None:
+        """原子写入 Feather 缓存文件，失败时只记录警告"""
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            df.to_feather(tmp)
+            os.replace(tmp, path)
         except Exception as e:
-            logger.error(f"[AKShareAdapterEM] 获取K线数据失败: {e}")
-            raise DataSourceError(f"获取{symbol}的K线数据失败: {e}")
+            logger.warning("[AKShareAdapterEM] 写入K线缓存失败: %s: %s", path, e)
+            tmp.unlink(missing_ok=True)
 
     def get_stock_hk_hist(
         self,
@@ -102,29 +557,25 @@ class AKShareAdapterEM:
         period: Literal["daily", "weekly", "monthly"] = "daily",
         start_date: Optional[str] = None,
         end_date: Optional[str] = None,
-        adjust: Literal["", "qfq", "hfq"] = "qfq"
+        adjust: Literal["", "qfq", "hfq"] = "qfq",
+        lookback_days: Optional[int] = None
     ) -> pd.DataFrame:
-        """使用东方财富获取港股历史K线数据"""
-        try:
-            logger.debug(f"[AKShareAdapterEM] 使用 stock_hk_hist_em 获取 {symbol} 的K线数据...")
+        """使用东方财富获取港股历史K线数据
 
+        参数:
+            start_date: 开始日期（YYYYMMDD），未指定时按 lookback_days 推算
+            lookback_days: 未指定开始日期时回看的自然日数，默认 DEFAULT_LOOKBACK_DAYS
+        """
+        return self._fetch(
+            "hk_hist",
+            subject=symbol,
             # 港股需要去除前导零
-            symbol_clean = self._format_symbol_for_em(symbol, "hk")
-
-            df = self._ak.stock_hk_hist_em(
-                symbol=symbol_clean,
-                period=period,
-                start_date=start_date or "19700101",
-                end_date=end_date or datetime.now().strftime("%Y%m%d"),
-                adjust=adjust
-            )
-
-            logger.info(f"[AKShareAdapterEM] 成功获取港股 {symbol} 的 {len(df)} 条K线数据")
-            return df
-
-        except Exception as e:
-            logger.error(f"[AKShareAdapterEM] 获取港股K线数据失败: {e}")
-            raise DataSourceError(f"获取港股{symbol}的K线数据失败: {e}")
+            symbol=self._format_symbol_for_em(symbol, "hk"),
+            period=period,
+            start_date=start_date or self._default_start_date(lookback_days),
+            end_date=end_date or datetime.now().strftime("%Y%m%d"),
+            adjust=adjust
+        )
 
     def get_stock_individual_info_em(self, symbol: str) -> pd.DataFrame:
         """
@@ -138,17 +589,7 @@ class AKShareAdapterEM:
         返回:
             DataFrame: 个股基本信息
         """
-        try:
-            logger.debug(f"[AKShareAdapterEM] 获取 {symbol} 的基本信息...")
-
-            df = self._ak.stock_individual_info_em(symbol=symbol)
-
-            logger.info(f"[AKShareAdapterEM] 成功获取 {symbol} 的基本信息")
-            return df
-
-        except Exception as e:
-            logger.error(f"[AKShareAdapterEM] 获取个股基本信息失败: {e}")
-            raise DataSourceError(f"获取{symbol}基本信息失败: {e}")
+        return self._fetch("individual_info", subject=symbol, symbol=symbol)
 
     def get_stock_hsgt_hist_em(self) -> pd.DataFrame:
         """
@@ -159,19 +600,9 @@ class AKShareAdapterEM:
         返回:
             DataFrame: 北向资金历史数据
         """
-        try:
-            logger.debug("[AKShareAdapterEM] 获取北向资金历史数据...")
-
-            df = self._ak.stock_hsgt_hist_em()
-
-            logger.info(f"[AKShareAdapterEM] 成功获取北向资金历史数据，共{len(df)}条")
-            return df
+        return self._fetch("hsgt_hist")
 
-        except Exception as e:
-            logger.error(f"[AKShareAdapterEM] 获取北向资金数据失败: {e}")
-            raise DataSourceError(f"获取北向资金数据失败: {e}")
-
-    def get_stock_fund_flow_individual(self, symbol: str) -> pd.DataFrame:
+    def get_stock_fund_flow_individual(self, symbol: str, return_arrow: bool = False) -> Any:
         """
         获取个股资金流向数据
 
@@ -179,38 +610,180 @@ class AKShareAdapterEM:
 
         参数:
             symbol: 股票代码（如 "000001"）
+            return_arrow: 返回 pyarrow.Table，便于用 pyarrow.compute 做横截面排序/筛选
 
         返回:
-            DataFrame: 个股资金流向数据
+            DataFrame: 个股资金流向数据（return_arrow=True 时为 pyarrow.Table）
         """
-        try:
-            logger.debug(f"[AKShareAdapterEM] 获取 {symbol} 的资金流向数据...")
+        symbol_clean = symbol.strip()
+        if symbol_clean[:2] in ("sh", "sz"):
+            symbol_for_request = symbol_clean
+        else:
+            symbol_for_request = f"{_MARKET_PREFIX.get(symbol_clean[:1], 'sz')}{symbol_clean}"
+
+        df = self._fetch("fund_flow", subject=symbol, symbol=symbol_for_request)
+        if return_arrow:
+            return self._to_arrow(df)
+        return df
+
+    def get_fund_flow_all(self, indicator: str = "今日") -> pd.DataFrame:
+        """
+        一次请求获取全市场个股资金流向排名
+
+        使用 akshare 的 stock_individual_fund_flow_rank 函数，
+        全市场横截面分析时代替逐只调用 get_stock_fund_flow_individual
 
-            symbol_clean = symbol.strip()
-            if symbol_clean.startswith(('sh', 'sz')):
-                symbol_for_request = symbol_clean
-            elif symbol_clean.startswith('6'):
-                symbol_for_request = f"sh{symbol_clean}"
-            else:
-                symbol_for_request = f"sz{symbol_clean}"
+        参数:
+            indicator: 统计区间（"今日"/"3日"/"5日"/"10日"）
 
-            df = self._ak.stock_fund_flow_individual(symbol=symbol_for_request)
+        返回:
+            DataFrame: 全市场个股资金流向
+        """
+        return self._fetch("fund_flow_rank", indicator=indicator)
 
-            logger.info(f"[AKShareAdapterEM] 成功获取 {symbol} 的资金流向数据")
-            return df
+    def get_fund_flow_for_symbols(
+        self,
+        symbols: List[str],
+        indicator: str = "今日"
+    ) -> pd.DataFrame:
+        """
+        从全市场资金流向中按代码取出指定股票
+
+        参数:
+            symbols: 股票代码列表（不带市场前缀）
+            indicator: 统计区间
+
+        返回:
+            DataFrame: 以代码为索引、顺序与 symbols 一致；快照中不存在的代码整行为空。
+                return_type="polars" 时代码为首列（polars 没有索引）
+        """
+        # 在缓存的 pandas 数据上切片，再按 return_type 转换
+        df = self._fetch_frame("fund_flow_rank", indicator=indicator)
+        df = df.drop_duplicates("代码").set_index("代码").reindex(symbols)
+        if self.return_type == "polars":
+            return self._to_output(df.reset_index())
+        return df
+
+    def _to_arrow(self, df: Any) -> "pa.Table":
+        """将 pandas/polars 数据转换为 pyarrow.Table"""
+        if pa is None:
+            raise ValueError("return_arrow=True 需要安装 pyarrow: pip install pyarrow")
+        if pl is not None and isinstance(df, pl.DataFrame):
+            return df.to_arrow()
+        return pa.Table.from_pandas(df, preserve_index=False)
+
+    async def _gather_by_symbol(
+        self,
+        fetch: Callable[..., pd.DataFrame],
+        symbols: List[str],
+        max_concurrency: int,
+        **kwargs: Any
+    ) -> Dict[str, Union[pd.DataFrame, Exception]]:
+        """
+        在线程池中并发执行逐只股票的同步请求
+
+        akshare 请求以网络等待为主，使用信号量限制并发数，避免触发数据源限流。
+
+        参数:
+            fetch: 同步获取函数（如 self.get_stock_zh_a_hist）
+            symbols: 股票代码列表
+            max_concurrency: 最大并发请求数
+            **kwargs: 传给 fetch 的其他参数
+
+        返回:
+            {symbol: DataFrame 或 异常}，单只股票失败不影响其他股票
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def run(symbol: str) -> pd.DataFrame:
+            async with semaphore:
+                return await asyncio.to_thread(fetch, symbol, **kwargs)
+
+        results = await asyncio.gather(
+            *(run(symbol) for symbol in symbols),
+            return_exceptions=True
+        )
+
+        failed = sum(isinstance(r, Exception) for r in results)
+        logger.info("[AKShareAdapterEM] 批量请求完成: 成功 %d, 失败 %d", len(symbols) - failed, failed)
+        return dict(zip(symbols, results))
+
+    async def aget_stock_zh_a_hist(self, symbol: str, **kwargs: Any) -> pd.DataFrame:
+        """get_stock_zh_a_hist 的异步版本（在线程中执行）"""
+        return await asyncio.to_thread(self.get_stock_zh_a_hist, symbol, **kwargs)
+
+    async def batch_hist(
+        self,
+        symbols: List[str],
+        max_concurrency: int = 16,
+        **kwargs: Any
+    ) -> Dict[str, Union[pd.DataFrame, Exception]]:
+        """
+        并发获取多只A股的历史K线数据
+
+        参数:
+            symbols: 股票代码列表
+            max_concurrency: 最大并发请求数，默认16
+            **kwargs: period/start_date/end_date/adjust，同 get_stock_zh_a_hist
+
+        返回:
+            {symbol: DataFrame 或 异常}
+        """
+        return await self._gather_by_symbol(self.get_stock_zh_a_hist, symbols, max_concurrency, **kwargs)
+
+    async def batch_individual_info(
+        self,
+        symbols: List[str],
+        max_concurrency: int = 16
+    ) -> Dict[str, Union[pd.DataFrame, Exception]]:
+        """
+        并发获取多只股票的基本信息
+
+        参数:
+            symbols: 股票代码列表
+            max_concurrency: 最大并发请求数，默认16
+
+        返回:
+            {symbol: DataFrame 或 异常}
+        """
+        return await self._gather_by_symbol(self.get_stock_individual_info_em, symbols, max_concurrency)
+
+    async def batch_fund_flow(
+        self,
+        symbols: List[str],
+        max_concurrency: int = 16,
+        return_arrow: bool = False
+    ) -> Dict[str, Union[pd.DataFrame, "pa.Table", Exception]]:
+        """
+        并发获取多只股票的资金流向数据
+
+        参数:
+            symbols: 股票代码列表
+            max_concurrency: 最大并发请求数，默认16
+            return_arrow: 每只股票返回 pyarrow.Table
+
+        返回:
+            {symbol: DataFrame 或 异常}，键为传入的原始代码
+        """
+        formatted = batch_format_symbols(symbols)
+        # "000001" 与 "sz000001" 格式化后相同，去重后只请求一次
+        results = await self._gather_by_symbol(
+            self.get_stock_fund_flow_individual,
+            list(dict.fromkeys(formatted)),
+            max_concurrency,
+            return_arrow=return_arrow
+        )
+        return {orig: results[fmt] for orig, fmt in zip(symbols, formatted)}
 
-        except Exception as e:
-            logger.error(f"[AKShareAdapterEM] 获取个股资金流向失败: {e}")
-            raise DataSourceError(f"获取{symbol}资金流向失败: {e}")
 
+# 获取东方财富版本适配器实例（类本身即单例工厂）
+get_adapter_em = AKShareAdapterEM
 
-# 全局适配器实例
-_adapter_em: Optional[AKShareAdapterEM] = None
 
+def reset_adapter_em():
+    """
+    重置适配器实例
 
-def get_adapter_em() -> AKShareAdapterEM:
-    """获取东方财富版本适配器实例"""
-    global _adapter_em
-    if _adapter_em is None:
-        _adapter_em = AKShareAdapterEM()
-    return _adapter_em
+    主要用于测试场景，清除适配器及其数据缓存
+    """
+    AKShareAdapterEM._instances.clear()
@@ -8,12 +8,13 @@ AkShare数据适配器 - 修复版
 4. 使用直接导入方式，避免动态导入问题
 """
 
-from typing import Optional, Literal, List, Dict, Any
-from datetime import datetime
+from typing import Optional, Literal, Dict, Any, Callable, ClassVar
+from datetime import datetime, timedelta
 import pandas as pd
-import time
+import requests
 
-from ..core.exceptions import DataSourceError, SymbolNotFoundError
+from ..core.exceptions import DataSourceError
+from ..utils.decorators import retry
 from ..utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -29,10 +30,24 @@ class AKShareAdapterFixed:
     3. 添加完善的错误处理和日志
     """
 
+    _instance: ClassVar[Optional["AKShareAdapterFixed"]] = None
+    _initialized = False
+
+    # 未指定开始日期时默认回看的自然日数（与 AKShareAdapterEM 一致）
+    DEFAULT_LOOKBACK_DAYS = 400
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
     def __init__(self):
+        if self._initialized:
+            return
         self._cache: Dict[str, Any] = {}
         self._ak = None
         self._import_akshare()
+        self._initialized = True
 
     def _import_akshare(self):
         """导入 akshare 并检查关键函数"""
@@ -50,16 +65,29 @@ class AKShareAdapterFixed:
 
             for func_name in required_funcs:
                 if not hasattr(ak, func_name):
-                    logger.warning(f"[AKShareAdapter] akshare 缺少函数: {func_name}")
+                    logger.warning("[AKShareAdapter] akshare 缺少函数: %s", func_name)
                 else:
-                    logger.debug(f"[AKShareAdapter] 找到函数: {func_name}")
+                    logger.debug("[AKShareAdapter] 找到函数: %s", func_name)
 
             logger.info("[AKShareAdapter] akshare 导入成功")
 
         except ImportError as e:
-            logger.error(f"[AKShareAdapter] 无法导入 akshare: {str(e)}")
+            logger.error("[AKShareAdapter] 无法导入 akshare: %s", e)
             raise DataSourceError(f"无法导入 akshare: {str(e)}")
 
+    @staticmethod
+    @retry(
+        max_attempts=3,
+        delay=0.2,
+        backoff=2.0,
+        max_delay=2.0,
+        jitter=0.2,
+        exceptions=(requests.exceptions.RequestException,)
+    )
+    def _invoke(akfn: Callable[..., pd.DataFrame], **kwargs: Any) -> pd.DataFrame:
+        """调用 akshare 函数，网络层瞬时错误（连接重置、超时、429 等）按指数退避重试"""
+        return akfn(**kwargs)
+
     def get_stock_zh_a_spot(self) -> pd.DataFrame:
         """
         获取A股实时行情快照 - 使用新浪财经数据源
@@ -73,87 +101,93 @@ class AKShareAdapterFixed:
             logger.debug("[AKShareAdapter] 使用 stock_zh_a_spot 获取A股实时行情...")
 
             # 关键修复: 使用 stock_zh_a_spot (新浪财经) 而非 stock_zh_a_spot_em (东方财富)
-            df = self._ak.stock_zh_a_spot()
+            df = self._invoke(self._ak.stock_zh_a_spot)
 
-            logger.info(f"[AKShareAdapter] 成功获取A股实时行情，共{len(df)}条记录")
+            logger.info("[AKShareAdapter] 成功获取A股实时行情，共%d条记录", len(df))
             return df
 
         except Exception as e:
-            logger.error(f"[AKShareAdapter] 获取A股行情失败: {str(e)}")
+            logger.error("[AKShareAdapter] 获取A股行情失败: %s", e)
             # 如果失败，尝试备用数据源
             try:
                 logger.warning("[AKShareAdapter] 尝试备用数据源 stock_zh_a_spot_em...")
-                df = self._ak.stock_zh_a_spot_em()
-                logger.info(f"[AKShareAdapter] 备用数据源成功，共{len(df)}条记录")
+                df = self._invoke(self._ak.stock_zh_a_spot_em)
+                logger.info("[AKShareAdapter] 备用数据源成功，共%d条记录", len(df))
                 return df
             except Exception as e2:
-                logger.error(f"[AKShareAdapter] 备用数据源也失败: {str(e2)}")
+                logger.error("[AKShareAdapter] 备用数据源也失败: %s", str(e2))
                 raise DataSourceError(f"获取A股行情失败: {str(e)}")
 
     def get_stock_hk_spot(self) -> pd.DataFrame:
         """获取港股实时行情快照"""
         try:
             logger.debug("[AKShareAdapter] 使用 stock_hk_spot 获取港股实时行情...")
-            df = self._ak.stock_hk_spot()
-            logger.info(f"[AKShareAdapter] 成功获取港股实时行情，共{len(df)}条记录")
+            df = self._invoke(self._ak.stock_hk_spot)
+            logger.info("[AKShareAdapter] 成功获取港股实时行情，共%d条记录", len(df))
             return df
         except Exception as e:
-            logger.error(f"[AKShareAdapter] 获取港股行情失败: {str(e)}")
+            logger.error("[AKShareAdapter] 获取港股行情失败: %s", e)
             raise DataSourceError(f"获取港股行情失败: {str(e)}")
 
+    def _default_start_date(self, lookback_days: Optional[int] = None) -> str:
+        """按回看天数推算默认开始日期（YYYYMMDD）"""
+        days = lookback_days or self.DEFAULT_LOOKBACK_DAYS
+        return (datetime.now() - timedelta(days=days)).strftime("%Y%m%d")
+
     def get_stock_zh_a_hist(
         self,
         symbol: str,
         period: Literal["daily", "weekly", "monthly"] = "daily",
         start_date: Optional[str] = None,
         end_date: Optional[str] = None,
-        adjust: Literal["", "qfq", "hfq"] = "qfq"
+        adjust: Literal["", "qfq", "hfq"] = "qfq",
+        lookback_days: Optional[int] = None
     ) -> pd.DataFrame:
         """
         获取A股历史K线数据 - 使用新浪财经数据源
 
         修复: 使用 stock_zh_a_daily 而非 stock_zh_a_hist_em
+
+        未指定 start_date 时只回看 lookback_days（默认 DEFAULT_LOOKBACK_DAYS）个自然日，
+        需要完整历史时显式传入 start_date="19700101"；备用数据源使用相同的日期范围
         """
+        start_date = start_date or self._default_start_date(lookback_days)
+        end_date = end_date or datetime.now().strftime("%Y%m%d")
         try:
-            logger.debug(f"[AKShareAdapter] 获取 {symbol} 的 {period} K线数据...")
+            logger.debug("[AKShareAdapter] 获取 %s 的 %s K线数据...", symbol, period)
 
             # 关键修复: 使用 stock_zh_a_daily (新浪财经) 而非 stock_zh_a_hist_em (东方财富)
-            df = self._ak.stock_zh_a_daily(
+            df = self._invoke(
+                self._ak.stock_zh_a_daily,
                 symbol=symbol,
-                start_date=start_date or "19700101",
-                end_date=end_date or datetime.now().strftime("%Y%m%d"),
+                start_date=start_date,
+                end_date=end_date,
                 adjust=adjust
             )
 
-            logger.info(f"[AKShareAdapter] 成功获取 {symbol} 的 {len(df)} 条K线数据")
+            logger.info("[AKShareAdapter] 成功获取 %s 的 %d 条K线数据", symbol, len(df))
             return df
 
         except Exception as e:
-            logger.error(f"[AKShareAdapter] 获取K线数据失败: {str(e)}")
+            logger.error("[AKShareAdapter] 获取K线数据失败: %s", e)
             # 如果失败，尝试备用数据源
             try:
-                logger.warning(f"[AKShareAdapter] 尝试备用数据源 stock_zh_a_hist_em...")
-                df = self._ak.stock_zh_a_hist_em(
+                logger.warning("[AKShareAdapter] 尝试备用数据源 stock_zh_a_hist_em...")
+                df = self._invoke(
+                    self._ak.stock_zh_a_hist_em,
                     symbol=symbol,
                     period=period,
                     start_date=start_date,
                     end_date=end_date,
                     adjust=adjust
                 )
-                logger.info(f"[AKShareAdapter] 备用数据源成功，共{len(df)}条数据")
+                logger.info("[AKShareAdapter] 备用数据源成功，共%d条数据", len(df))
                 return df
             except Exception as e2:
-                logger.error(f"[AKShareAdapter] 备用数据源也失败: {str(e2)}")
+                logger.error("[AKShareAdapter] 备用数据源也失败: %s", str(e2))
                 raise DataSourceError(f"获取{symbol}的K线数据失败: {str(e)}")
 
     # ... 其他方法保持不变
 
-# 全局适配器实例
-_adapter_fixed: Optional[AKShareAdapterFixed] = None
-
-def get_adapter_fixed() -> AKShareAdapterFixed:
-    """获取修复版适配器实例"""
-    global _adapter_fixed
-    if _adapter_fixed is None:
-        _adapter_fixed = AKShareAdapterFixed()
-    return _adapter_fixed
+# 获取修复版适配器实例（类本身即单例工厂）
+get_adapter_fixed = AKShareAdapterFixed
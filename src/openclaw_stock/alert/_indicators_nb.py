@@ -0,0 +1,161 @@
+"""
+技术指标流式更新内核
+
+预警监控每轮只拿到一个最新价，这里的函数只根据上一时刻的指标状态和最新价
+计算新状态（O(1)），不必每轮用整段历史K线重算 MACD/RSI/均线/布林带。
+
+安装 numba 时编译为机器码，否则以纯 Python 运行，结果一致。
+状态中用 NaN 表示尚未初始化，因此不开启 fastmath（会假定不存在 NaN）。
+"""
+
+import math
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def _jit(func):
+    """numba 可用时编译函数（结果缓存到磁盘），否则原样返回"""
+    if njit is None:
+        return func
+    return njit(cache=True)(func)
+
+
+@_jit
+def ema_update(prev, x, alpha):
+    """
+    指数移动平均递推: EMA_t = α·x_t + (1-α)·EMA_{t-1}
+
+    prev 为 NaN 时以 x 作为初值，与 pandas ewm(adjust=False) 一致
+    """
+    if math.isnan(prev):
+        return x
+    return prev + alpha * (x - prev)
+
+
+@_jit
+def rsi_update(gain_avg, loss_avg, diff, n):
+    """
+    RSI 递推（Wilder 平滑）
+
+    参数:
+        gain_avg: 上一时刻平均涨幅（NaN 表示未初始化）
+        loss_avg: 上一时刻平均跌幅
+        diff: 本期价格变动
+        n: RSI 周期
+
+    返回:
+        (gain_avg, loss_avg, rsi)
+    """
+    gain = diff if diff > 0 else 0.0
+    loss = -diff if diff < 0 else 0.0
+    if math.isnan(gain_avg):
+        gain_avg = gain
+        loss_avg = loss
+    else:
+        gain_avg = (gain_avg * (n - 1) + gain) / n
+        loss_avg = (loss_avg * (n - 1) + loss) / n
+
+    if loss_avg == 0:
+        rsi = 100.0 if gain_avg > 0 else 50.0
+    else:
+        rsi = 100.0 - 100.0 / (1.0 + gain_avg / loss_avg)
+    return gain_avg, loss_avg, rsi
+
+
+@_jit
+def macd_update(ema12, ema26, signal, price):
+    """
+    MACD(12, 26, 9) 递推
+
+    返回:
+        (ema12, ema26, dif, dea, hist)，hist = 2 * (dif - dea)，
+        与 analysis.technical_analysis.calculate_macd 的定义一致
+    """
+    ema12 = ema_update(ema12, price, 2.0 / 13.0)
+    ema26 = ema_update(ema26, price, 2.0 / 27.0)
+    dif = ema12 - ema26
+    signal = ema_update(signal, dif, 2.0 / 10.0)
+    return ema12, ema26, dif, signal, 2.0 * (dif - signal)
+
+
+@_jit
+def seed_state(closes, rsi_period, window):
+    """
+    用历史收盘价初始化指标状态
+
+    参数:
+        closes: 已完成交易日的收盘价（float64 数组，按时间升序）
+        rsi_period: RSI 周期
+        window: 均线/布林带周期；返回最近 window-1 个收盘价的个数、和与平方和，
+            盘中加上最新价即可得到包含当前价的均值和标准差
+
+    返回:
+        (last_close, ema12, ema26, signal, hist, gain_avg, loss_avg,
+         win_count, win_sum, win_sumsq)
+    """
+    nan = np.nan
+    ema12 = nan
+    ema26 = nan
+    signal = nan
+    hist = nan
+    gain_avg = nan
+    loss_avg = nan
+    last_close = nan
+
+    for i in range(closes.shape[0]):
+        price = closes[i]
+        ema12, ema26, _, signal, hist = macd_update(ema12, ema26, signal, price)
+        if not math.isnan(last_close):
+            gain_avg, loss_avg, _ = rsi_update(gain_avg, loss_avg, price - last_close, rsi_period)
+        last_close = price
+
+    start = max(0, closes.shape[0] - (window - 1))
+    win_sum = 0.0
+    win_sumsq = 0.0
+    for i in range(start, closes.shape[0]):
+        win_sum += closes[i]
+        win_sumsq += closes[i] * closes[i]
+
+    return (last_close, ema12, ema26, signal, hist, gain_avg, loss_avg,
+            closes.shape[0] - start, win_sum, win_sumsq)
+
+
+@_jit
+def intraday_batch(rows, prices, last_close, ema12, ema26, signal, gain_avg, loss_avg,
+                   period, win_count, win_sum, win_sumsq):
+    """
+    对多行指标状态同时做一次盘中递推（不修改状态）
+
+    参数:
+        rows: 状态行号（intp 数组）
+        prices: 与 rows 一一对应的最新价
+        其余参数: 按行存放的状态列（见 seed_state 的返回值）及各行 RSI/均线周期
+
+    返回:
+        (len(rows), 4) 数组，各列为 MACD 柱、RSI、均线（布林中轨）、标准差；
+        均线样本不足 2 个时标准差为 NaN
+    """
+    out = np.empty((rows.shape[0], 4))
+    for j in range(rows.shape[0]):
+        i = rows[j]
+        price = prices[j]
+        _, _, _, _, hist = macd_update(ema12[i], ema26[i], signal[i], price)
+        _, _, rsi = rsi_update(gain_avg[i], loss_avg[i], price - last_close[i], period[i])
+
+        n = win_count[i] + 1
+        mid = (win_sum[i] + price) / n
+        std = np.nan
+        if n >= 2:
+            var = (win_sumsq[i] + price * price - n * mid * mid) / (n - 1)
+            std = math.sqrt(max(var, 0.0))
+
+        out[j, 0] = hist
+        out[j, 1] = rsi
+        out[j, 2] = mid
+        out[j, 3] = std
+    return out
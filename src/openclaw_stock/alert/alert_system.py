@@ -4,26 +4,115 @@
 实现设计文档4.5节的接口10: 实时预警
 """
 
-from typing import Literal, Optional, Dict, Any, List, Callable
+from typing import Literal, Optional, Dict, Any, List, Callable, Set, Tuple
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
-from enum import Enum
+from datetime import date, datetime, timedelta, timezone
+from enum import Enum, IntEnum
+import atexit
+import heapq
 import json
+import sys
 import threading
 import time
+import numpy as np
 import pandas as pd
 
 from ..core.exceptions import AlertError
 from ..utils.logger import get_logger
-from ..data.market_data import fetch_realtime_quote
+from ..data.market_data import fetch_market_data
+from ._indicators_nb import intraday_batch, seed_state
 
 try:
     import akshare as ak
 except ImportError:
     ak = None
 
+try:
+    from zoneinfo import ZoneInfo
+    _BEIJING_TZ = ZoneInfo("Asia/Shanghai")
+except Exception:
+    # 缺少时区数据库（如未安装 tzdata 的 Windows）时使用固定 UTC+8，北京时间无夏令时
+    _BEIJING_TZ = timezone(timedelta(hours=8), "Asia/Shanghai")
+
 logger = get_logger(__name__)
 
+# 预警数量可达数万，Python 3.10+ 上使用 __slots__ 去掉每个实例的 __dict__
+_DATACLASS_OPTIONS: Dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# 全市场行情列名 -> 报价字段（与 fetch_realtime_quote 返回的字段一致）
+_QUOTE_NUMERIC_FIELDS = {
+    "price": "最新价",
+    "change": "涨跌额",
+    "change_pct": "涨跌幅",
+    "volume": "成交量",
+    "amount": "成交额",
+    "high": "最高",
+    "low": "最低",
+    "open": "今开",
+    "pre_close": "昨收",
+}
+
+# A股代码首位 -> 交易所（688 科创板也以 6 开头，归上交所）
+_MARKET_BY_PREFIX = {"6": "sh", "9": "sh", "0": "sz", "2": "sz", "3": "sz", "4": "bj", "8": "bj"}
+
+
+def _infer_market(symbol: str) -> str:
+    """
+    根据A股代码推断所属交易所
+
+    参数:
+        symbol: 6位股票代码
+
+    返回:
+        sh/sz/bj，无法识别时返回 sh
+    """
+    if not symbol:
+        return "sh"
+    return _MARKET_BY_PREFIX.get(symbol[0], "sh")
+
+
+# A股连续竞价时段（北京时间，当日分钟数）: 09:30-11:30, 13:00-15:00
+_TRADING_SESSIONS = ((9 * 60 + 30, 11 * 60 + 30), (13 * 60, 15 * 60))
+
+
+def _is_trading_time(now: datetime) -> bool:
+    """
+    判断是否处于A股交易时段（周一至周五，不含法定节假日判断）
+
+    参数:
+        now: 当前北京时间（datetime.now(_BEIJING_TZ)）
+
+    返回:
+        是否在交易时段内
+    """
+    if now.weekday() >= 5:
+        return False
+    minute = now.hour * 60 + now.minute
+    return any(start <= minute < end for start, end in _TRADING_SESSIONS)
+
+
+def _seconds_until_next_session(now: datetime) -> float:
+    """
+    计算距下一个交易时段开始的秒数
+
+    参数:
+        now: 当前北京时间（datetime.now(_BEIJING_TZ)）
+
+    返回:
+        秒数，now 之后最近的工作日开盘时刻
+    """
+    day = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    for offset in range(8):
+        session_day = day + timedelta(days=offset)
+        if session_day.weekday() >= 5:
+            continue
+        for start, _ in _TRADING_SESSIONS:
+            opening = session_day + timedelta(minutes=start)
+            if opening > now:
+                return (opening - now).total_seconds()
+    return 0.0
+
 
 class AlertType(Enum):
     """预警类型"""
@@ -33,6 +122,23 @@ class AlertType(Enum):
     NEWS = "news"
 
 
+class AlertOperator(IntEnum):
+    """预警条件运算符（创建预警时由字符串转换，检查时按整数比较）"""
+    ABOVE = 0
+    BELOW = 1
+    BETWEEN = 2
+    EQUALS = 3
+    CROSS_ABOVE = 4
+    CROSS_BELOW = 5
+    SUDDEN_INCREASE = 6
+    GOLDEN_CROSS = 7
+    DEAD_CROSS = 8
+    OVERBOUGHT = 9
+    OVERSOLD = 10
+    BREAKOUT_UP = 11
+    BREAKOUT_DOWN = 12
+
+
 class AlertStatus(Enum):
     """预警状态"""
     ACTIVE = "active"
@@ -41,16 +147,25 @@ class AlertStatus(Enum):
     EXPIRED = "expired"
 
 
-@dataclass
+# 字符串 <-> 枚举的预建映射，创建和列出预警时直接查字典，不经过 Enum 的构造/属性访问
+_ALERT_TYPE_CACHE: Dict[str, AlertType] = {m.value: m for m in AlertType}
+_ALERT_TYPE_VALUES: Dict[AlertType, str] = {m: m.value for m in AlertType}
+_ALERT_STATUS_CACHE: Dict[str, AlertStatus] = {m.value: m for m in AlertStatus}
+_STATUS_VALUES: Dict[AlertStatus, str] = {m: m.value for m in AlertStatus}
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class AlertCondition:
     """预警条件"""
-    operator: Literal["above", "below", "between", "equals", "cross_above", "cross_below"]
+    operator: AlertOperator
     value: float
     value2: Optional[float] = None  # 用于between
     duration: Optional[int] = None  # 持续分钟数
+    indicator: Optional[str] = None  # 技术指标预警: macd/rsi/ma/boll
+    period: Optional[int] = None  # 技术指标周期（均线/RSI/布林带）
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class Alert:
     """预警对象"""
     id: str
@@ -66,6 +181,155 @@ class Alert:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
+def _vec_above(current: np.ndarray, value: np.ndarray, value2: np.ndarray) -> np.ndarray:
+    return current > value
+
+
+def _vec_below(current: np.ndarray, value: np.ndarray, value2: np.ndarray) -> np.ndarray:
+    return current < value
+
+
+def _vec_between(current: np.ndarray, value: np.ndarray, value2: np.ndarray) -> np.ndarray:
+    return (value <= current) & (current <= value2)
+
+
+def _vec_equals(current: np.ndarray, value: np.ndarray, value2: np.ndarray) -> np.ndarray:
+    return np.abs(current - value) < 0.01
+
+
+# 可按列批量比较的条件: (预警类型, 运算符) -> (行情字段, 比较函数(当前值, value, value2))
+_VECTOR_CHECKS: Dict[Tuple[AlertType, AlertOperator], Tuple[str, Callable[..., np.ndarray]]] = {
+    (AlertType.PRICE, AlertOperator.ABOVE): ("price", _vec_above),
+    (AlertType.PRICE, AlertOperator.BELOW): ("price", _vec_below),
+    (AlertType.PRICE, AlertOperator.BETWEEN): ("price", _vec_between),
+    (AlertType.PRICE, AlertOperator.EQUALS): ("price", _vec_equals),
+    (AlertType.VOLUME, AlertOperator.ABOVE): ("volume", _vec_above),
+    (AlertType.VOLUME, AlertOperator.BELOW): ("volume", _vec_below),
+}
+
+# 逐个检查时的运算符分派表，未列出的运算符不触发
+# 价格/成交量: (当前值, value, value2) -> bool
+_PRICE_OPS: Dict[AlertOperator, Callable[[float, float, Optional[float]], bool]] = {
+    AlertOperator.ABOVE: lambda p, v, v2: p > v,
+    AlertOperator.BELOW: lambda p, v, v2: p < v,
+    AlertOperator.BETWEEN: lambda p, v, v2: v <= p <= v2,
+    AlertOperator.EQUALS: lambda p, v, v2: abs(p - v) < 0.01,
+}
+_VOLUME_OPS: Dict[AlertOperator, Callable[[float, float, Optional[float]], bool]] = {
+    AlertOperator.ABOVE: lambda q, v, v2: q > v,
+    AlertOperator.BELOW: lambda q, v, v2: q < v,
+}
+# MACD: (上一交易日柱值, 当前柱值) -> bool
+_MACD_OPS: Dict[AlertOperator, Callable[[float, float], bool]] = {
+    AlertOperator.GOLDEN_CROSS: lambda prev, hist: prev < 0 and hist > 0,  # 金叉
+    AlertOperator.DEAD_CROSS: lambda prev, hist: prev > 0 and hist < 0,  # 死叉
+}
+# RSI: (rsi, value) -> bool
+_RSI_OPS: Dict[AlertOperator, Callable[[float, float], bool]] = {
+    AlertOperator.ABOVE: lambda rsi, v: rsi > v,
+    AlertOperator.BELOW: lambda rsi, v: rsi < v,
+    AlertOperator.OVERBOUGHT: lambda rsi, v: rsi > 80,  # 超买
+    AlertOperator.OVERSOLD: lambda rsi, v: rsi < 20,  # 超卖
+}
+# 均线: (价格, 均线值) -> bool
+_MA_OPS: Dict[AlertOperator, Callable[[float, float], bool]] = {
+    AlertOperator.CROSS_ABOVE: lambda price, ma: price > ma,  # 价格上穿均线
+    AlertOperator.CROSS_BELOW: lambda price, ma: price < ma,  # 价格下穿均线
+}
+# 布林带: (价格, 上轨, 下轨) -> bool
+_BOLL_OPS: Dict[AlertOperator, Callable[[float, float, float], bool]] = {
+    AlertOperator.BREAKOUT_UP: lambda price, upper, lower: price > upper,  # 突破上轨
+    AlertOperator.BREAKOUT_DOWN: lambda price, upper, lower: price < lower,  # 突破下轨
+}
+
+
+def _parse_operator(operator: Any) -> Optional[AlertOperator]:
+    """把字符串运算符转换为 AlertOperator，无法识别时返回 None"""
+    if isinstance(operator, AlertOperator):
+        return operator
+    return AlertOperator.__members__.get(str(operator).upper())
+
+
+# 技术指标预警的默认周期
+_DEFAULT_INDICATOR_PERIOD = {"macd": 26, "ma": 20, "rsi": 6, "boll": 20}
+
+# 初始化技术指标时回看的自然日数（约 270 个交易日，足够 EMA26 收敛）
+_INDICATOR_LOOKBACK_DAYS = 400
+
+
+class IndicatorState:
+    """
+    技术指标状态（截至上一交易日收盘），按列存放的结构数组（SoA）
+
+    每个 (股票代码, 周期) 占一行，同一股票同一周期的多个预警共用一行、只初始化一次；
+    每轮检查把所有技术指标预警的行号和最新价交给 intraday_batch 一次算完。
+    状态列使用 float64：布林带方差由平方和相减得到，float32 在高价股上误差过大
+    """
+
+    _FLOAT_COLUMNS = ("last_close", "ema12", "ema26", "signal", "hist",
+                      "gain_avg", "loss_avg", "win_sum", "win_sumsq")
+
+    def __init__(self, capacity: int = 64):
+        self.rows: Dict[Tuple[str, int], int] = {}
+        self.session = np.full(capacity, -1, dtype=np.int64)   # 状态对应的交易日（date.toordinal()）
+        self.period = np.zeros(capacity, dtype=np.int64)
+        self.win_count = np.zeros(capacity, dtype=np.int64)    # 最近 period-1 个收盘价的个数
+        for name in self._FLOAT_COLUMNS:
+            setattr(self, name, np.full(capacity, np.nan))
+
+    def lookup(self, key: Tuple[str, int], session: int) -> Optional[int]:
+        """返回当日已初始化的行号，不存在或已跨日时返回 None"""
+        row = self.rows.get(key)
+        if row is not None and self.session[row] == session:
+            return row
+        return None
+
+    def store(self, key: Tuple[str, int], session: int, seeded: Tuple[float, ...]) -> int:
+        """
+        写入一行状态，容量不足时按倍数扩容
+
+        参数:
+            key: (股票代码, 周期)
+            session: 交易日序号
+            seeded: seed_state 的返回值
+
+        返回:
+            行号
+        """
+        row = self.rows.get(key)
+        if row is None:
+            row = len(self.rows)
+            if row == self.session.shape[0]:
+                self._grow(2 * row)
+            self.rows[key] = row
+
+        (self.last_close[row], self.ema12[row], self.ema26[row], self.signal[row], self.hist[row],
+         self.gain_avg[row], self.loss_avg[row], self.win_count[row], self.win_sum[row],
+         self.win_sumsq[row]) = seeded
+        self.session[row] = session
+        self.period[row] = key[1]
+        return row
+
+    def evaluate(self, rows: np.ndarray, prices: np.ndarray) -> np.ndarray:
+        """计算各行在最新价下的盘中指标，列依次为 MACD 柱、RSI、均线、标准差"""
+        return intraday_batch(rows, prices, self.last_close, self.ema12, self.ema26, self.signal,
+                              self.gain_avg, self.loss_avg, self.period, self.win_count,
+                              self.win_sum, self.win_sumsq)
+
+    def _grow(self, capacity: int):
+        """扩容到 capacity 行，新行填充初始值"""
+        for name, fill in (("session", -1), ("period", 0), ("win_count", 0)):
+            column = getattr(self, name)
+            grown = np.full(capacity, fill, dtype=column.dtype)
+            grown[:column.shape[0]] = column
+            setattr(self, name, grown)
+        for name in self._FLOAT_COLUMNS:
+            column = getattr(self, name)
+            grown = np.full(capacity, np.nan)
+            grown[:column.shape[0]] = column
+            setattr(self, name, grown)
+
+
 class PriceAlert:
     """价格预警"""
 
@@ -77,20 +341,9 @@ class PriceAlert:
     def check(self, data: Dict[str, Any]) -> bool:
         """检查是否触发预警"""
         current_price = data.get("price", 0)
-        operator = self.condition.get("operator", "above")
         value = self.condition.get("value", 0)
-
-        if operator == "above":
-            return current_price > value
-        elif operator == "below":
-            return current_price < value
-        elif operator == "between":
-            value2 = self.condition.get("value2", value)
-            return value <= current_price <= value2
-        elif operator == "equals":
-            return abs(current_price - value) < 0.01
-
-        return False
+        check = _PRICE_OPS.get(_parse_operator(self.condition.get("operator", "above")))
+        return check is not None and check(current_price, value, self.condition.get("value2", value))
 
 
 class VolumeAlert:
@@ -104,19 +357,16 @@ class VolumeAlert:
     def check(self, data: Dict[str, Any]) -> bool:
         """检查是否触发预警"""
         current_volume = data.get("volume", 0)
-        operator = self.condition.get("operator", "above")
+        operator = _parse_operator(self.condition.get("operator", "above"))
         value = self.condition.get("value", 0)
 
-        if operator == "above":
-            return current_volume > value
-        elif operator == "below":
-            return current_volume < value
-        elif operator == "sudden_increase":
+        if operator is AlertOperator.SUDDEN_INCREASE:
             # 成交量突增(放量)
             avg_volume = data.get("avg_volume", current_volume)
             return current_volume > avg_volume * value  # value是倍数
 
-        return False
+        check = _VOLUME_OPS.get(operator)
+        return check is not None and check(current_volume, value, None)
 
 
 class TechnicalAlert:
@@ -130,50 +380,32 @@ class TechnicalAlert:
     def check(self, data: Dict[str, Any]) -> bool:
         """检查是否触发预警"""
         indicator = self.condition.get("indicator", "")
-        operator = self.condition.get("operator", "cross_above")
+        operator = _parse_operator(self.condition.get("operator", "cross_above"))
         value = self.condition.get("value", 0)
 
         indicators = data.get("indicators", {})
 
         if indicator == "macd":
+            check = _MACD_OPS.get(operator)
             macd_hist = indicators.get("macd_hist", 0)
-            macd_hist_prev = data.get("macd_hist_prev", macd_hist)
-
-            if operator == "golden_cross":  # 金叉
-                return macd_hist_prev < 0 and macd_hist > 0
-            elif operator == "dead_cross":  # 死叉
-                return macd_hist_prev > 0 and macd_hist < 0
+            return check is not None and check(data.get("macd_hist_prev", macd_hist), macd_hist)
 
         elif indicator == "rsi":
-            rsi = indicators.get("rsi6", 0)
-            if operator == "above":
-                return rsi > value
-            elif operator == "below":
-                return rsi < value
-            elif operator == "overbought":  # 超买
-                return rsi > 80
-            elif operator == "oversold":  # 超卖
-                return rsi < 20
+            check = _RSI_OPS.get(operator)
+            return check is not None and check(indicators.get("rsi6", 0), value)
 
         elif indicator == "ma":
-            price = data.get("price", 0)
+            check = _MA_OPS.get(operator)
             ma_period = self.condition.get("ma_period", 20)
-            ma_value = indicators.get(f"ma{ma_period}", 0)
-
-            if operator == "cross_above":  # 价格上穿均线
-                return price > ma_value
-            elif operator == "cross_below":  # 价格下穿均线
-                return price < ma_value
+            return check is not None and check(data.get("price", 0), indicators.get(f"ma{ma_period}", 0))
 
         elif indicator == "boll":
-            price = data.get("price", 0)
-            boll_upper = indicators.get("boll_upper", float('inf'))
-            boll_lower = indicators.get("boll_lower", 0)
-
-            if operator == "breakout_up":  # 突破上轨
-                return price > boll_upper
-            elif operator == "breakout_down":  # 突破下轨
-                return price < boll_lower
+            check = _BOLL_OPS.get(operator)
+            return check is not None and check(
+                data.get("price", 0),
+                indicators.get("boll_upper", float('inf')),
+                indicators.get("boll_lower", 0)
+            )
 
         return False
 
@@ -188,9 +420,28 @@ class AlertSystem:
     def __init__(self):
         self.logger = get_logger(self.__class__.__name__)
         self.alerts: Dict[str, Alert] = {}
+        # 保护 alerts 及下列索引；调用方线程与监控线程都只在持锁时读写
+        self._lock = threading.RLock()
+        # 按过期时间排序的小顶堆 (过期时间戳, alert_id)；移除的预警留在堆中，出堆时跳过
+        self._expiry_heap: List[Tuple[float, str]] = []
+        # 股票代码 -> 待检查(ACTIVE)预警ID，触发、过期或移除后即从索引中删除
+        self._by_symbol: Dict[str, Set[str]] = {}
+        # 由 _by_symbol 派生的列式条件数组，索引变化后在下一轮检查前重建
+        self._symbols: List[str] = []
+        self._condition_arrays: Dict[
+            Tuple[AlertType, AlertOperator], Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+        ] = {}
+        self._scalar_by_symbol: Dict[str, List[str]] = {}
+        self._arrays_dirty = False
+        # 技术指标状态与每轮逐个检查的 (股票代码, 预警) 缓冲区，只在检查线程中读写
+        self._indicators = IndicatorState()
+        self._tick_buf: List[Tuple[str, Alert]] = []
         self.running = False
+        # stop_monitoring 置位后立即唤醒等待中的监控线程
+        self._stop_evt = threading.Event()
         self.monitor_thread = None
         self.check_interval = 60  # 检查间隔(秒)
+        self.max_notify_workers = 8  # 并发发送通知的最大线程数
 
     def setup_alert(
         self,
@@ -217,35 +468,55 @@ class AlertSystem:
             setup_alert('000001', 'price', {'above': 15.0})
             setup_alert('600519', 'technical', {'macd': 'golden_cross'})
         """
-        alert_id = f"{symbol}_{alert_type}_{datetime.now().strftime('%Y%m%d%H%M%S')}"
+        now = datetime.now()
+        alert_id = f"{symbol}_{alert_type}_{now.strftime('%Y%m%d%H%M%S')}"
+
+        alert_type_member = _ALERT_TYPE_CACHE.get(alert_type)
+        if alert_type_member is None:
+            raise AlertError(f"不支持的预警类型: {alert_type}")
 
         # 解析条件
+        operator = condition.get("operator", "above")
+        if not isinstance(operator, AlertOperator):
+            try:
+                operator = AlertOperator[str(operator).upper()]
+            except KeyError:
+                raise AlertError(f"不支持的预警条件运算符: {operator}")
+
         alert_condition = AlertCondition(
-            operator=condition.get("operator", "above"),
+            operator=operator,
             value=condition.get("value", 0),
             value2=condition.get("value2"),
-            duration=condition.get("duration")
+            duration=condition.get("duration"),
+            indicator=condition.get("indicator"),
+            period=condition.get("period", condition.get("ma_period"))
         )
 
         # 计算过期时间
         expires_at = None
         if expires_in_hours:
-            expires_at = datetime.now() + timedelta(hours=expires_in_hours)
+            expires_at = now + timedelta(hours=expires_in_hours)
 
         # 创建预警对象
         alert = Alert(
             id=alert_id,
             symbol=symbol,
-            alert_type=AlertType(alert_type),
+            alert_type=alert_type_member,
             condition=alert_condition,
             status=AlertStatus.ACTIVE,
-            created_at=datetime.now(),
+            created_at=now,
             expires_at=expires_at,
-            notification_methods=[notification_method]
+            notification_methods=[notification_method],
+            metadata={"market": _infer_market(symbol)}
         )
 
         # 保存预警
-        self.alerts[alert_id] = alert
+        with self._lock:
+            self.alerts[alert_id] = alert
+            self._by_symbol.setdefault(symbol, set()).add(alert_id)
+            self._arrays_dirty = True
+            if expires_at:
+                heapq.heappush(self._expiry_heap, (expires_at.timestamp(), alert_id))
 
         self.logger.info(f"[setup_alert] 创建预警成功: {alert_id}")
 
@@ -253,29 +524,56 @@ class AlertSystem:
 
     def remove_alert(self, alert_id: str) -> bool:
         """移除预警"""
-        if alert_id in self.alerts:
-            del self.alerts[alert_id]
-            self.logger.info(f"[remove_alert] 移除预警: {alert_id}")
-            return True
-        return False
+        with self._lock:
+            alert = self.alerts.pop(alert_id, None)
+            if alert is None:
+                return False
+            self._unindex(alert)
 
-    def list_alerts(self, symbol: Optional[str] = None, status: Optional[str] = None) -> List[Dict[str, Any]]:
-        """列出所有预警"""
-        result = []
-        for alert in self.alerts.values():
-            if symbol and alert.symbol != symbol:
-                continue
-            if status and alert.status.value != status:
-                continue
+        self.logger.info(f"[remove_alert] 移除预警: {alert_id}")
+        return True
+
+    def list_alerts(
+        self,
+        symbol: Optional[str] = None,
+        status: Optional[str] = None,
+        out: Optional[List[Dict[str, Any]]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        列出所有预警
 
-            result.append({
-                "id": alert.id,
-                "symbol": alert.symbol,
-                "alert_type": alert.alert_type.value,
-                "status": alert.status.value,
-                "created_at": alert.created_at.isoformat(),
-                "expires_at": alert.expires_at.isoformat() if alert.expires_at else None
-            })
+        参数:
+            symbol: 只列出该股票的预警
+            status: 只列出该状态的预警
+            out: 调用方持有的结果列表，先清空再填充并返回；轮询时传入同一个列表可避免重复分配
+
+        返回:
+            预警信息列表
+        """
+        result = [] if out is None else out
+        result.clear()
+
+        # 状态过滤条件只转换一次，未知状态不匹配任何预警
+        status_member = _ALERT_STATUS_CACHE.get(status) if status else None
+        if status and status_member is None:
+            return result
+
+        # 持锁直接遍历，不复制整张预警表
+        with self._lock:
+            for alert in self.alerts.values():
+                if symbol and alert.symbol != symbol:
+                    continue
+                if status_member is not None and alert.status is not status_member:
+                    continue
+
+                result.append({
+                    "id": alert.id,
+                    "symbol": alert.symbol,
+                    "alert_type": _ALERT_TYPE_VALUES[alert.alert_type],
+                    "status": _STATUS_VALUES[alert.status],
+                    "created_at": alert.created_at.isoformat(),
+                    "expires_at": alert.expires_at.isoformat() if alert.expires_at else None
+                })
         return result
 
     def start_monitoring(self):
@@ -284,6 +582,7 @@ class AlertSystem:
             return
 
         self.running = True
+        self._stop_evt.clear()
         self.monitor_thread = threading.Thread(target=self._monitor_loop)
         self.monitor_thread.daemon = True
         self.monitor_thread.start()
@@ -293,6 +592,7 @@ class AlertSystem:
     def stop_monitoring(self):
         """停止监控线程"""
         self.running = False
+        self._stop_evt.set()
         if self.monitor_thread:
             self.monitor_thread.join(timeout=5)
 
@@ -301,49 +601,248 @@ class AlertSystem:
     def _monitor_loop(self):
         """监控循环"""
         while self.running:
-            try:
-                self._check_all_alerts()
-            except Exception as e:
-                self.logger.error(f"[_monitor_loop] 检查预警失败: {e}")
+            # 交易时段按北京时间判断，与服务器所在时区无关
+            now = datetime.now(_BEIJING_TZ)
+            if _is_trading_time(now):
+                try:
+                    self._check_all_alerts()
+                except Exception as e:
+                    self.logger.error(f"[_monitor_loop] 检查预警失败: {e}")
+                timeout = self.check_interval
+            else:
+                # 非交易时段行情不变，只做过期清理，睡到下一个交易时段开始或下一个预警到期
+                timeout = _seconds_until_next_session(now)
+                with self._lock:
+                    now_ts = time.time()
+                    self._expire_due(now_ts)
+                    if self._expiry_heap:
+                        timeout = min(timeout, self._expiry_heap[0][0] - now_ts + 1.0)
+                self.logger.debug(f"[_monitor_loop] 非交易时段，{timeout:.0f} 秒后恢复检查")
+
+            # 等待下一个检查周期，停止时提前返回
+            if self._stop_evt.wait(timeout):
+                break
+
+    def _unindex(self, alert: Alert):
+        """从按股票索引中删除预警（不再参与检查），调用方需持有 self._lock"""
+        ids = self._by_symbol.get(alert.symbol)
+        if ids is not None:
+            ids.discard(alert.id)
+            if not ids:
+                del self._by_symbol[alert.symbol]
+            self._arrays_dirty = True
+
+    def _rebuild_condition_arrays(self):
+        """
+        把可批量比较的预警整理为列式数组
 
-            # 等待下一个检查周期
-            for _ in range(self.check_interval):
-                if not self.running:
-                    break
-                time.sleep(1)
+        同一 (预警类型, 运算符) 的预警合并为 (预警ID, 股票行号, 阈值, 上限阈值) 四个数组，
+        每轮检查只需一次 NumPy 比较；其余预警按股票分组逐个检查
+        """
+        self._symbols = list(self._by_symbol)
+        groups: Dict[Tuple[AlertType, AlertOperator], Tuple[List[str], List[int], List[float], List[float]]] = {}
+        scalar: Dict[str, List[str]] = {}
+
+        for row, symbol in enumerate(self._symbols):
+            for alert_id in self._by_symbol[symbol]:
+                alert = self.alerts[alert_id]
+                key = (alert.alert_type, alert.condition.operator)
+                if key in _VECTOR_CHECKS:
+                    ids, rows, values, values2 = groups.setdefault(key, ([], [], [], []))
+                    ids.append(alert_id)
+                    rows.append(row)
+                    values.append(alert.condition.value)
+                    # 未设置上限时为 NaN，区间比较恒为 False
+                    value2 = alert.condition.value2
+                    values2.append(np.nan if value2 is None else value2)
+                else:
+                    scalar.setdefault(symbol, []).append(alert_id)
+
+        self._condition_arrays = {
+            key: (
+                np.array(ids, dtype=object),
+                np.array(rows, dtype=np.intp),
+                np.array(values, dtype=np.float64),
+                np.array(values2, dtype=np.float64)
+            )
+            for key, (ids, rows, values, values2) in groups.items()
+        }
+        self._scalar_by_symbol = scalar
+        self._arrays_dirty = False
+
+    def _check_vectorized(self, quotes: Dict[str, Dict[str, Any]]) -> List[str]:
+        """对列式条件数组做批量比较，返回满足条件的预警ID（无行情的股票不触发）"""
+        current: Dict[str, np.ndarray] = {}
+        fired: List[str] = []
+
+        for key, (ids, rows, values, values2) in self._condition_arrays.items():
+            field_name, compare = _VECTOR_CHECKS[key]
+            if field_name not in current:
+                current[field_name] = np.array(
+                    [quotes[symbol][field_name] if symbol in quotes else np.nan
+                     for symbol in self._symbols],
+                    dtype=np.float64
+                )
+            fired.extend(ids[compare(current[field_name][rows], values, values2)])
+
+        return fired
+
+    def _expire_due(self, now: float):
+        """
+        弹出所有已到期的预警并标记为过期，只处理堆顶到期部分（调用方需持有 self._lock）
 
-    def _check_all_alerts(self):
-        """检查所有预警"""
-        for alert in list(self.alerts.values()):
-            # 跳过已触发或已禁用的预警
-            if alert.status in [AlertStatus.TRIGGERED, AlertStatus.DISABLED]:
+        参数:
+            now: 当前 Unix 时间戳（time.time()）
+        """
+        heap = self._expiry_heap
+        while heap and heap[0][0] < now:
+            _, alert_id = heapq.heappop(heap)
+            alert = self.alerts.get(alert_id)
+            # 已移除的预警在堆中留有记录，直接跳过
+            if alert is None or alert.status in [AlertStatus.TRIGGERED, AlertStatus.DISABLED]:
                 continue
+            alert.status = AlertStatus.EXPIRED
+            self._unindex(alert)
 
-            # 检查是否过期
-            if alert.expires_at and datetime.now() > alert.expires_at:
-                alert.status = AlertStatus.EXPIRED
-                continue
+    def _check_all_alerts(self):
+        """
+        检查所有预警
+
+        只在持锁时读取和更新预警表：锁内取出本轮待检查的预警，锁外请求行情并判断条件，
+        最后在锁内提交触发结果，检查期间 setup_alert/remove_alert 不会被网络请求阻塞
+        """
+        # 整轮检查共用一个时间点：过期判断用浮点时间戳，触发时间用 datetime
+        now_ts = time.time()
+        now = datetime.fromtimestamp(now_ts)
+
+        with self._lock:
+            self._expire_due(now_ts)
+
+            if not self._by_symbol:
+                return
 
+            if self._arrays_dirty:
+                self._rebuild_condition_arrays()
+
+            symbols = self._symbols
+            # 复用上一轮的列表，避免每轮重新分配
+            scalar = self._tick_buf
+            scalar.clear()
+            scalar.extend(
+                (symbol, self.alerts[alert_id])
+                for symbol, alert_ids in self._scalar_by_symbol.items()
+                for alert_id in alert_ids
+            )
+
+        # 所有预警共用一次全市场行情请求
+        quotes = self._fetch_quotes_batch(symbols)
+
+        candidates = self._check_vectorized(quotes)
+
+        # 技术指标预警一次算完所有行的盘中指标
+        technical = [(alert, quotes[symbol]) for symbol, alert in scalar
+                     if alert.alert_type is AlertType.TECHNICAL and symbol in quotes]
+        try:
+            technical_values = dict(zip(
+                (alert.id for alert, _ in technical),
+                self._technical_values([(alert, self._quote_price(quote)) for alert, quote in technical])
+            ))
+        except Exception as e:
+            self.logger.error(f"[_check_all_alerts] 计算技术指标失败: {e}")
+            technical_values = {alert.id: None for alert, _ in technical}
+
+        for symbol, alert in scalar:
             # 检查预警条件
             try:
-                triggered = self._check_alert_condition(alert)
-                if triggered:
-                    alert.status = AlertStatus.TRIGGERED
-                    alert.triggered_at = datetime.now()
-                    self._send_notification(alert)
+                if alert.id in technical_values:
+                    values = technical_values[alert.id]
+                    hit = values is not None and self._check_technical_condition(alert, quotes[symbol], values)
+                else:
+                    hit = self._check_alert_condition(alert, quotes.get(symbol))
+                if hit:
+                    candidates.append(alert.id)
             except Exception as e:
                 self.logger.error(f"[_check_all_alerts] 检查预警 {alert.id} 失败: {e}")
 
-    def _check_alert_condition(self, alert: Alert) -> bool:
-        """检查单个预警条件"""
-        # 获取实时数据
+        fired: List[Alert] = []
+        with self._lock:
+            for alert_id in candidates:
+                alert = self.alerts.get(alert_id)
+                # 检查期间可能已被移除、禁用或过期
+                if alert is not None and alert.status == AlertStatus.ACTIVE:
+                    fired.append(self._trigger(alert, now))
+
+        self._dispatch_notifications(fired)
+
+    def _trigger(self, alert: Alert, now: datetime) -> Alert:
+        """标记预警已触发并移出待检查索引（调用方需持有 self._lock）"""
+        alert.status = AlertStatus.TRIGGERED
+        alert.triggered_at = now
+        self._unindex(alert)
+        return alert
+
+    def _dispatch_notifications(self, alerts: List[Alert]):
+        """
+        发送本轮触发的预警通知
+
+        邮件/微信/钉钉通知都是网络请求，多条预警同时触发时并发发送，
+        本轮耗时取决于最慢的一条通知而不是逐条累加
+        """
+        if len(alerts) <= 1:
+            for alert in alerts:
+                self._send_notification(alert)
+            return
+
+        workers = min(self.max_notify_workers, len(alerts))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="alert-notify") as executor:
+            list(executor.map(self._send_notification, alerts))
+
+    def _fetch_quotes_batch(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        批量获取实时行情
+
+        只请求一次全市场行情快照，再按代码取出所需股票，
+        代替逐个预警调用 fetch_realtime_quote（每次都会下载全市场行情）。
+
+        参数:
+            symbols: 股票代码列表
+
+        返回:
+            {代码: 报价字典}，字段与 fetch_realtime_quote 一致；
+            获取失败或代码不存在时不包含对应股票
+        """
+        if ak is None:
+            self.logger.error("[_fetch_quotes_batch] akshare库未安装")
+            return {}
+
         try:
-            realtime_data = fetch_realtime_quote(symbol=alert.symbol, market="sh")
-        except:
-            try:
-                realtime_data = fetch_realtime_quote(symbol=alert.symbol, market="sz")
-            except:
-                return False
+            df = ak.stock_zh_a_spot_em()
+        except Exception as e:
+            self.logger.error(f"[_fetch_quotes_batch] 获取全市场行情失败: {e}")
+            return {}
+
+        df = df[df["代码"].isin(symbols)].drop_duplicates("代码")
+
+        quotes = pd.DataFrame({"symbol": df["代码"], "name": df.get("名称", "")})
+        for field_name, column in _QUOTE_NUMERIC_FIELDS.items():
+            if column in df.columns:
+                quotes[field_name] = pd.to_numeric(df[column], errors="coerce").fillna(0)
+            else:
+                quotes[field_name] = 0.0
+        quotes["volume"] = quotes["volume"].astype("int64")
+        quotes["timestamp"] = datetime.now().isoformat()
+
+        self.logger.debug(f"[_fetch_quotes_batch] 获取 {len(quotes)}/{len(symbols)} 只股票行情")
+        return {record["symbol"]: record for record in quotes.to_dict("records")}
+
+    def _check_alert_condition(self, alert: Alert, realtime_data: Optional[Dict[str, Any]] = None) -> bool:
+        """检查单个预警条件（realtime_data 为批量获取的实时行情）"""
+        if alert.alert_type == AlertType.NEWS:
+            return self._check_news_condition(alert)
+
+        # 未获取到行情时本轮不触发
+        if realtime_data is None:
+            return False
 
         # 根据预警类型检查条件
         if alert.alert_type == AlertType.PRICE:
@@ -352,59 +851,148 @@ class AlertSystem:
             return self._check_volume_condition(alert, realtime_data)
         elif alert.alert_type == AlertType.TECHNICAL:
             return self._check_technical_condition(alert, realtime_data)
-        elif alert.alert_type == AlertType.NEWS:
-            return self._check_news_condition(alert)
 
         return False
 
     def _check_price_condition(self, alert: Alert, data: Dict[str, Any]) -> bool:
         """检查价格条件"""
-        current_price = data.get("price", 0)
-        operator = alert.condition.operator
-        value = alert.condition.value
-
-        if operator == "above":
-            return current_price > value
-        elif operator == "below":
-            return current_price < value
-        elif operator == "between":
-            return value <= current_price <= alert.condition.value2
-        elif operator == "equals":
-            return abs(current_price - value) < 0.01
-
-        return False
+        check = _PRICE_OPS.get(alert.condition.operator)
+        return check is not None and check(
+            data.get("price", 0), alert.condition.value, alert.condition.value2
+        )
 
     def _check_volume_condition(self, alert: Alert, data: Dict[str, Any]) -> bool:
         """检查成交量条件"""
-        current_volume = data.get("volume", 0)
-        operator = alert.condition.operator
-        value = alert.condition.value
-
-        if operator == "above":
-            return current_volume > value
-        elif operator == "below":
-            return current_volume < value
-        elif operator == "sudden_increase":
-            # 需要获取历史平均成交量
-            return False
+        # SUDDEN_INCREASE 需要历史平均成交量，暂不触发
+        check = _VOLUME_OPS.get(alert.condition.operator)
+        return check is not None and check(
+            data.get("volume", 0), alert.condition.value, alert.condition.value2
+        )
 
-        return False
+    def _check_technical_condition(
+        self,
+        alert: Alert,
+        data: Dict[str, Any],
+        values: Optional[np.ndarray] = None
+    ) -> bool:
+        """
+        检查技术指标条件
+
+        指标状态截至上一交易日收盘，每轮只用最新价做一次递推得到盘中指标，
+        不重新计算整段历史
 
-    def _check_technical_condition(self, alert: Alert, data: Dict[str, Any]) -> bool:
-        """检查技术指标条件"""
-        indicator = alert.condition.get("indicator", "")
+        参数:
+            alert: 技术指标预警
+            data: 实时行情
+            values: 已批量算好的盘中指标（MACD 柱、RSI、均线、标准差），为空时单独计算
+        """
+        indicator = alert.condition.indicator
         operator = alert.condition.operator
+        price = self._quote_price(data)
+
+        if values is None:
+            values = self._technical_values([(alert, price)])[0]
+            if values is None:
+                return False
+        hist, rsi, mid, std = values
 
-        # 简化处理，实际应该获取历史K线计算指标
         if indicator == "macd":
-            # 需要获取历史数据计算MACD
-            return False
+            check = _MACD_OPS.get(operator)
+            row = self._indicators.rows[self._indicator_key(alert)]
+            return check is not None and check(self._indicators.hist[row], hist)
+
         elif indicator == "rsi":
-            # 需要获取历史数据计算RSI
-            return False
+            check = _RSI_OPS.get(operator)
+            return check is not None and check(rsi, alert.condition.value)
+
+        elif indicator == "ma":
+            check = _MA_OPS.get(operator)
+            return check is not None and check(price, mid)
+
+        elif indicator == "boll":
+            # 样本不足时 std 为 NaN，比较结果为 False
+            check = _BOLL_OPS.get(operator)
+            return check is not None and check(price, mid + 2 * std, mid - 2 * std)
 
         return False
 
+    @staticmethod
+    def _quote_price(data: Dict[str, Any]) -> float:
+        """行情中的最新价，缺失时为 0"""
+        return float(data.get("price", 0) or 0)
+
+    @staticmethod
+    def _indicator_key(alert: Alert) -> Tuple[str, int]:
+        """技术指标状态的行键 (股票代码, 周期)"""
+        indicator = alert.condition.indicator
+        return alert.symbol, int(alert.condition.period or _DEFAULT_INDICATOR_PERIOD[indicator])
+
+    def _technical_values(self, items: List[Tuple[Alert, float]]) -> List[Optional[np.ndarray]]:
+        """
+        批量计算技术指标预警的盘中指标
+
+        参数:
+            items: (预警, 最新价) 列表
+
+        返回:
+            与 items 对应的指标数组（MACD 柱、RSI、均线、标准差）；
+            指标不支持、无有效价格或历史数据获取失败时为 None
+        """
+        today = datetime.now().date()
+        rows: List[int] = []
+        prices: List[float] = []
+        slots: List[int] = []
+        for slot, (alert, price) in enumerate(items):
+            if alert.condition.indicator not in _DEFAULT_INDICATOR_PERIOD or price <= 0:
+                continue
+            row = self._indicator_row(alert, today)
+            if row is not None:
+                rows.append(row)
+                prices.append(price)
+                slots.append(slot)
+
+        result: List[Optional[np.ndarray]] = [None] * len(items)
+        if rows:
+            values = self._indicators.evaluate(np.array(rows, dtype=np.intp),
+                                               np.array(prices, dtype=np.float64))
+            for j, slot in enumerate(slots):
+                result[slot] = values[j]
+        return result
+
+    def _indicator_row(self, alert: Alert, today: date) -> Optional[int]:
+        """
+        获取预警对应的技术指标状态行
+
+        首次检查或跨交易日时，用截至上一交易日的日K线初始化该行；
+        获取历史数据失败时返回 None，下轮重试
+        """
+        key = self._indicator_key(alert)
+        session = today.toordinal()
+        row = self._indicators.lookup(key, session)
+        if row is not None:
+            return row
+
+        symbol, period = key
+        start = today - timedelta(days=_INDICATOR_LOOKBACK_DAYS)
+        try:
+            df = fetch_market_data(
+                symbol=symbol,
+                start_date=start.strftime("%Y%m%d"),
+                end_date=today.strftime("%Y%m%d"),
+                market=alert.metadata["market"]
+            )
+        except Exception as e:
+            self.logger.error(f"[_indicator_row] 获取 {symbol} 历史K线失败: {e}")
+            return None
+
+        # 只用已收盘的交易日，当日价格由每轮行情提供
+        df = df[pd.to_datetime(df["date"]).dt.date < today]
+        closes = pd.to_numeric(df["close"], errors="coerce").dropna().to_numpy(dtype=np.float64)
+        if closes.size == 0:
+            return None
+
+        return self._indicators.store(key, session, seed_state(closes, period, period))
+
     def _check_news_condition(self, alert: Alert) -> bool:
         """检查新闻条件"""
         # 简化处理，实际应该监控新闻源
@@ -457,6 +1045,30 @@ class AlertSystem:
         self.logger.info(f"[dingtalk_notification] 预警 {alert.id} 钉钉通知(待实现)")
 
 
+# 便利函数共用的预警系统实例，首次使用时创建
+_default_system: Optional[AlertSystem] = None
+_default_lock = threading.Lock()
+
+
+def _get_default() -> AlertSystem:
+    """获取便利函数共用的 AlertSystem 单例"""
+    global _default_system
+    if _default_system is None:
+        with _default_lock:
+            if _default_system is None:
+                _default_system = AlertSystem()
+    return _default_system
+
+
+def _shutdown_default():
+    """解释器退出时停止单例的监控线程"""
+    if _default_system is not None and _default_system.running:
+        _default_system.stop_monitoring()
+
+
+atexit.register(_shutdown_default)
+
+
 # 便利函数
 def setup_alert(
     symbol: str,
@@ -472,8 +1084,7 @@ def setup_alert(
         setup_alert('000001', 'price', {'operator': 'above', 'value': 15.0})
         setup_alert('600519', 'technical', {'indicator': 'macd', 'operator': 'golden_cross'})
     """
-    system = AlertSystem()
-    return system.setup_alert(
+    return _get_default().setup_alert(
         symbol=symbol,
         alert_type=alert_type,
         condition=condition,
@@ -484,11 +1095,13 @@ def setup_alert(
 
 def remove_alert(alert_id: str) -> bool:
     """移除预警"""
-    system = AlertSystem()
-    return system.remove_alert(alert_id)
+    return _get_default().remove_alert(alert_id)
 
 
-def list_alerts(symbol: Optional[str] = None, status: Optional[str] = None) -> List[Dict[str, Any]]:
+def list_alerts(
+    symbol: Optional[str] = None,
+    status: Optional[str] = None,
+    out: Optional[List[Dict[str, Any]]] = None
+) -> List[Dict[str, Any]]:
     """列出所有预警"""
-    system = AlertSystem()
-    return system.list_alerts(symbol, status)
+    return _get_default().list_alerts(symbol, status, out)
@@ -4,16 +4,69 @@
 提供邮件、微信、钉钉等通知方式
 """
 
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, ClassVar, Tuple
 from abc import ABC, abstractmethod
+import asyncio
+import atexit
+import base64
+import hashlib
+import hmac
+import importlib.util
+import json
 import smtplib
+import threading
+import time
 from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from ..utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# 通知请求超时（秒），避免接口无响应时阻塞预警监控线程
+_REQUEST_TIMEOUT = 5
+
+
+def _build_session() -> requests.Session:
+    """创建通知器共用的 HTTP 会话（连接池 + keep-alive）"""
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=50))
+    return session
+
+
+_SESSION = _build_session()
+
+# httpx 的 HTTP/2 支持依赖 h2 包
+_HTTP2 = importlib.util.find_spec("h2") is not None
+
+_JSON_HEADERS = {"Content-Type": "application/json; charset=utf-8"}
+
+
+def _dumps(data: Dict[str, Any]) -> bytes:
+    """序列化请求体，安装 orjson 时直接得到 UTF-8 字节"""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+
+def _loads(content: bytes) -> Dict[str, Any]:
+    """解析接口返回的 JSON"""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
 
 class BaseNotifier(ABC):
     """通知基类"""
@@ -27,10 +80,31 @@ class BaseNotifier(ABC):
         """发送通知"""
         pass
 
+    async def asend(
+        self,
+        message: str,
+        title: Optional[str] = None,
+        client: Optional["httpx.AsyncClient"] = None
+    ) -> bool:
+        """
+        异步发送通知
+
+        默认在线程池中调用 send；基于 HTTP 的通知器在提供 httpx 客户端时直接异步请求
+        """
+        return await asyncio.to_thread(self.send, message, title)
+
 
 class EmailNotifier(BaseNotifier):
     """邮件通知器"""
 
+    # SMTP 连接按 (服务器, 端口, 用户名) 缓存并复用，省去每封邮件的握手和登录
+    # send_notification 每次都会新建通知器，缓存放在类上才能跨实例复用
+    _connections: ClassVar[Dict[Tuple[str, int, str], smtplib.SMTP]] = {}
+    # 每个连接一把锁，只串行同一连接上的收发，不同邮箱账号互不阻塞；
+    # _connections_lock 只保护上面两个字典本身
+    _key_locks: ClassVar[Dict[Tuple[str, int, str], threading.Lock]] = {}
+    _connections_lock: ClassVar[threading.Lock] = threading.Lock()
+
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         self.smtp_server = config.get("smtp_server", "")
@@ -43,17 +117,26 @@ class EmailNotifier(BaseNotifier):
     def send(self, message: str, title: Optional[str] = None) -> bool:
         """发送邮件"""
         try:
-            msg = MIMEMultipart()
+            # 纯文本预警没有附件，直接用单段 MIMEText，无需 multipart 包装
+            msg = MIMEText(message, 'plain', 'utf-8')
             msg['From'] = self.from_addr
             msg['To'] = ', '.join(self.to_addrs)
             msg['Subject'] = title or "股票预警通知"
 
-            msg.attach(MIMEText(message, 'plain', 'utf-8'))
-
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.username, self.password)
-                server.send_message(msg)
+            key = (self.smtp_server, self.smtp_port, self.username)
+            with self._key_lock(key):
+                try:
+                    try:
+                        self._get_connection(key).send_message(msg)
+                    except smtplib.SMTPServerDisconnected:
+                        # 服务器已关闭空闲连接，重连后重发一次
+                        self._close_connection(key)
+                        self._get_connection(key).send_message(msg)
+                except OSError:
+                    # 其他 SMTP 错误（SMTPException 是 OSError 的子类）或网络错误后连接状态不明，
+                    # 关闭并丢弃，下次发送时重新建立
+                    self._close_connection(key)
+                    raise
 
             self.logger.info(f"邮件发送成功: {title}")
             return True
@@ -62,10 +145,77 @@ class EmailNotifier(BaseNotifier):
             self.logger.error(f"邮件发送失败: {e}")
             return False
 
+    @classmethod
+    def _key_lock(cls, key: Tuple[str, int, str]) -> threading.Lock:
+        """获取指定连接的锁，不存在时创建"""
+        with cls._connections_lock:
+            lock = cls._key_locks.get(key)
+            if lock is None:
+                lock = cls._key_locks[key] = threading.Lock()
+            return lock
+
+    def _get_connection(self, key: Tuple[str, int, str]) -> smtplib.SMTP:
+        """获取已登录的 SMTP 连接，不存在时新建（调用方需持有该连接的锁）"""
+        server = self._connections.get(key)
+        if server is None:
+            if self.smtp_port == 465:
+                # 465 为隐式 TLS 端口，直接建立 SSL 连接，省去 starttls 往返
+                server = smtplib.SMTP_SSL(self.smtp_server, self.smtp_port, timeout=_REQUEST_TIMEOUT)
+            else:
+                server = smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=_REQUEST_TIMEOUT)
+            try:
+                if self.smtp_port != 465:
+                    server.starttls()
+                server.login(self.username, self.password)
+            except Exception:
+                server.close()
+                raise
+            with self._connections_lock:
+                self._connections[key] = server
+        return server
+
+    @classmethod
+    def _close_connection(cls, key: Tuple[str, int, str]) -> None:
+        """关闭并丢弃缓存的连接"""
+        with cls._connections_lock:
+            server = cls._connections.pop(key, None)
+        if server is not None:
+            _quit_smtp(server)
+
+    @classmethod
+    def _close_all(cls) -> None:
+        """关闭所有缓存的 SMTP 连接（进程退出时自动调用）"""
+        with cls._connections_lock:
+            servers = list(cls._connections.values())
+            cls._connections.clear()
+        for server in servers:
+            _quit_smtp(server)
+
+
+def _quit_smtp(server: smtplib.SMTP) -> None:
+    """发送 QUIT 后关闭连接，连接已断开时直接关闭套接字"""
+    try:
+        server.quit()
+    except Exception:
+        server.close()
+
+
+atexit.register(EmailNotifier._close_all)
+
 
 class WeChatNotifier(BaseNotifier):
     """微信通知器(企业微信)"""
 
+    # access_token 按 (corpid, corpsecret) 缓存: token, 过期时间(time.monotonic)
+    # send_notification 每次都会新建通知器，缓存放在类上才能跨实例复用
+    _token_cache: ClassVar[Dict[Tuple[str, str], Tuple[str, float]]] = {}
+
+    # access_token 不合法或已过期的错误码，收到后刷新 token 重发一次
+    TOKEN_ERRCODES = (40001, 40014, 42001)
+
+    # 在官方有效期(expires_in)结束前提前刷新的秒数
+    TOKEN_REFRESH_MARGIN = 300
+
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         self.corpid = config.get("corpid", "")
@@ -73,48 +223,97 @@ class WeChatNotifier(BaseNotifier):
         self.agentid = config.get("agentid", "")
         self.access_token = None
 
-    def _get_access_token(self) -> str:
-        """获取access_token"""
-        import requests
+    def _get_access_token(self, refresh: bool = False) -> str:
+        """获取access_token，有效期内直接使用缓存"""
+        key = (self.corpid, self.corpsecret)
+        cached = self._token_cache.get(key)
+        if not refresh and cached is not None and time.monotonic() < cached[1]:
+            return cached[0]
 
         url = f"https://qyapi.weixin.qq.com/cgi-bin/gettoken?corpid={self.corpid}&corpsecret={self.corpsecret}"
-        response = requests.get(url)
-        data = response.json()
-        return data.get("access_token", "")
+        response = _SESSION.get(url, timeout=_REQUEST_TIMEOUT)
+        data = _loads(response.content)
+        token = data.get("access_token", "")
+        if token:
+            expires_at = time.monotonic() + data.get("expires_in", 7200) - self.TOKEN_REFRESH_MARGIN
+            self._token_cache[key] = (token, expires_at)
+        return token
 
     def send(self, message: str, title: Optional[str] = None) -> bool:
         """发送企业微信消息"""
         try:
-            import requests
+            data = self._build_payload(message, title)
 
-            if not self.access_token:
-                self.access_token = self._get_access_token()
+            self.access_token = self._get_access_token()
+            result = self._post_message(data)
+            if result.get("errcode") in self.TOKEN_ERRCODES:
+                # token 被提前作废（如在别处重新获取），刷新后重发一次
+                self.access_token = self._get_access_token(refresh=True)
+                result = self._post_message(data)
 
-            url = f"https://qyapi.weixin.qq.com/cgi-bin/message/send?access_token={self.access_token}"
+            return self._check_result(result, title)
 
-            data = {
-                "touser": "@all",
-                "msgtype": "text",
-                "agentid": self.agentid,
-                "text": {
-                    "content": f"{title}\n{message}" if title else message
-                }
-            }
+        except Exception as e:
+            self.logger.error(f"微信消息发送失败: {e}")
+            return False
 
-            response = requests.post(url, json=data)
-            result = response.json()
+    async def asend(
+        self,
+        message: str,
+        title: Optional[str] = None,
+        client: Optional["httpx.AsyncClient"] = None
+    ) -> bool:
+        """异步发送企业微信消息（token 缓存命中时只有一次异步请求）"""
+        if client is None:
+            return await super().asend(message, title)
 
-            if result.get("errcode") == 0:
-                self.logger.info(f"微信消息发送成功: {title}")
-                return True
-            else:
-                self.logger.error(f"微信消息发送失败: {result}")
-                return False
+        try:
+            data = self._build_payload(message, title)
+
+            self.access_token = await asyncio.to_thread(self._get_access_token)
+            response = await client.post(self._message_url(), content=_dumps(data), headers=_JSON_HEADERS)
+            result = _loads(response.content)
+            if result.get("errcode") in self.TOKEN_ERRCODES:
+                self.access_token = await asyncio.to_thread(self._get_access_token, True)
+                response = await client.post(self._message_url(), content=_dumps(data),
+                                             headers=_JSON_HEADERS)
+                result = _loads(response.content)
+
+            return self._check_result(result, title)
 
         except Exception as e:
             self.logger.error(f"微信消息发送失败: {e}")
             return False
 
+    def _build_payload(self, message: str, title: Optional[str]) -> Dict[str, Any]:
+        """构造企业微信文本消息"""
+        return {
+            "touser": "@all",
+            "msgtype": "text",
+            "agentid": self.agentid,
+            "text": {
+                "content": f"{title}\n{message}" if title else message
+            }
+        }
+
+    def _check_result(self, result: Dict[str, Any], title: Optional[str]) -> bool:
+        """根据接口返回记录日志并判断是否发送成功"""
+        if result.get("errcode") == 0:
+            self.logger.info(f"微信消息发送成功: {title}")
+            return True
+        self.logger.error(f"微信消息发送失败: {result}")
+        return False
+
+    def _message_url(self) -> str:
+        """发送消息接口地址（带当前 access_token）"""
+        return f"https://qyapi.weixin.qq.com/cgi-bin/message/send?access_token={self.access_token}"
+
+    def _post_message(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """调用企业微信发送消息接口"""
+        response = _SESSION.post(self._message_url(), data=_dumps(data), headers=_JSON_HEADERS,
+                                 timeout=_REQUEST_TIMEOUT)
+        return _loads(response.content)
+
 
 class DingTalkNotifier(BaseNotifier):
     """钉钉通知器"""
@@ -123,55 +322,74 @@ class DingTalkNotifier(BaseNotifier):
         super().__init__(config)
         self.webhook = config.get("webhook", "")
         self.secret = config.get("secret", "")
+        # 密钥固定，预先完成 HMAC 的密钥初始化，每次签名只需复制后追加内容
+        self._secret_bytes = self.secret.encode('utf-8')
+        self._hmac_proto = hmac.new(self._secret_bytes, digestmod=hashlib.sha256)
 
     def _generate_sign(self, timestamp: str) -> str:
         """生成钉钉签名"""
-        import hashlib
-        import hmac
-        import base64
-
-        string_to_sign = f"{timestamp}\n{self.secret}"
-        hmac_code = hmac.new(
-            self.secret.encode('utf-8'),
-            string_to_sign.encode('utf-8'),
-            digestmod=hashlib.sha256
-        ).digest()
-        sign = base64.b64encode(hmac_code).decode('utf-8')
-        return sign
+        h = self._hmac_proto.copy()
+        h.update(timestamp.encode('utf-8') + b"\n" + self._secret_bytes)
+        return base64.b64encode(h.digest()).decode('utf-8')
 
     def send(self, message: str, title: Optional[str] = None) -> bool:
         """发送钉钉消息"""
         try:
-            import requests
-            import time
-
-            timestamp = str(round(time.time() * 1000))
-            sign = self._generate_sign(timestamp)
+            response = _SESSION.post(
+                self._signed_url(),
+                data=_dumps(self._build_payload(message, title)),
+                headers=_JSON_HEADERS,
+                timeout=_REQUEST_TIMEOUT
+            )
+            return self._check_result(_loads(response.content), title)
 
-            url = f"{self.webhook}&timestamp={timestamp}&sign={sign}"
-
-            data = {
-                "msgtype": "markdown",
-                "markdown": {
-                    "title": title or "股票预警",
-                    "text": f"### {title}\n{message}" if title else message
-                }
-            }
+        except Exception as e:
+            self.logger.error(f"钉钉消息发送失败: {e}")
+            return False
 
-            response = requests.post(url, json=data)
-            result = response.json()
+    async def asend(
+        self,
+        message: str,
+        title: Optional[str] = None,
+        client: Optional["httpx.AsyncClient"] = None
+    ) -> bool:
+        """异步发送钉钉消息"""
+        if client is None:
+            return await super().asend(message, title)
 
-            if result.get("errcode") == 0:
-                self.logger.info(f"钉钉消息发送成功: {title}")
-                return True
-            else:
-                self.logger.error(f"钉钉消息发送失败: {result}")
-                return False
+        try:
+            response = await client.post(self._signed_url(), content=_dumps(self._build_payload(message, title)),
+                                         headers=_JSON_HEADERS)
+            return self._check_result(_loads(response.content), title)
 
         except Exception as e:
             self.logger.error(f"钉钉消息发送失败: {e}")
             return False
 
+    def _signed_url(self) -> str:
+        """带时间戳和签名的 webhook 地址"""
+        timestamp = str(round(time.time() * 1000))
+        sign = self._generate_sign(timestamp)
+        return f"{self.webhook}&timestamp={timestamp}&sign={sign}"
+
+    def _build_payload(self, message: str, title: Optional[str]) -> Dict[str, Any]:
+        """构造钉钉 markdown 消息"""
+        return {
+            "msgtype": "markdown",
+            "markdown": {
+                "title": title or "股票预警",
+                "text": f"### {title}\n{message}" if title else message
+            }
+        }
+
+    def _check_result(self, result: Dict[str, Any], title: Optional[str]) -> bool:
+        """根据接口返回记录日志并判断是否发送成功"""
+        if result.get("errcode") == 0:
+            self.logger.info(f"钉钉消息发送成功: {title}")
+            return True
+        self.logger.error(f"钉钉消息发送失败: {result}")
+        return False
+
 
 def send_notification(
     message: str,
@@ -210,3 +428,33 @@ def send_notification(
         return False
 
     return notifier.send(message, title)
+
+
+async def send_notifications_async(
+    batch: List[Tuple[BaseNotifier, str, Optional[str]]]
+) -> List[bool]:
+    """
+    并发发送一批通知
+
+    安装 httpx 时整批通知共用一个 AsyncClient（装有 h2 时启用 HTTP/2，
+    同一接口的多条消息复用一条连接）；否则各通知器在线程池中并发调用 send
+
+    参数:
+        batch: (通知器, 消息内容, 标题) 列表
+
+    返回:
+        与 batch 顺序一致的发送结果
+    """
+    if httpx is None:
+        return list(await asyncio.gather(*(
+            notifier.asend(message, title) for notifier, message, title in batch
+        )))
+
+    async with httpx.AsyncClient(
+        http2=_HTTP2,
+        timeout=_REQUEST_TIMEOUT,
+        limits=httpx.Limits(max_connections=20)
+    ) as client:
+        return list(await asyncio.gather(*(
+            notifier.asend(message, title, client=client) for notifier, message, title in batch
+        )))
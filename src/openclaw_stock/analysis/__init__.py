@@ -17,10 +17,13 @@ from .technical_analysis import (
 )
 from .fundamental_analysis import (
     calculate_fundamental_indicators,
+    calculate_fundamental_indicators_batch,
+    calculate_fundamental_indicators_lazy,
     FundamentalAnalyzer
 )
 from .stock_analyzer import (
     analyze_stock,
+    analyze_stocks,
     StockAnalyzer,
     PredictionResult
 )
@@ -38,9 +41,12 @@ __all__ = [
     'calculate_ema',
     # 基本面分析
     'calculate_fundamental_indicators',
+    'calculate_fundamental_indicators_batch',
+    'calculate_fundamental_indicators_lazy',
     'FundamentalAnalyzer',
     # 综合分析
     'analyze_stock',
+    'analyze_stocks',
     'StockAnalyzer',
     'PredictionResult',
 ]
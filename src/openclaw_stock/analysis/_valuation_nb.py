@@ -0,0 +1,58 @@
+"""
+估值分类内核
+
+全市场批量分类时逐行比较 PE/PB 并选出估值等级。安装 numba 时编译为
+gufunc（单次遍历、释放 GIL），否则退回等价的 numpy 向量化实现，结果一致。
+
+估值等级编码: 0=unknown, 1=undervalued, 2=fair, 3=overvalued
+"""
+
+import math
+
+import numpy as np
+
+try:
+    from numba import guvectorize
+except ImportError:
+    guvectorize = None
+
+UNKNOWN, UNDERVALUED, FAIR, OVERVALUED = 0, 1, 2, 3
+
+
+def _valuation_codes_numpy(pe, pb):
+    """numpy 实现：各条件整列计算后按优先级选择"""
+    pe = np.asarray(pe, dtype=np.float64)
+    pb = np.asarray(pb, dtype=np.float64)
+    codes = np.select(
+        [np.isnan(pe) | np.isnan(pb), (pe < 10) & (pb < 1), (pe > 50) | (pb > 5)],
+        [UNKNOWN, UNDERVALUED, OVERVALUED],
+        default=FAIR
+    )
+    return codes.astype(np.int64)
+
+
+if guvectorize is None:
+    valuation_codes = _valuation_codes_numpy
+else:
+    @guvectorize(["void(float64[:], float64[:], int64[:])"], "(n),(n)->(n)",
+                 nopython=True, cache=True)
+    def valuation_codes(pe, pb, out):
+        """
+        按 PE/PB 计算估值等级编码（规则与 FundamentalAnalyzer.analyze_valuation 一致）
+
+        参数:
+            pe: 市盈率（float64 数组，NaN 表示缺失）
+            pb: 市净率
+
+        返回:
+            int64 编码数组（作为 gufunc 调用时由 numba 分配）
+        """
+        for i in range(pe.shape[0]):
+            if math.isnan(pe[i]) or math.isnan(pb[i]):
+                out[i] = UNKNOWN
+            elif pe[i] < 10 and pb[i] < 1:
+                out[i] = UNDERVALUED
+            elif pe[i] > 50 or pb[i] > 5:
+                out[i] = OVERVALUED
+            else:
+                out[i] = FAIR
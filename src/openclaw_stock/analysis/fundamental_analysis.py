@@ -4,27 +4,164 @@
 实现设计文档4.2节的接口5: 基本面指标计算
 """
 
-from typing import Literal, Optional, Dict, Any, List
-from dataclasses import dataclass
+from typing import Literal, Optional, Dict, Any, List, Callable, Union
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, fields
 from datetime import datetime
+import json
+import math
+import sys
+import time
 import pandas as pd
 import numpy as np
 
+from ..adapters.akshare_adapter_em import pooled_requests
 from ..core.exceptions import DataSourceError, CalculationError
+from ..utils.decorators import cache_result
 from ..utils.logger import get_logger
 from ..data.financial_data import fetch_financial_data, fetch_financial_report
+from ._valuation_nb import valuation_codes
 
 try:
     import akshare as ak
 except ImportError:
     ak = None
 
-logger = get_logger(__name__)
+try:
+    import polars as pl
+except ImportError:
+    pl = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
+logger = get_logger(__name__)
 
-@dataclass
+# 全市场筛选时会同时持有数千个指标对象，Python 3.10+ 上使用 __slots__ 去掉每个实例的 __dict__
+_DATACLASS_OPTIONS: Dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# 估值与财务摘要两个接口互不依赖，在线程池中并发请求（耗时取两者中的较大值）
+_FETCH_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="fundamental")
+
+# 全市场行情列名 -> 批量结果的估值/市值字段。
+# 全市场行情没有 TTM 市盈率，pe_ttm 以动态市盈率（按最近一期年化）代替，
+# 与单只计算取自估值指标表的 市盈率(TTM) 口径不同，两者的 PEG 与估值分类可能不一致
+_SPOT_VALUATION_COLUMNS = {
+    "市盈率-动态": "pe_ttm",
+    "市净率": "pb",
+    "总市值": "market_cap",
+    "流通市值": "float_market_cap",
+}
+
+# 估值指标表列名 -> 结果字段，按结果分类分组
+_VALUATION_MAP = {
+    "valuation": (
+        ("市盈率(TTM)", "pe_ttm"),
+        ("市盈率(静)", "pe_lyr"),
+        ("市净率", "pb"),
+        ("市销率", "ps_ttm"),
+        ("净资产收益率", "roe"),
+    ),
+    "market": (
+        ("总市值", "market_cap"),
+        ("流通市值", "float_market_cap"),
+    ),
+}
+
+# 财务摘要列名 -> 结果字段，按结果分类分组
+# （ROE 也从财务摘要取，批量结果没有估值指标表，analyze_profitability_batch 依赖该列）
+_FINANCE_MAP = {
+    "profitability": (
+        ("净资产收益率", "roe"),
+        ("销售毛利率", "gross_margin"),
+        ("销售净利率", "net_margin"),
+        ("总资产净利率", "roa"),
+    ),
+    "growth": (
+        ("营业总收入同比增长率", "revenue_growth"),
+        ("净利润同比增长率", "profit_growth"),
+        ("净资产收益率同比增长率", "roe_growth"),
+    ),
+    "quality": (
+        ("资产负债率", "debt_ratio"),
+        ("流动比率", "current_ratio"),
+        ("速动比率", "quick_ratio"),
+    ),
+}
+
+# 财务摘要提取出的全部字段（批量结果的列顺序）
+_FINANCE_FIELDS = tuple(dst for pairs in _FINANCE_MAP.values() for _, dst in pairs)
+
+# 基本面分析报告模板，generate_report 一次 format 生成
+_REPORT_TEMPLATE = "\n".join([
+    "=== {symbol} 基本面分析报告 ===",
+    "数据时间: {data_time}",
+    "",
+    "【估值分析】",
+    "  PE(TTM): {pe_ttm}",
+    "  PB: {pb}",
+    "  估值水平: {valuation_level}",
+    "",
+    "【盈利能力】",
+    "  ROE: {roe}%",
+    "  净利率: {net_margin}%",
+    "  盈利水平: {profitability_level}",
+    "",
+    "【成长性】",
+    "  营收增长率: {revenue_growth}%",
+    "  利润增长率: {profit_growth}%",
+    "  成长水平: {growth_level}",
+    "",
+    "【财务质量】",
+    "  资产负债率: {debt_ratio}%",
+    "  流动比率: {current_ratio}",
+    "",
+    "=== 报告结束 ===",
+])
+
+# 估值等级编码（见 _valuation_nb）-> 标签，按编码下标一次取出整列标签
+_VALUATION_LABELS = np.array(["unknown", "undervalued", "fair", "overvalued"])
+
+# 基本面数据最多每日更新一次，各表用到的最新一行按 (股票代码, 日期) 缓存
+_FUNDAMENTAL_CACHE_TTL = 3600.0
+
+
+def _daily_key(func_name: str) -> Callable[[str], str]:
+    """生成按股票代码和当日日期区分的缓存键函数（保留 函数名( 前缀以便 clear_cache）"""
+    return lambda symbol: f"{func_name}({symbol},{datetime.now().strftime('%Y-%m-%d')})"
+
+
+def _first_row(df: pd.DataFrame) -> Dict[str, Any]:
+    """取表的第一行为字典，空表返回空字典（整张表随后即可释放）"""
+    if not len(df):
+        return {}
+    return df.iloc[0].to_dict()
+
+
+@cache_result(cache_key_func=_daily_key("_fetch_valuation_row"), ttl=_FUNDAMENTAL_CACHE_TTL)
+def _fetch_valuation_row(symbol: str) -> Dict[str, Any]:
+    """请求个股估值指标表并只保留第一行（带缓存，请求失败时不缓存）"""
+    with pooled_requests():
+        return _first_row(ak.stock_a_lg_indicator(symbol=symbol))
+
+
+@cache_result(cache_key_func=_daily_key("_fetch_finance_row"), ttl=_FUNDAMENTAL_CACHE_TTL)
+def _fetch_finance_row(symbol: str) -> Dict[str, Any]:
+    """请求个股财务摘要表并只保留最近一期（带缓存，请求失败时不缓存）"""
+    with pooled_requests():
+        return _first_row(ak.stock_financial_abstract(symbol=symbol))
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class FundamentalIndicators:
-    """基本面指标数据类"""
+    """
+    基本面指标数据类
+
+    单只股票使用 Python float；批量存放于 FundamentalIndicatorsArray 时
+    比率类字段为 float32，市值字段为 float64（见 _INDICATOR_DTYPE）
+    """
 
     # 估值指标
     pe_ttm: Optional[float] = None  # 市盈率TTM
@@ -59,12 +196,72 @@ class FundamentalIndicators:
     dividend_yield: Optional[float] = None  # 股息率(%)
     payout_ratio: Optional[float] = None  # 分红率(%)
 
-    # 市场指标
+    # 市场指标（市值可达 1e12 以上，批量存放时保留 float64）
     market_cap: Optional[float] = None  # 总市值
     float_market_cap: Optional[float] = None  # 流通市值
     turnover_rate: Optional[float] = None  # 换手率
 
 
+# FundamentalIndicators 的字段名及对应的结构化数组 dtype（缺失值为 NaN）。
+# 比率与百分比只用于 PE<10、ROE>15 之类的阈值判断，float32 足够且内存减半；
+# 市值超出 float32 的有效位数（约 7 位），仍用 float64
+_FLOAT64_FIELDS = frozenset({"market_cap", "float_market_cap"})
+_INDICATOR_FIELDS = tuple(f.name for f in fields(FundamentalIndicators))
+_INDICATOR_DTYPE = np.dtype([
+    (name, "f8" if name in _FLOAT64_FIELDS else "f4") for name in _INDICATOR_FIELDS
+])
+
+
+class FundamentalIndicatorsArray:
+    """
+    多只股票的基本面指标，按字段连续存放（结构化数组）
+
+    arr["pe_ttm"] 返回该字段所有股票的数值视图，可直接交给
+    FundamentalAnalyzer.analyze_*_batch 批量分类
+    """
+
+    def __init__(self, symbols: List[str], data: Optional[np.ndarray] = None):
+        """
+        参数:
+            symbols: 股票代码列表
+            data: 与 symbols 等长、dtype 为 _INDICATOR_DTYPE 的数组，为空时全部填 NaN
+        """
+        self.symbols = list(symbols)
+        self.data = np.full(len(self.symbols), np.nan, dtype=_INDICATOR_DTYPE) if data is None else data
+        self._rows = {symbol: row for row, symbol in enumerate(self.symbols)}
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "FundamentalIndicatorsArray":
+        """由以股票代码为索引的指标表（如 calculate_fundamental_indicators_batch 的结果）构建"""
+        arr = cls([str(symbol) for symbol in df.index])
+        for name in _INDICATOR_FIELDS:
+            if name in df.columns:
+                arr.data[name] = pd.to_numeric(df[name], errors="coerce").to_numpy(dtype=np.float64)
+        return arr
+
+    @property
+    def index(self) -> pd.Index:
+        """股票代码索引"""
+        return pd.Index(self.symbols, name="symbol")
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def __getitem__(self, field_name: str) -> np.ndarray:
+        return self.data[field_name]
+
+    def get(self, symbol: str) -> FundamentalIndicators:
+        """取出单只股票的指标对象，NaN 转为 None"""
+        row = self.data[self._rows[symbol]]
+        return FundamentalIndicators(**{
+            name: None if math.isnan(row[name]) else float(row[name]) for name in _INDICATOR_FIELDS
+        })
+
+    def to_frame(self) -> pd.DataFrame:
+        """转换为以股票代码为索引的 DataFrame"""
+        return pd.DataFrame(self.data, index=self.index)
+
+
 def calculate_fundamental_indicators(
     symbol: str,
     include_history: bool = False
@@ -82,7 +279,8 @@ def calculate_fundamental_indicators(
             'valuation': {PE, PB, PS, PEG等估值指标},
             'profitability': {ROE, ROA, 净利率等盈利指标},
             'growth': {营收增长率, 利润增长率等成长指标},
-            'quality': {资产负债率, 现金流等质量指标}
+            'quality': {资产负债率, 现金流等质量指标},
+            'timestamp': 计算时间（Unix 时间戳，秒；展示时用 _format_ts 格式化）
         }
 
     异常:
@@ -92,7 +290,7 @@ def calculate_fundamental_indicators(
     if ak is None:
         raise DataSourceError("akshare库未安装")
 
-    logger.info(f"[calculate_fundamental_indicators] 计算 {symbol} 的基本面指标")
+    logger.info("[calculate_fundamental_indicators] 计算 %s 的基本面指标", symbol)
 
     try:
         result = {
@@ -102,77 +300,250 @@ def calculate_fundamental_indicators(
             "growth": {},
             "quality": {},
             "market": {},
-            "timestamp": datetime.now().isoformat()
+            "timestamp": time.time()
         }
 
-        # 1. 获取估值指标
-        try:
-            df_valuation = ak.stock_a_lg_indicator(symbol=symbol)
-            if not df_valuation.empty:
-                row = df_valuation.iloc[0]
-                result["valuation"] = {
-                    "pe_ttm": _safe_float(row, "市盈率(TTM)"),
-                    "pe_lyr": _safe_float(row, "市盈率(静)"),
-                    "pb": _safe_float(row, "市净率"),
-                    "ps_ttm": _safe_float(row, "市销率"),
-                    "roe": _safe_float(row, "净资产收益率"),
-                }
-                result["market"] = {
-                    "market_cap": _safe_float(row, "总市值"),
-                    "float_market_cap": _safe_float(row, "流通市值"),
-                }
-        except Exception as e:
-            logger.warning(f"[calculate_fundamental_indicators] 获取估值指标失败: {e}")
-
-        # 2. 获取财务摘要
-        try:
-            df_finance = ak.stock_financial_abstract(symbol=symbol)
-            if not df_finance.empty:
-                # 取最近一期数据
-                latest = df_finance.iloc[0]
-
-                # 盈利能力
-                result["profitability"]["gross_margin"] = _safe_float(latest, "销售毛利率")
-                result["profitability"]["net_margin"] = _safe_float(latest, "销售净利率")
-                result["profitability"]["roa"] = _safe_float(latest, "总资产净利率")
-
-                # 成长性
-                result["growth"]["revenue_growth"] = _safe_float(latest, "营业总收入同比增长率")
-                result["growth"]["profit_growth"] = _safe_float(latest, "净利润同比增长率")
-                result["growth"]["roe_growth"] = _safe_float(latest, "净资产收益率同比增长率")
-
-                # 财务质量
-                result["quality"]["debt_ratio"] = _safe_float(latest, "资产负债率")
-                result["quality"]["current_ratio"] = _safe_float(latest, "流动比率")
-                result["quality"]["quick_ratio"] = _safe_float(latest, "速动比率")
-        except Exception as e:
-            logger.warning(f"[calculate_fundamental_indicators] 获取财务摘要失败: {e}")
-
-        # 3. 计算PEG
+        # 1. 并发获取估值指标和财务摘要，任一数据源失败只影响对应部分
+        futures = [
+            _FETCH_EXECUTOR.submit(_fetch_valuation, symbol),
+            _FETCH_EXECUTOR.submit(_fetch_finance, symbol),
+        ]
+        for future in as_completed(futures):
+            result.update(future.result())
+
+        # 2. 计算PEG
         pe_ttm = result["valuation"].get("pe_ttm")
         profit_growth = result["growth"].get("profit_growth")
         if pe_ttm and profit_growth and profit_growth > 0:
             result["valuation"]["peg"] = round(pe_ttm / profit_growth, 2)
 
-        logger.info(f"[calculate_fundamental_indicators] 计算完成: {symbol}")
+        logger.info("[calculate_fundamental_indicators] 计算完成: %s", symbol)
         return result
 
     except Exception as e:
-        logger.error(f"[calculate_fundamental_indicators] 计算失败: {e}")
+        logger.error("[calculate_fundamental_indicators] 计算失败: %s", e)
         raise CalculationError(f"计算{symbol}基本面指标失败: {e}")
 
 
-def _safe_float(row: pd.Series, column: str) -> Optional[float]:
-    """安全获取浮点数值"""
+def calculate_fundamental_indicators_batch(
+    symbols: List[str],
+    include_finance: bool = True
+) -> pd.DataFrame:
+    """
+    批量计算多只股票的基本面指标
+
+    估值与市值指标来自一次全市场行情请求；财务摘要仍需逐只请求，
+    在线程池中并发执行并复用单只计算的缓存。
+
+    注意：全市场行情只提供动态市盈率，批量结果的 pe_ttm 列（及由其计算的 PEG）
+    实为 市盈率-动态，与 calculate_fundamental_indicators 的 市盈率(TTM) 口径不同，
+    同一只股票的估值分类可能与单只计算结果不一致
+
+    参数:
+        symbols: 股票代码列表
+        include_finance: 是否获取财务摘要（盈利、成长、质量指标及 PEG）
+
+    返回:
+        以股票代码为索引的 DataFrame，列为各指标字段及本批次统一的 timestamp（Unix 时间戳）；
+        无数据的股票对应行为 NaN
+
+    异常:
+        DataSourceError: 全市场行情获取失败
+    """
+    symbols = list(dict.fromkeys(symbols))
+    logger.info("[calculate_fundamental_indicators_batch] 计算 %d 只股票的基本面指标", len(symbols))
+
+    df = _fetch_batch_frame(symbols, include_finance)
+    if include_finance:
+        pe = df["pe_ttm"].to_numpy(dtype=np.float64)
+        growth = df["profit_growth"].to_numpy(dtype=np.float64)
+        # 只在有效行上做除法（NaN 比较为 False），其余保持 NaN
+        peg = np.full(len(df), np.nan)
+        np.divide(pe, growth, out=peg, where=(pe == pe) & (pe != 0) & (growth > 0))
+        df["peg"] = np.round(peg, 2)
+
+    # 整批共用一个时间戳
+    df["timestamp"] = time.time()
+    df.index.name = "symbol"
+    return df
+
+
+def calculate_fundamental_indicators_lazy(
+    symbols: List[str],
+    include_finance: bool = True
+) -> "pl.LazyFrame":
+    """
+    批量计算基本面指标，返回 polars LazyFrame
+
+    数据获取与 calculate_fundamental_indicators_batch 相同（立即执行），
+    PEG 等派生列只登记为惰性表达式；调用方在其后追加 filter/select 再 collect，
+    由 polars 优化器做谓词下推和列裁剪，只计算用到的行和列
+
+    需要安装可选依赖 polars 和 pyarrow（pip install "openclaw-stock-research[perf]"）。
+
+    参数:
+        symbols: 股票代码列表
+        include_finance: 是否获取财务摘要（盈利、成长、质量指标及 PEG）
+
+    返回:
+        未 collect 的 LazyFrame，symbol 列为股票代码，其余列同批量结果
+        （pe_ttm 同样为动态市盈率）
+
+    异常:
+        ImportError: 未安装 polars
+        DataSourceError: 全市场行情获取失败
+    """
+    if pl is None:
+        raise ImportError("惰性计算需要 polars 和 pyarrow，请执行: pip install polars pyarrow")
+
+    symbols = list(dict.fromkeys(symbols))
+    logger.info("[calculate_fundamental_indicators_lazy] 计算 %d 只股票的基本面指标", len(symbols))
+
+    df = _fetch_batch_frame(symbols, include_finance)
+    df.index.name = "symbol"
+    lf = pl.from_pandas(df.reset_index(), nan_to_null=True).lazy()
+
+    if include_finance:
+        pe = pl.col("pe_ttm")
+        growth = pl.col("profit_growth")
+        lf = lf.with_columns(
+            pl.when((pe != 0) & (growth > 0))
+            .then((pe / growth).round(2))
+            .otherwise(None)
+            .alias("peg")
+        )
+    return lf.with_columns(pl.lit(time.time()).alias("timestamp"))
+
+
+def _fetch_batch_frame(symbols: List[str], include_finance: bool) -> pd.DataFrame:
+    """
+    获取批量计算所需的原始指标表（不含派生列）
+
+    参数:
+        symbols: 去重后的股票代码列表
+        include_finance: 是否并发获取各股票的财务摘要
+
+    返回:
+        以股票代码为索引、按 symbols 顺序排列的 float DataFrame
+    """
+    if ak is None:
+        raise DataSourceError("akshare库未安装")
+
+    try:
+        with pooled_requests():
+            df_spot = ak.stock_zh_a_spot_em()
+    except Exception as e:
+        logger.error("[calculate_fundamental_indicators_batch] 获取全市场行情失败: %s", e)
+        raise DataSourceError(f"获取全市场行情失败: {e}")
+
+    df = (
+        df_spot.drop_duplicates("代码")
+        .set_index("代码")
+        .reindex(index=symbols, columns=list(_SPOT_VALUATION_COLUMNS))
+        .rename(columns=_SPOT_VALUATION_COLUMNS)
+        .apply(pd.to_numeric, errors="coerce")
+    )
+
+    if include_finance:
+        futures = {symbol: _FETCH_EXECUTOR.submit(_fetch_finance, symbol) for symbol in symbols}
+        finance = {
+            symbol: {k: v for part in future.result().values() for k, v in part.items()}
+            for symbol, future in futures.items()
+        }
+        df_finance = pd.DataFrame.from_dict(finance, orient="index", columns=list(_FINANCE_FIELDS))
+        df = df.join(df_finance.reindex(symbols).astype(float))
+    return df
+
+
+def _fetch_valuation(symbol: str) -> Dict[str, Dict[str, Optional[float]]]:
+    """
+    获取估值与市值指标
+
+    返回:
+        {'valuation': {...}, 'market': {...}}，获取失败时返回空字典
+    """
+    try:
+        # 已转为字典，逐个字段取值时是 O(1) 查找
+        row = _fetch_valuation_row(symbol)
+        if not row:
+            return {}
+        return _extract(row, _VALUATION_MAP)
+    except Exception as e:
+        logger.warning("[calculate_fundamental_indicators] 获取估值指标失败: %s", e)
+        return {}
+
+
+def _fetch_finance(symbol: str) -> Dict[str, Dict[str, Optional[float]]]:
+    """
+    获取财务摘要中的盈利能力、成长性和财务质量指标
+
+    返回:
+        {'profitability': {...}, 'growth': {...}, 'quality': {...}}，获取失败时返回空字典
+    """
+    try:
+        latest = _fetch_finance_row(symbol)
+        if not latest:
+            return {}
+        return _extract(latest, _FINANCE_MAP)
+    except Exception as e:
+        logger.warning("[calculate_fundamental_indicators] 获取财务摘要失败: %s", e)
+        return {}
+
+
+def _extract(
+    row: Dict[str, Any],
+    field_map: Dict[str, Any]
+) -> Dict[str, Dict[str, Optional[float]]]:
+    """按 {分类: ((列名, 字段), ...)} 映射从一行数据中提取各分类的指标"""
+    return {
+        category: {dst: _safe_float(row, src) for src, dst in pairs}
+        for category, pairs in field_map.items()
+    }
+
+
+def to_json(result: Dict[str, Any]) -> bytes:
+    """
+    将基本面指标结果序列化为 UTF-8 JSON 字节
+
+    安装 orjson 时直接序列化（含 numpy 标量）；否则退回标准库 json，
+    numpy 标量先转为 Python 数值
+
+    参数:
+        result: calculate_fundamental_indicators 的返回值
+
+    返回:
+        JSON 字节串
+    """
+    if orjson is not None:
+        return orjson.dumps(result, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(result, ensure_ascii=False, default=_json_default).encode("utf-8")
+
+
+def _json_default(value: Any) -> Any:
+    """标准库 json 无法处理的值: numpy 标量取 Python 值，其余转为字符串"""
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+def _format_ts(ts: Optional[float]) -> str:
+    """将结果中的 Unix 时间戳格式化为 ISO 时间字符串（仅在展示时调用），缺失时返回 N/A"""
+    if ts is None:
+        return "N/A"
+    return datetime.fromtimestamp(ts).isoformat(timespec="seconds")
+
+
+def _safe_float(row: Dict[str, Any], column: str) -> Optional[float]:
+    """安全获取浮点数值（row 为 Series.to_dict() 得到的字典）"""
+    value = row.get(column)
+    if value is None:
+        return None
     try:
-        if column in row.index:
-            value = row[column]
-            if pd.isna(value):
-                return None
-            return float(value)
+        f = float(value)
     except (ValueError, TypeError):
-        pass
-    return None
+        return None
+    # NaN 是唯一不等于自身的浮点数，float 与 np.float32/64 都适用
+    return None if f != f else f
 
 
 class FundamentalAnalyzer:
@@ -182,13 +553,19 @@ class FundamentalAnalyzer:
     提供基本面分析的统一接口
     """
 
-    def __init__(self):
-        self.logger = get_logger(self.__class__.__name__)
+    # 所有实例共用同一个 logger，不必每次构造都查找
+    logger = get_logger("FundamentalAnalyzer")
 
     def calculate_indicators(self, symbol: str, **kwargs) -> Dict[str, Any]:
         """计算基本面指标"""
         return calculate_fundamental_indicators(symbol, **kwargs)
 
+    @staticmethod
+    def cache_clear():
+        """清除估值指标和财务摘要的缓存（主要用于测试）"""
+        _fetch_valuation_row.clear_cache()
+        _fetch_finance_row.clear_cache()
+
     def analyze_valuation(self, indicators: Dict[str, Any]) -> str:
         """
         分析估值水平
@@ -253,6 +630,62 @@ class FundamentalAnalyzer:
         else:
             return "low"
 
+    def analyze_valuation_batch(self, df: Union[pd.DataFrame, FundamentalIndicatorsArray]) -> pd.Series:
+        """
+        批量分析估值水平，判断规则与 analyze_valuation 一致
+
+        参数:
+            df: 含 pe_ttm、pb 列的指标表（如 calculate_fundamental_indicators_batch 的结果）
+                或 FundamentalIndicatorsArray
+
+        返回:
+            与 df 同索引的 "undervalued"/"fair"/"overvalued"/"unknown" 序列
+        """
+        pe = np.asarray(df["pe_ttm"], dtype=np.float64)
+        pb = np.asarray(df["pb"], dtype=np.float64)
+        codes = valuation_codes(pe, pb)
+        return pd.Series(_VALUATION_LABELS[codes], index=df.index, name="valuation")
+
+    def analyze_profitability_batch(self, df: Union[pd.DataFrame, FundamentalIndicatorsArray]) -> pd.Series:
+        """
+        批量分析盈利能力，判断规则与 analyze_profitability 一致
+
+        参数:
+            df: 含 roe、net_margin 列的指标表或 FundamentalIndicatorsArray
+
+        返回:
+            与 df 同索引的 "strong"/"moderate"/"weak"/"unknown" 序列
+        """
+        roe = np.asarray(df["roe"], dtype=np.float64)
+        net_margin = np.asarray(df["net_margin"], dtype=np.float64)
+        labels = np.select(
+            [(roe > 15) & (net_margin > 10), roe > 8],
+            ["strong", "moderate"],
+            default="weak"
+        )
+        labels = np.where(np.isnan(roe), "unknown", labels)
+        return pd.Series(labels, index=df.index, name="profitability")
+
+    def analyze_growth_batch(self, df: Union[pd.DataFrame, FundamentalIndicatorsArray]) -> pd.Series:
+        """
+        批量分析成长性，判断规则与 analyze_growth 一致
+
+        参数:
+            df: 含 profit_growth、revenue_growth 列的指标表或 FundamentalIndicatorsArray
+
+        返回:
+            与 df 同索引的 "high"/"moderate"/"low"/"unknown" 序列
+        """
+        profit_growth = np.asarray(df["profit_growth"], dtype=np.float64)
+        revenue_growth = np.asarray(df["revenue_growth"], dtype=np.float64)
+        labels = np.select(
+            [(profit_growth > 30) & (revenue_growth > 20), profit_growth > 10],
+            ["high", "moderate"],
+            default="low"
+        )
+        labels = np.where(np.isnan(profit_growth), "unknown", labels)
+        return pd.Series(labels, index=df.index, name="growth")
+
     def generate_report(self, symbol: str, indicators: Dict[str, Any]) -> str:
         """
         生成基本面分析报告
@@ -264,29 +697,23 @@ class FundamentalAnalyzer:
         返回:
             分析报告文本
         """
-        lines = [
-            f"=== {symbol} 基本面分析报告 ===",
-            "",
-            "【估值分析】",
-            f"  PE(TTM): {indicators.get('valuation', {}).get('pe_ttm', 'N/A')}",
-            f"  PB: {indicators.get('valuation', {}).get('pb', 'N/A')}",
-            f"  估值水平: {self.analyze_valuation(indicators)}",
-            "",
-            "【盈利能力】",
-            f"  ROE: {indicators.get('profitability', {}).get('roe', 'N/A')}%",
-            f"  净利率: {indicators.get('profitability', {}).get('net_margin', 'N/A')}%",
-            f"  盈利水平: {self.analyze_profitability(indicators)}",
-            "",
-            "【成长性】",
-            f"  营收增长率: {indicators.get('growth', {}).get('revenue_growth', 'N/A')}%",
-            f"  利润增长率: {indicators.get('growth', {}).get('profit_growth', 'N/A')}%",
-            f"  成长水平: {self.analyze_growth(indicators)}",
-            "",
-            "【财务质量】",
-            f"  资产负债率: {indicators.get('quality', {}).get('debt_ratio', 'N/A')}%",
-            f"  流动比率: {indicators.get('quality', {}).get('current_ratio', 'N/A')}",
-            "",
-            "=== 报告结束 ==="
-        ]
-
-        return "\n".join(lines)
+        valuation = indicators.get("valuation") or {}
+        profitability = indicators.get("profitability") or {}
+        growth = indicators.get("growth") or {}
+        quality = indicators.get("quality") or {}
+
+        return _REPORT_TEMPLATE.format(
+            symbol=symbol,
+            data_time=_format_ts(indicators.get("timestamp")),
+            pe_ttm=valuation.get("pe_ttm", "N/A"),
+            pb=valuation.get("pb", "N/A"),
+            valuation_level=self.analyze_valuation(indicators),
+            roe=profitability.get("roe", "N/A"),
+            net_margin=profitability.get("net_margin", "N/A"),
+            profitability_level=self.analyze_profitability(indicators),
+            revenue_growth=growth.get("revenue_growth", "N/A"),
+            profit_growth=growth.get("profit_growth", "N/A"),
+            growth_level=self.analyze_growth(indicators),
+            debt_ratio=quality.get("debt_ratio", "N/A"),
+            current_ratio=quality.get("current_ratio", "N/A"),
+        )
@@ -5,12 +5,15 @@
 """
 
 from typing import Literal, Optional, Dict, Any, List
+from concurrent.futures import Executor, ThreadPoolExecutor, as_completed
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
+import io
 import pandas as pd
 import numpy as np
 
 from ..core.exceptions import DataSourceError, CalculationError
+from ..utils.cache import file_memoize
 from ..utils.logger import get_logger
 from ..data.market_data import fetch_market_data, fetch_realtime_quote
 from ..data.financial_data import fetch_financial_data
@@ -34,6 +37,66 @@ except ImportError:
 logger = get_logger(__name__)
 
 
+def _market_data_ttl(params: Dict[str, Any]) -> float:
+    """K线缓存有效期：区间截止到今天（含未指定）时当日K线仍在变化，按实时行情的有效期缓存"""
+    end_date = params.get("end_date")
+    if not end_date or end_date >= datetime.now().strftime("%Y%m%d"):
+        return 60
+    return 86400
+
+
+# 重复分析同一只股票时复用本地文件缓存（设置 FILE_CACHE_PATH 后生效）：
+# 实时行情和新闻有效期短，历史K线与基本面按天更新
+fetch_realtime_quote = file_memoize("realtime_quote", ttl=60)(fetch_realtime_quote)
+fetch_market_data = file_memoize("market_data", ttl=_market_data_ttl)(fetch_market_data)
+calculate_fundamental_indicators = file_memoize("fundamental", ttl=86400)(calculate_fundamental_indicators)
+fetch_capital_flow = file_memoize("capital_flow", ttl=3600)(fetch_capital_flow)
+fetch_stock_news = file_memoize("stock_news", ttl=900)(fetch_stock_news)
+
+# 行情、K线、基本面、资金流向、新闻各阶段互不依赖（新闻只需行情中的股票名称），
+# 在线程池中并发请求，总耗时取最慢的一路而不是各阶段之和
+_STAGE_EXECUTOR = ThreadPoolExecutor(max_workers=6, thread_name_prefix="analyze")
+
+# 分析器无实例状态（只持有 logger），全模块共用一个实例，可在线程间共享
+_TECHNICAL_ANALYZER = TechnicalAnalyzer()
+_FUNDAMENTAL_ANALYZER = FundamentalAnalyzer()
+
+# 单个数据阶段等待结果的最长时间（秒），超时按该阶段失败处理
+_STAGE_TIMEOUT = 60.0
+
+# 风险等级编码，各分项以整数记录，输出时再转换为标签
+_RISK_LOW, _RISK_MEDIUM, _RISK_HIGH = 0, 1, 2
+_RISK_LABELS = ("low", "medium", "high")
+
+# 后市预测: 趋势中文名，以及 (趋势, 概率档位) -> 操作建议，
+# 概率档位 0 为 >0.7，1 为 >0.5，2 为其余；未列出的趋势建议观望
+_TREND_CN = {"up": "上涨", "down": "下跌", "sideways": "震荡"}
+_RECOMMENDATIONS = {
+    ("up", 0): "建议买入",
+    ("up", 1): "建议关注，等待更好的入场时机",
+    ("up", 2): "建议观望",
+    ("down", 0): "建议卖出或观望",
+    ("down", 1): "建议减仓或观望",
+    ("down", 2): "建议观望",
+}
+
+# 分析报告的标题分隔线与章节分隔线
+_REPORT_RULE = "=" * 60
+_SECTION_RULE = "-" * 60
+
+# 后市预测评分: 各特征命中时对上涨概率的调整（百分点，整数运算避免浮点累加误差）
+# 及对应的关键因素，基准为 50
+_PREDICTION_FACTORS = (
+    "技术趋势向上", "技术趋势向下", "技术指标买入信号", "技术指标卖出信号",
+    "盈利能力强", "成长性高", "估值偏低", "估值偏高", "主力资金净流入", "主力资金净流出",
+)
+_PREDICTION_WEIGHTS = np.array([20, -20, 15, -15, 10, 10, 10, -10, 10, -10], dtype=np.int64)
+
+# 技术分析结果中输出的最新指标列
+_TECH_INDICATOR_KEYS = ("ma5", "ma10", "ma20", "ma60", "rsi6", "macd_hist")
+_LAST_ROW_COLUMNS = ("close",) + _TECH_INDICATOR_KEYS
+
+
 @dataclass
 class PredictionResult:
     """后市预测结果"""
@@ -61,7 +124,8 @@ class RiskAssessment:
 def analyze_stock(
     symbol: str,
     market: Literal["sh", "sz", "hk"] = "sh",
-    lookback_days: int = 250
+    lookback_days: int = 250,
+    executor: Optional[Executor] = None
 ) -> Dict[str, Any]:
     """
     个股全方位分析（接口8实现）
@@ -70,6 +134,8 @@ def analyze_stock(
         symbol: 股票代码
         market: 市场类型
         lookback_days: 回看天数
+        executor: 执行数据请求的线程池，默认使用模块内共享线程池；
+            批量分析时传入同一个线程池，所有股票的请求共用一组线程
 
     返回:
         {
@@ -90,11 +156,14 @@ def analyze_stock(
 
     logger.info(f"[analyze_stock] 开始分析 {market}:{symbol}")
 
+    # 分析时间与K线区间共用同一时刻
+    now = datetime.now()
+
     try:
         result = {
             "symbol": symbol,
             "market": market,
-            "analysis_time": datetime.now().isoformat(),
+            "analysis_time": now.isoformat(),
             "basic_info": {},
             "technical_analysis": {},
             "fundamental_analysis": {},
@@ -104,10 +173,24 @@ def analyze_stock(
             "prediction": {}
         }
 
+        # 先并发提交各阶段的数据请求，再按顺序取结果；各阶段的失败仍互不影响
+        pool = executor or _STAGE_EXECUTOR
+        quote_future = pool.submit(fetch_realtime_quote, symbol=symbol, market=market)
+        kline_future = pool.submit(
+            fetch_market_data,
+            symbol=symbol,
+            period="daily",
+            start_date=(now - timedelta(days=lookback_days)).strftime("%Y%m%d"),
+            end_date=now.strftime("%Y%m%d"),
+            market=market
+        )
+        fundamental_future = pool.submit(calculate_fundamental_indicators, symbol)
+        flow_future = pool.submit(fetch_capital_flow, symbol=symbol, market=market, days=5)
+
         # 1. 获取基本信息
         try:
             # 获取实时行情
-            realtime_data = fetch_realtime_quote(symbol=symbol, market=market)
+            realtime_data = quote_future.result(timeout=_STAGE_TIMEOUT)
             result["basic_info"] = {
                 "symbol": symbol,
                 "name": realtime_data.get("name", ""),
@@ -124,32 +207,47 @@ def analyze_stock(
         except Exception as e:
             logger.warning(f"[{symbol}] 获取基本信息失败: {e}")
 
-        # 2. 技术分析
+        # 新闻按股票名称检索，行情返回后立即提交，与后续阶段并行
+        stock_name = result["basic_info"].get("name", "")
+        news_future = pool.submit(fetch_stock_news, symbol=symbol, stock_name=stock_name, limit=10)
+
+        # 2. 技术分析（同时由K线估算回看期内的最大回撤，供风险评估使用）
+        max_drawdown = None
         try:
             # 获取历史K线数据
-            df_kline = fetch_market_data(
-                symbol=symbol,
-                period="daily",
-                start_date=(datetime.now() - timedelta(days=lookback_days)).strftime("%Y%m%d"),
-                end_date=datetime.now().strftime("%Y%m%d"),
-                market=market
-            )
+            df_kline = kline_future.result(timeout=_STAGE_TIMEOUT)
 
             if not df_kline.empty:
+                # 最大回撤: 收盘价相对此前最高收盘价的最大跌幅（负数），
+                # 跳过停牌等造成的 NaN 和非正价格，没有有效收盘价时为 None
+                close = df_kline["close"].to_numpy(dtype=np.float64)
+                close = close[np.isfinite(close) & (close > 0)]
+                if close.size:
+                    max_drawdown = round(float((close / np.maximum.accumulate(close) - 1.0).min()), 4)
+
                 # 计算技术指标
                 df_tech = calculate_technical_indicators(df_kline)
 
                 # 检测交易信号
-                analyzer = TechnicalAnalyzer()
-                signals = analyzer.detect_signals(df_tech)
+                signals = _TECHNICAL_ANALYZER.detect_signals(df_tech)
 
                 # 计算支撑压力位
                 sr_data = calculate_support_resistance(symbol, df_tech)
 
+                # 整张指标表只用于信号和支撑压力位，之后只需最新一行：
+                # 按列取底层 numpy 数组的末元素（不经过 pandas 索引器，也不构造混合类型的行），取出后即释放
+                columns = df_tech.columns
+                last = {
+                    key: df_tech[key].to_numpy(copy=False)[-1]
+                    for key in _LAST_ROW_COLUMNS if key in columns
+                }
+                del df_tech
+                indicators = {key: _optional_float(last.get(key)) for key in _TECH_INDICATOR_KEYS}
+
                 # 趋势判断
-                current_price = df_tech["close"].iloc[-1]
-                ma20 = df_tech["ma20"].iloc[-1] if "ma20" in df_tech.columns else current_price
-                ma60 = df_tech["ma60"].iloc[-1] if "ma60" in df_tech.columns else current_price
+                current_price = float(last["close"])
+                ma20 = last.get("ma20", current_price)
+                ma60 = last.get("ma60", current_price)
 
                 if current_price > ma20 > ma60:
                     trend = "上升趋势"
@@ -163,14 +261,7 @@ def analyze_stock(
                     "trend": trend,
                     "signals": signals,
                     "support_resistance": sr_data,
-                    "indicators": {
-                        "ma5": df_tech["ma5"].iloc[-1] if "ma5" in df_tech.columns else None,
-                        "ma10": df_tech["ma10"].iloc[-1] if "ma10" in df_tech.columns else None,
-                        "ma20": df_tech["ma20"].iloc[-1] if "ma20" in df_tech.columns else None,
-                        "ma60": df_tech["ma60"].iloc[-1] if "ma60" in df_tech.columns else None,
-                        "rsi6": df_tech["rsi6"].iloc[-1] if "rsi6" in df_tech.columns else None,
-                        "macd_hist": df_tech["macd_hist"].iloc[-1] if "macd_hist" in df_tech.columns else None,
-                    }
+                    "indicators": indicators
                 }
         except Exception as e:
             logger.warning(f"[{symbol}] 技术分析失败: {e}")
@@ -178,13 +269,12 @@ def analyze_stock(
         # 3. 基本面分析
         try:
             # 获取基本面数据
-            fundamental_data = calculate_fundamental_indicators(symbol)
+            fundamental_data = fundamental_future.result(timeout=_STAGE_TIMEOUT)
 
             # 使用FundamentalAnalyzer进行分析
-            analyzer = FundamentalAnalyzer()
-            valuation_level = analyzer.analyze_valuation(fundamental_data)
-            profitability_level = analyzer.analyze_profitability(fundamental_data)
-            growth_level = analyzer.analyze_growth(fundamental_data)
+            valuation_level = _FUNDAMENTAL_ANALYZER.analyze_valuation(fundamental_data)
+            profitability_level = _FUNDAMENTAL_ANALYZER.analyze_profitability(fundamental_data)
+            growth_level = _FUNDAMENTAL_ANALYZER.analyze_growth(fundamental_data)
 
             # 估值评价
             if valuation_level == "undervalued":
@@ -211,7 +301,7 @@ def analyze_stock(
         # 4. 资金流向分析
         try:
             # 获取资金流向数据
-            capital_flow = fetch_capital_flow(symbol=symbol, market=market, days=5)
+            capital_flow = flow_future.result(timeout=_STAGE_TIMEOUT)
 
             result["fund_flow_analysis"] = {
                 "recent_flow": capital_flow,
@@ -223,11 +313,8 @@ def analyze_stock(
 
         # 5. 新闻分析
         try:
-            # 获取股票名称
-            stock_name = result.get("basic_info", {}).get("name", "")
-            
             # 获取新闻数据
-            news_data = fetch_stock_news(symbol=symbol, stock_name=stock_name, limit=10)
+            news_data = news_future.result(timeout=_STAGE_TIMEOUT)
             
             result["news_analysis"] = {
                 "news_count": news_data.get("news_count", 0),
@@ -249,137 +336,126 @@ def analyze_stock(
         # 6. 风险评估
         try:
             risk_factors = []
+            tech = result.get("technical_analysis") or {}
+            fund = result.get("fundamental_analysis") or {}
 
             # 根据波动率评估
-            volatility = "medium"
-            if "technical_analysis" in result and result["technical_analysis"]:
-                indicators = result["technical_analysis"].get("indicators", {})
+            volatility = _RISK_MEDIUM
+            if tech:
+                indicators = tech.get("indicators", {})
                 rsi = indicators.get("rsi6")
                 if rsi and (rsi > 80 or rsi < 20):
-                    volatility = "high"
+                    volatility = _RISK_HIGH
                     risk_factors.append("RSI超买/超卖")
 
             # 根据估值评估
-            valuation_risk = "medium"
-            if "fundamental_analysis" in result and result["fundamental_analysis"]:
-                valuation = result["fundamental_analysis"].get("valuation", {})
+            valuation_risk = _RISK_MEDIUM
+            if fund:
+                valuation = fund.get("valuation", {})
                 pe = valuation.get("pe_ttm")
                 if pe and pe > 50:
-                    valuation_risk = "high"
+                    valuation_risk = _RISK_HIGH
                     risk_factors.append("估值偏高")
                 elif pe and pe < 10:
-                    valuation_risk = "low"
+                    valuation_risk = _RISK_LOW
 
             # 根据趋势评估
-            trend_risk = "medium"
-            if "technical_analysis" in result and result["technical_analysis"]:
-                trend = result["technical_analysis"].get("trend", "")
+            trend_risk = _RISK_MEDIUM
+            if tech:
+                trend = tech.get("trend", "")
                 if "下降" in trend:
-                    trend_risk = "high"
+                    trend_risk = _RISK_HIGH
                     risk_factors.append("下降趋势")
                 elif "上升" in trend:
-                    trend_risk = "low"
+                    trend_risk = _RISK_LOW
 
-            # 综合风险等级
-            risk_levels = [volatility, valuation_risk, trend_risk]
-            high_count = risk_levels.count("high")
-            low_count = risk_levels.count("low")
+            # 综合风险等级：至少两项为高则高，至少两项为低则低，否则中等
+            high_count = (volatility == _RISK_HIGH) + (valuation_risk == _RISK_HIGH) + (trend_risk == _RISK_HIGH)
+            low_count = (volatility == _RISK_LOW) + (valuation_risk == _RISK_LOW) + (trend_risk == _RISK_LOW)
 
             if high_count >= 2:
-                overall_risk = "high"
+                overall_risk = _RISK_HIGH
             elif low_count >= 2:
-                overall_risk = "low"
+                overall_risk = _RISK_LOW
             else:
-                overall_risk = "medium"
+                overall_risk = _RISK_MEDIUM
 
             result["risk_assessment"] = {
-                "overall_risk": overall_risk,
-                "volatility_risk": volatility,
-                "valuation_risk": valuation_risk,
-                "trend_risk": trend_risk,
+                "overall_risk": _RISK_LABELS[overall_risk],
+                "volatility_risk": _RISK_LABELS[volatility],
+                "valuation_risk": _RISK_LABELS[valuation_risk],
+                "trend_risk": _RISK_LABELS[trend_risk],
                 "risk_factors": risk_factors,
-                "max_drawdown_estimate": None  # 需要历史数据计算
+                "max_drawdown_estimate": max_drawdown
             }
         except Exception as e:
             logger.warning(f"[{symbol}] 风险评估失败: {e}")
 
         # 6. 后市预测
         try:
-            # 基于技术和基本面综合判断
-            trend_probability = 0.5
-            predicted_trend = "sideways"
+            # 基于技术和基本面综合判断：命中的特征记为 1，与权重做一次点积得到评分
             target_high = None
             target_low = None
-            key_factors = []
+            flags = np.zeros(len(_PREDICTION_FACTORS), dtype=np.int64)
+            tech = result.get("technical_analysis") or {}
+            fund = result.get("fundamental_analysis") or {}
+            flow = result.get("fund_flow_analysis") or {}
 
             # 技术面判断
-            if "technical_analysis" in result and result["technical_analysis"]:
-                tech = result["technical_analysis"]
+            if tech:
                 trend = tech.get("trend", "")
                 signals = tech.get("signals", {})
 
                 if "上升" in trend:
-                    trend_probability += 0.2
-                    key_factors.append("技术趋势向上")
+                    flags[0] = 1
                 elif "下降" in trend:
-                    trend_probability -= 0.2
-                    key_factors.append("技术趋势向下")
+                    flags[1] = 1
 
                 overall_signal = signals.get("overall", "neutral") if isinstance(signals, dict) else "neutral"
                 if overall_signal in ["buy", "strong_buy"]:
-                    trend_probability += 0.15
-                    key_factors.append("技术指标买入信号")
+                    flags[2] = 1
                 elif overall_signal in ["sell", "strong_sell"]:
-                    trend_probability -= 0.15
-                    key_factors.append("技术指标卖出信号")
+                    flags[3] = 1
 
             # 基本面判断
-            if "fundamental_analysis" in result and result["fundamental_analysis"]:
-                fund = result["fundamental_analysis"]
+            if fund:
                 analysis = fund.get("analysis", {})
 
-                profitability = analysis.get("profitability_level", "moderate")
-                if profitability == "strong":
-                    trend_probability += 0.1
-                    key_factors.append("盈利能力强")
-
-                growth = analysis.get("growth_level", "moderate")
-                if growth == "high":
-                    trend_probability += 0.1
-                    key_factors.append("成长性高")
+                if analysis.get("profitability_level", "moderate") == "strong":
+                    flags[4] = 1
+                if analysis.get("growth_level", "moderate") == "high":
+                    flags[5] = 1
 
                 valuation = analysis.get("valuation_level", "合理估值")
                 if "低估值" in valuation:
-                    trend_probability += 0.1
-                    key_factors.append("估值偏低")
+                    flags[6] = 1
                 elif "高估值" in valuation:
-                    trend_probability -= 0.1
-                    key_factors.append("估值偏高")
+                    flags[7] = 1
 
             # 资金流向判断
-            if "fund_flow_analysis" in result and result["fund_flow_analysis"]:
-                flow = result["fund_flow_analysis"]
+            if flow:
                 main_inflow = flow.get("main_inflow_5d", 0)
 
                 if main_inflow > 0:
-                    trend_probability += 0.1
-                    key_factors.append("主力资金净流入")
+                    flags[8] = 1
                 elif main_inflow < 0:
-                    trend_probability -= 0.1
-                    key_factors.append("主力资金净流出")
+                    flags[9] = 1
+
+            score = 50 + int(_PREDICTION_WEIGHTS @ flags)
+            trend_probability = score / 100
+            key_factors = [_PREDICTION_FACTORS[i] for i in np.flatnonzero(flags)]
 
             # 确定趋势方向
-            if trend_probability > 0.6:
+            if score > 60:
                 predicted_trend = "up"
-            elif trend_probability < 0.4:
+            elif score < 40:
                 predicted_trend = "down"
             else:
                 predicted_trend = "sideways"
 
             # 计算目标价格区间
-            current_price = 0
-            if "basic_info" in result and result["basic_info"]:
-                current_price = result["basic_info"].get("current_price", 0)
+            # 缓存命中时行情中的 NaN 为 None，按 0 处理
+            current_price = (result.get("basic_info") or {}).get("current_price") or 0
 
             if current_price > 0:
                 if predicted_trend == "up":
@@ -394,20 +470,18 @@ def analyze_stock(
 
             # 确定风险等级
             risk_level = "中等"
-            if "risk_assessment" in result and result["risk_assessment"]:
+            risk = result.get("risk_assessment") or {}
+            if risk:
                 risk_level_map = {
                     "low": "低",
                     "medium": "中等",
                     "high": "高"
                 }
-                risk_level = risk_level_map.get(
-                    result["risk_assessment"].get("overall_risk", "medium"),
-                    "中等"
-                )
+                risk_level = risk_level_map.get(risk.get("overall_risk", "medium"), "中等")
 
             result["prediction"] = {
                 "trend": predicted_trend,
-                "trend_cn": "上涨" if predicted_trend == "up" else ("下跌" if predicted_trend == "down" else "震荡"),
+                "trend_cn": _TREND_CN[predicted_trend],
                 "probability": round(trend_probability, 2),
                 "target_price_high": target_high,
                 "target_price_low": target_low,
@@ -433,26 +507,65 @@ def analyze_stock(
         raise CalculationError(f"分析{symbol}失败: {e}")
 
 
+def analyze_stocks(
+    symbols: List[str],
+    market: Literal["sh", "sz", "hk"] = "sh",
+    lookback_days: int = 250,
+    max_workers: int = 16
+) -> Dict[str, Dict[str, Any]]:
+    """
+    批量个股全方位分析
+
+    各股票的分析并行执行，所有数据请求提交到同一个线程池，
+    同时进行的网络请求数不超过 max_workers
+
+    参数:
+        symbols: 股票代码列表
+        market: 市场类型
+        lookback_days: 回看天数
+        max_workers: 最大并发请求数（同时分析的股票数也不超过该值）
+
+    返回:
+        {股票代码: analyze_stock 的结果}，按 symbols 顺序排列；
+        分析失败的股票为 {'symbol': 代码, 'error': 错误信息}
+    """
+    symbols = list(dict.fromkeys(symbols))
+    logger.info(f"[analyze_stocks] 批量分析 {len(symbols)} 只股票")
+
+    results: Dict[str, Dict[str, Any]] = dict.fromkeys(symbols)
+    # 数据请求与各股票的分析流程使用两个线程池：分析流程会等待请求结果，
+    # 若共用一个线程池，线程全被等待中的分析流程占满时请求将无法执行
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="analyze-fetch") as fetch_pool, \
+            ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="analyze-stock") as stock_pool:
+        futures = {
+            stock_pool.submit(analyze_stock, symbol, market, lookback_days, fetch_pool): symbol
+            for symbol in symbols
+        }
+        for future in as_completed(futures):
+            symbol = futures[future]
+            try:
+                results[symbol] = future.result()
+            except Exception as e:
+                logger.warning(f"[analyze_stocks] {symbol} 分析失败: {e}")
+                results[symbol] = {"symbol": symbol, "error": str(e)}
+
+    return results
+
+
+def _optional_float(value: Any) -> Optional[float]:
+    """转换为 float，缺失或 NaN 时返回 None"""
+    if value is None:
+        return None
+    value = float(value)
+    return None if value != value else value
+
+
 def _get_prediction_recommendation(trend: str, probability: float, risk_level: str) -> str:
     """获取预测建议"""
-    if trend == "up":
-        if probability > 0.7:
-            if risk_level == "高":
-                return "建议谨慎买入，注意风险控制"
-            return "建议买入"
-        elif probability > 0.5:
-            return "建议关注，等待更好的入场时机"
-        else:
-            return "建议观望"
-    elif trend == "down":
-        if probability > 0.7:
-            return "建议卖出或观望"
-        elif probability > 0.5:
-            return "建议减仓或观望"
-        else:
-            return "建议观望"
-    else:
-        return "建议观望，等待趋势明朗"
+    if trend == "up" and probability > 0.7 and risk_level == "高":
+        return "建议谨慎买入，注意风险控制"
+    bucket = 0 if probability > 0.7 else (1 if probability > 0.5 else 2)
+    return _RECOMMENDATIONS.get((trend, bucket), "建议观望，等待趋势明朗")
 
 
 class StockAnalyzer:
@@ -464,7 +577,7 @@ class StockAnalyzer:
 
     def __init__(self):
         self.logger = get_logger(self.__class__.__name__)
-        self.fundamental_analyzer = FundamentalAnalyzer()
+        self.fundamental_analyzer = _FUNDAMENTAL_ANALYZER
 
     def analyze(self, symbol: str, **kwargs) -> Dict[str, Any]:
         """执行分析"""
@@ -489,50 +602,41 @@ class StockAnalyzer:
         risk = analysis_result.get("risk_assessment", {})
         prediction = analysis_result.get("prediction", {})
 
-        lines = [
-            f"=" * 60,
-            f"                {symbol} ({basic_info.get('name', '')}) 综合分析报告",
-            f"=" * 60,
-            "",
-            f"【当前价格】{basic_info.get('current_price', 'N/A')} 元",
-            f"【涨跌幅度】{basic_info.get('change', 'N/A')} ({basic_info.get('change_pct', 'N/A')}%)",
-            f"【成交量】{basic_info.get('volume', 'N/A'):,}",
-            "",
-            "-" * 60,
-            "【一、技术面分析】",
-            "-" * 60,
-        ]
+        buf = io.StringIO()
+        write = buf.write
+
+        write(
+            f"{_REPORT_RULE}\n"
+            f"                {symbol} ({basic_info.get('name', '')}) 综合分析报告\n"
+            f"{_REPORT_RULE}\n"
+            "\n"
+            f"【当前价格】{basic_info.get('current_price', 'N/A')} 元\n"
+            f"【涨跌幅度】{basic_info.get('change', 'N/A')} ({basic_info.get('change_pct', 'N/A')}%)\n"
+            f"【成交量】{basic_info.get('volume', 'N/A'):,}\n"
+            "\n"
+            f"{_SECTION_RULE}\n【一、技术面分析】\n{_SECTION_RULE}\n"
+        )
 
         if technical:
-            lines.extend([
-                f"趋势判断：{technical.get('trend', 'N/A')}",
-                f"",
-                f"主要技术指标：",
-            ])
+            write(f"趋势判断：{technical.get('trend', 'N/A')}\n\n主要技术指标：\n")
 
             indicators = technical.get("indicators", {})
             if indicators:
                 if indicators.get("ma5"):
-                    lines.append(f"  MA5: {indicators['ma5']:.2f}")
+                    write(f"  MA5: {indicators['ma5']:.2f}\n")
                 if indicators.get("ma20"):
-                    lines.append(f"  MA20: {indicators['ma20']:.2f}")
+                    write(f"  MA20: {indicators['ma20']:.2f}\n")
                 if indicators.get("rsi6"):
-                    lines.append(f"  RSI6: {indicators['rsi6']:.2f}")
+                    write(f"  RSI6: {indicators['rsi6']:.2f}\n")
 
             signals = technical.get("signals", {})
             if signals and isinstance(signals, dict):
-                lines.append(f"")
-                lines.append(f"交易信号：")
+                write("\n交易信号：\n")
                 for signal_name, signal_value in signals.items():
                     if signal_value and signal_value != "none":
-                        lines.append(f"  {signal_name}: {signal_value}")
+                        write(f"  {signal_name}: {signal_value}\n")
 
-        lines.extend([
-            "",
-            "-" * 60,
-            "【二、基本面分析】",
-            "-" * 60,
-        ])
+        write(f"\n{_SECTION_RULE}\n【二、基本面分析】\n{_SECTION_RULE}\n")
 
         if fundamental:
             valuation = fundamental.get("valuation", {})
@@ -541,140 +645,109 @@ class StockAnalyzer:
             quality = fundamental.get("quality", {})
             analysis = fundamental.get("analysis", {})
 
-            lines.extend([
-                f"估值水平：{analysis.get('valuation_level', 'N/A')}",
-                f"  PE(TTM): {valuation.get('pe_ttm', 'N/A')}",
-                f"  PB: {valuation.get('pb', 'N/A')}",
-                f"  ROE: {valuation.get('roe', 'N/A')}%",
-                f"",
-                f"盈利能力：{analysis.get('profitability_level', 'N/A')}",
-                f"  净利率: {profitability.get('net_margin', 'N/A')}%",
-                f"",
-                f"成长性：{analysis.get('growth_level', 'N/A')}",
-                f"  营收增长率: {growth.get('revenue_growth', 'N/A')}%",
-                f"  利润增长率: {growth.get('profit_growth', 'N/A')}%",
-                f"",
-                f"财务质量：",
-                f"  资产负债率: {quality.get('debt_ratio', 'N/A')}%",
-            ])
-
-        lines.extend([
-            "",
-            "-" * 60,
-            "【三、资金流向分析】",
-            "-" * 60,
-        ])
+            write(
+                f"估值水平：{analysis.get('valuation_level', 'N/A')}\n"
+                f"  PE(TTM): {valuation.get('pe_ttm', 'N/A')}\n"
+                f"  PB: {valuation.get('pb', 'N/A')}\n"
+                f"  ROE: {valuation.get('roe', 'N/A')}%\n"
+                "\n"
+                f"盈利能力：{analysis.get('profitability_level', 'N/A')}\n"
+                f"  净利率: {profitability.get('net_margin', 'N/A')}%\n"
+                "\n"
+                f"成长性：{analysis.get('growth_level', 'N/A')}\n"
+                f"  营收增长率: {growth.get('revenue_growth', 'N/A')}%\n"
+                f"  利润增长率: {growth.get('profit_growth', 'N/A')}%\n"
+                "\n"
+                "财务质量：\n"
+                f"  资产负债率: {quality.get('debt_ratio', 'N/A')}%\n"
+            )
+
+        write(f"\n{_SECTION_RULE}\n【三、资金流向分析】\n{_SECTION_RULE}\n")
 
         if fund_flow:
             main_inflow = fund_flow.get("main_inflow_5d", 0)
             retail_inflow = fund_flow.get("retail_inflow_5d", 0)
 
-            lines.extend([
-                f"近5日主力资金净流入：{main_inflow:.2f} 万元",
-                f"近5日散户资金净流入：{retail_inflow:.2f} 万元",
-            ])
+            write(
+                f"近5日主力资金净流入：{main_inflow:.2f} 万元\n"
+                f"近5日散户资金净流入：{retail_inflow:.2f} 万元\n"
+            )
 
             if main_inflow > 0:
-                lines.append("资金面相符：主力资金持续流入")
+                write("资金面相符：主力资金持续流入\n")
             elif main_inflow < 0:
-                lines.append("资金面警示：主力资金持续流出")
+                write("资金面警示：主力资金持续流出\n")
 
-        lines.extend([
-            "",
-            "-" * 60,
-            "【四、新闻面分析】",
-            "-" * 60,
-        ])
+        write(f"\n{_SECTION_RULE}\n【四、新闻面分析】\n{_SECTION_RULE}\n")
 
         if news and news.get("news_count", 0) > 0:
-            lines.append(f"近期相关新闻：{news.get('news_count', 0)} 条")
-            lines.append("")
-            
+            write(f"近期相关新闻：{news.get('news_count', 0)} 条\n\n")
+
             news_list = news.get("news_list", [])
             for i, item in enumerate(news_list[:5], 1):  # 只显示前5条
                 time_str = f"[{item.get('time', '')}] " if item.get('time') else ""
-                lines.append(f"{i}. {time_str}{item.get('title', '')}")
+                write(f"{i}. {time_str}{item.get('title', '')}\n")
                 if item.get('summary'):
-                    lines.append(f"   {item.get('summary', '')[:80]}...")
-                lines.append("")
-            
+                    write(f"   {item.get('summary', '')[:80]}...\n")
+                write("\n")
+
             if len(news_list) > 5:
-                lines.append(f"... 还有 {len(news_list) - 5} 条新闻")
+                write(f"... 还有 {len(news_list) - 5} 条新闻\n")
         else:
-            lines.append("暂无相关新闻或新闻获取失败")
+            write("暂无相关新闻或新闻获取失败\n")
 
-        lines.extend([
-            "",
-            "-" * 60,
-            "【五、风险评估】",
-            "-" * 60,
-        ])
+        write(f"\n{_SECTION_RULE}\n【五、风险评估】\n{_SECTION_RULE}\n")
 
         if risk:
             overall = risk.get("overall_risk", "medium")
             risk_cn = {"low": "低", "medium": "中等", "high": "高"}.get(overall, "中等")
 
-            lines.extend([
-                f"综合风险等级：{risk_cn}",
-                f"",
-                f"各项风险：",
-                f"  波动风险：{risk.get('volatility_risk', 'medium')}",
-                f"  流动性风险：{risk.get('liquidity_risk', 'medium')}",
-                f"  基本面风险：{risk.get('fundamental_risk', 'medium')}",
-            ])
+            write(
+                f"综合风险等级：{risk_cn}\n"
+                "\n"
+                "各项风险：\n"
+                f"  波动风险：{risk.get('volatility_risk', 'medium')}\n"
+                f"  流动性风险：{risk.get('liquidity_risk', 'medium')}\n"
+                f"  基本面风险：{risk.get('fundamental_risk', 'medium')}\n"
+            )
 
             risk_factors = risk.get("risk_factors", [])
             if risk_factors:
-                lines.extend([
-                    f"",
-                    f"风险因素：",
-                ])
+                write("\n风险因素：\n")
                 for factor in risk_factors:
-                    lines.append(f"  - {factor}")
+                    write(f"  - {factor}\n")
 
-        lines.extend([
-            "",
-            "-" * 60,
-            "【六、后市预测】",
-            "-" * 60,
-        ])
+        write(f"\n{_SECTION_RULE}\n【六、后市预测】\n{_SECTION_RULE}\n")
 
         if prediction:
-            trend = prediction.get("trend", "sideways")
             trend_cn = prediction.get("trend_cn", "震荡")
             probability = prediction.get("probability", 0.5)
 
-            lines.extend([
-                f"预测趋势：{trend_cn}",
-                f"概率：{probability * 100:.0f}%",
-                f"",
-                f"目标价格区间：",
-                f"  上限：{prediction.get('target_price_high', 'N/A')} 元",
-                f"  下限：{prediction.get('target_price_low', 'N/A')} 元",
-                f"",
-                f"时间周期：{prediction.get('time_horizon', '短期')}",
-                f"风险等级：{prediction.get('risk_level', '中等')}",
-            ])
+            write(
+                f"预测趋势：{trend_cn}\n"
+                f"概率：{probability * 100:.0f}%\n"
+                "\n"
+                "目标价格区间：\n"
+                f"  上限：{prediction.get('target_price_high', 'N/A')} 元\n"
+                f"  下限：{prediction.get('target_price_low', 'N/A')} 元\n"
+                "\n"
+                f"时间周期：{prediction.get('time_horizon', '短期')}\n"
+                f"风险等级：{prediction.get('risk_level', '中等')}\n"
+            )
 
             key_factors = prediction.get("key_factors", [])
             if key_factors:
-                lines.extend([
-                    f"",
-                    f"关键影响因素：",
-                ])
+                write("\n关键影响因素：\n")
                 for factor in key_factors:
-                    lines.append(f"  - {factor}")
+                    write(f"  - {factor}\n")
 
-            lines.extend([
-                f"",
-                f"操作建议：{prediction.get('recommendation', '观望')}",
-            ])
+            write(f"\n操作建议：{prediction.get('recommendation', '观望')}\n")
 
-        lines.extend([
-            "",
-            "=" * 60,
-            f"报告生成时间：{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
-            "=" * 60,
-        ])
+        write(
+            "\n"
+            f"{_REPORT_RULE}\n"
+            f"报告生成时间：{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+            f"{_REPORT_RULE}"
+        )
 
-        return "\n".join(lines)
+        return buf.getvalue()
@@ -18,6 +18,7 @@ from .financial_data import (
 from .fund_flow import (
     fetch_fund_flow,
     fetch_capital_flow,
+    fetch_fund_flow_batch,
     fetch_north_bound_flow,
     FundFlowCollector
 )
@@ -39,6 +40,7 @@ __all__ = [
     # 资金流向
     'fetch_fund_flow',
     'fetch_capital_flow',
+    'fetch_fund_flow_batch',
     'fetch_north_bound_flow',
     'FundFlowCollector',
     # 新闻数据
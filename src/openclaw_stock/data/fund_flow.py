@@ -190,6 +190,74 @@ def fetch_fund_flow(
         raise DataSourceError(f"获取资金流向数据失败: {e}")
 
 
+# stock_individual_fund_flow_rank 列名后缀 -> 标准字段（列名前缀为统计区间，如"今日"）
+_RANK_FLOW_COLUMNS = {
+    "主力净流入-净额": "main_inflow",
+    "超大单净流入-净额": "large_inflow",
+    "中单净流入-净额": "medium_inflow",
+    "小单净流入-净额": "small_inflow",
+}
+
+
+def fetch_fund_flow_batch(
+    symbols: List[str],
+    indicator: Literal["今日", "3日", "5日", "10日"] = "今日"
+) -> pd.DataFrame:
+    """
+    批量获取多只股票的资金流向
+
+    只请求一次全市场资金流向排名，再按代码索引出所需股票，
+    避免逐只请求个股资金流向产生 N 次网络请求。
+
+    参数:
+        symbols: 股票代码列表（如 ["000001", "600000"]）
+        indicator: 统计区间
+
+    返回:
+        DataFrame: 每只股票一行（单位: 元）
+        - symbol: 股票代码
+        - name: 股票名称
+        - main_inflow: 主力净流入
+        - large_inflow: 超大单净流入
+        - medium_inflow: 中单净流入
+        - small_inflow: 小单净流入
+        快照中不存在的代码不会出现在结果中
+
+    异常:
+        DataSourceError: 数据源访问失败
+    """
+    if ak is None:
+        raise DataSourceError("akshare库未安装")
+
+    logger.info(f"[fetch_fund_flow_batch] 批量获取 {len(symbols)} 只股票的{indicator}资金流向")
+
+    try:
+        df = ak.stock_individual_fund_flow_rank(indicator=indicator)
+    except Exception as e:
+        logger.error(f"[fetch_fund_flow_batch] 获取全市场资金流向失败: {e}")
+        raise DataSourceError(f"获取全市场资金流向失败: {e}")
+
+    df = df[df["代码"].isin(set(symbols))].drop_duplicates("代码")
+
+    result = pd.DataFrame({
+        "symbol": df["代码"].to_numpy(),
+        "name": df["名称"].to_numpy() if "名称" in df.columns else "",
+    })
+    for suffix, field in _RANK_FLOW_COLUMNS.items():
+        column = f"{indicator}{suffix}"
+        if column in df.columns:
+            result[field] = pd.to_numeric(df[column], errors="coerce").fillna(0).to_numpy()
+        else:
+            result[field] = 0.0
+
+    missing = len(set(symbols)) - len(result)
+    if missing:
+        logger.warning(f"[fetch_fund_flow_batch] 资金流向排名中未找到 {missing} 只股票")
+
+    logger.info(f"[fetch_fund_flow_batch] 成功获取 {len(result)} 只股票资金流向")
+    return result
+
+
 def fetch_capital_flow(
     symbol: str,
     market: Literal["sh", "sz", "hk"] = "sh",
@@ -271,6 +339,10 @@ class FundFlowCollector:
         """获取个股资金流向"""
         return fetch_capital_flow(**kwargs)
 
+    def get_fund_flow_batch(self, **kwargs) -> pd.DataFrame:
+        """批量获取多只股票资金流向（单次全市场请求）"""
+        return fetch_fund_flow_batch(**kwargs)
+
     def get_north_bound_flow(self, **kwargs) -> pd.DataFrame:
         """获取北向资金流向"""
         return fetch_north_bound_flow(**kwargs)
@@ -12,7 +12,7 @@ ak_market_tool.py - AkShare市场数据引擎
 4. 资金流向数据获取（北向资金/主力资金）
 """
 
-from typing import Literal, Optional, Dict, Any, Union
+from typing import Literal, Optional, Dict, Any, List, Union
 from datetime import datetime, date
 import os
 import pandas as pd
@@ -23,9 +23,16 @@ from ..core.exceptions import DataSourceError, SymbolNotFoundError
 from ..adapters.akshare_adapter_em import get_adapter_em
 from ..utils.logger import get_logger
 from ..utils.decorators import tool, require_env, log_execution, retry, cache_result
+from ..utils.cache import redis_memoize
 
 logger = get_logger(__name__)
 
+# 实时行情只需要快照中的这些列（见 _build_quote）
+_QUOTE_COLUMNS = [
+    "代码", "名称", "最新价", "涨跌额", "涨跌幅", "成交量",
+    "成交额", "最高", "最低", "今开", "昨收",
+]
+
 
 class AKMarketTool:
     """
@@ -113,11 +120,11 @@ class AKMarketTool:
         try:
             if market == "hk":
                 # 港股实时行情
-                df = self.adapter.get_stock_hk_spot()
+                df = self.adapter.get_stock_hk_spot(columns=_QUOTE_COLUMNS)
                 symbol_col = "代码"
             else:
                 # A股实时行情
-                df = self.adapter.get_stock_zh_a_spot()
+                df = self.adapter.get_stock_zh_a_spot(columns=_QUOTE_COLUMNS)
                 symbol_col = "代码"
 
             # 查找指定股票
@@ -126,23 +133,7 @@ class AKMarketTool:
             if stock_data.empty:
                 raise SymbolNotFoundError(symbol, market)
 
-            row = stock_data.iloc[0]
-
-            # 构建返回数据
-            result = {
-                "symbol": symbol,
-                "market": market,
-                "name": row.get("名称", ""),
-                "price": float(row.get("最新价", 0) or 0),
-                "change": float(row.get("涨跌额", 0) or 0),
-                "change_pct": float(row.get("涨跌幅", 0) or 0),
-                "volume": int(row.get("成交量", 0) or 0),
-                "amount": float(row.get("成交额", 0) or 0),
-                "high": float(row.get("最高", 0) or 0),
-                "low": float(row.get("最低", 0) or 0),
-                "open": float(row.get("今开", 0) or 0),
-                "pre_close": float(row.get("昨收", 0) or 0),
-            }
+            result = self._build_quote(stock_data.iloc[0], symbol, market)
 
             logger.info(
                 f"[AKMarketTool] 成功获取 {result['name']}({symbol}) 实时行情，"
@@ -156,6 +147,77 @@ class AKMarketTool:
             logger.error(f"[AKMarketTool] 获取实时行情失败: {str(e)}")
             raise DataSourceError(f"获取{market}:{symbol}实时行情失败: {str(e)}")
 
+    @retry(max_attempts=3, delay=1.0)
+    def get_realtime_quotes(
+        self,
+        symbols: List[str],
+        market: Literal["sh", "sz", "hk"] = "sh",
+        timeout: int = 30
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        批量获取实时行情快照
+
+        只请求一次全市场行情快照，再按代码索引出所需股票，
+        避免逐只调用 get_realtime_quote 产生 N 次网络请求。
+
+        **WARNING**: 这是获取中国市场数据的唯一权威工具，严禁使用 Bing 搜索代替结构化数据。
+
+        Args:
+            symbols: 股票代码列表（如 ["000001", "600000"]）
+            market: 市场类型（"sh"/"sz" 均使用A股快照, "hk"-港股）
+            timeout: 请求超时时间（秒）
+
+        Returns:
+            {symbol: 行情字典}，字段与 get_realtime_quote 相同；
+            快照中不存在的代码不会出现在结果中
+
+        Raises:
+            DataSourceError: 数据源访问失败
+        """
+        logger.info(f"[AKMarketTool] 批量获取 {len(symbols)} 只 {market} 股票的实时行情...")
+
+        try:
+            if market == "hk":
+                df = self.adapter.get_stock_hk_spot(columns=_QUOTE_COLUMNS)
+            else:
+                df = self.adapter.get_stock_zh_a_spot(columns=_QUOTE_COLUMNS)
+
+            wanted = set(symbols)
+            df = df[df["代码"].isin(wanted)].drop_duplicates("代码")
+
+            result = {
+                row["代码"]: self._build_quote(row, row["代码"], market)
+                for _, row in df.iterrows()
+            }
+
+            missing = wanted - result.keys()
+            if missing:
+                logger.warning(f"[AKMarketTool] 行情快照中未找到 {len(missing)} 只股票: {sorted(missing)[:10]}")
+
+            logger.info(f"[AKMarketTool] 成功批量获取 {len(result)} 只股票实时行情")
+            return result
+
+        except Exception as e:
+            logger.error(f"[AKMarketTool] 批量获取实时行情失败: {str(e)}")
+            raise DataSourceError(f"批量获取{market}实时行情失败: {str(e)}")
+
+    def _build_quote(self, row: pd.Series, symbol: str, market: str) -> Dict[str, Any]:
+        """将行情快照中的一行转换为标准行情字典"""
+        return {
+            "symbol": symbol,
+            "market": market,
+            "name": row.get("名称", ""),
+            "price": float(row.get("最新价", 0) or 0),
+            "change": float(row.get("涨跌额", 0) or 0),
+            "change_pct": float(row.get("涨跌幅", 0) or 0),
+            "volume": int(row.get("成交量", 0) or 0),
+            "amount": float(row.get("成交额", 0) or 0),
+            "high": float(row.get("最高", 0) or 0),
+            "low": float(row.get("最低", 0) or 0),
+            "open": float(row.get("今开", 0) or 0),
+            "pre_close": float(row.get("昨收", 0) or 0),
+        }
+
     @retry(max_attempts=3, delay=1.0)
     def get_kline_data(
         self,
@@ -176,7 +238,8 @@ class AKMarketTool:
             symbol: 股票代码（如 "000001"）
             market: 市场类型（"sh"-上证, "sz"-深证, "hk"-港股）
             period: K线周期（"daily"-日线, "weekly"-周线, "monthly"-月线）
-            start_date: 开始日期（格式: YYYYMMDD），默认19700101
+            start_date: 开始日期（格式: YYYYMMDD），默认最近约400天；
+                需要完整历史时传入 "19700101"
             end_date: 结束日期（格式: YYYYMMDD），默认今天
             adjust: 复权方式（""-不复权, "qfq"-前复权, "hfq"-后复权）
             timeout: 请求超时时间（秒）
@@ -451,9 +514,14 @@ class AKMarketTool:
 )
 @require_env(["AKSHARE_DATA_PATH"])
 @log_execution
+@redis_memoize(
+    ttl=5.0,
+    action_ttl={"kline": 3600.0, "fundamental": 86400.0, "capital_flow": 60.0}
+)
 def ak_market_tool(
-    action: Literal["realtime", "kline", "fundamental", "capital_flow"] = "realtime",
+    action: Literal["realtime", "realtime_batch", "kline", "fundamental", "capital_flow"] = "realtime",
     symbol: str = "",
+    symbols: Optional[List[str]] = None,
     market: Literal["sh", "sz", "hk"] = "sh",
     period: Literal["daily", "weekly", "monthly"] = "daily",
     start_date: Optional[str] = None,
@@ -472,10 +540,12 @@ def ak_market_tool(
     参数:
         action: 操作类型
             - "realtime": 获取实时行情快照
+            - "realtime_batch": 批量获取实时行情（一次请求，需提供symbols）
             - "kline": 获取历史K线数据
             - "fundamental": 获取基本面数据
             - "capital_flow": 获取资金流向数据
         symbol: 股票代码（如 "000001" 或 "00700"）
+        symbols: 股票代码列表（仅 realtime_batch 使用）
         market: 市场类型（"sh"-上证, "sz"-深证, "hk"-港股）
         period: K线周期（"daily"-日线, "weekly"-周线, "monthly"-月线）
         start_date: 开始日期（格式: YYYYMMDD）
@@ -509,8 +579,18 @@ def ak_market_tool(
         ...     end_date="20240131",
         ...     adjust="qfq"
         ... )
+
+        >>> # 批量获取实时行情
+        >>> result = ak_market_tool(
+        ...     action="realtime_batch",
+        ...     symbols=["000001", "000002"],
+        ...     market="sz"
+        ... )
     """
-    if not symbol:
+    if action == "realtime_batch":
+        if not symbols:
+            raise ValueError("批量行情必须提供股票代码列表(symbols)")
+    elif not symbol:
         raise ValueError("必须提供股票代码(symbol)")
 
     # 初始化工具实例
@@ -520,6 +600,15 @@ def ak_market_tool(
     if action == "realtime":
         return engine.get_realtime_quote(symbol, market, timeout)
 
+    elif action == "realtime_batch":
+        quotes = engine.get_realtime_quotes(symbols, market, timeout)
+        return {
+            "market": market,
+            "requested": len(symbols),
+            "data_count": len(quotes),
+            "data": quotes,
+        }
+
     elif action == "kline":
         df = engine.get_kline_data(
             symbol, market, period, start_date, end_date, adjust, timeout
@@ -8,20 +8,61 @@ web_quote_validator.py - Web行情验证器
 将在返回结果中标记[DATA_MISMATCH_WARNING]。
 """
 
+import asyncio
 import requests
 import json
+import threading
 import time
-from typing import Dict, Any, Optional, Literal
+from typing import Dict, Any, List, Optional, Literal
 from datetime import datetime
 from urllib.parse import urlencode
+from requests.adapters import HTTPAdapter
 
 from ..core.config import get_config
 from ..core.exceptions import ValidationError, NetworkError, PriceMismatchError
 from ..utils.decorators import tool, require_env, log_execution, retry
 from ..utils.logger import get_logger
+from ..utils.cache import redis_memoize
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
 
 logger = get_logger(__name__)
 
+# 进程内共享的HTTP会话（连接池 + keep-alive），避免每次请求重新建立TCP/TLS连接
+_SESSION: Optional[requests.Session] = None
+_SESSION_LOCK = threading.Lock()
+
+
+def get_shared_session() -> requests.Session:
+    """
+    获取进程内共享的 requests 会话
+
+    会话挂载了连接池适配器，所有 WebQuoteValidator 实例复用同一组
+    keep-alive 连接；请求头和代理按请求传入，不写入共享会话。
+    适配器不做重试，失败重试统一由 get_realtime_quote 上的 @retry 负责，
+    避免两层重试相乘。
+
+    Returns:
+        共享的 requests.Session 实例
+    """
+    global _SESSION
+    if _SESSION is None:
+        with _SESSION_LOCK:
+            if _SESSION is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=16,
+                    pool_maxsize=32,
+                    max_retries=0
+                )
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _SESSION = session
+    return _SESSION
+
 
 class WebQuoteValidator:
     """
@@ -83,15 +124,16 @@ class WebQuoteValidator:
         self.source = source
         self.config = self.DATA_SOURCES[source]
         self.timeout = timeout
-        self.session = requests.Session()
+        self.session = get_shared_session()
 
-        # 设置默认headers
-        self.session.headers.update(self.config["headers"])
+        # 设置默认headers（按实例保存，请求时传入，避免污染共享会话）
+        self.headers: Dict[str, str] = dict(self.config["headers"])
 
         # 设置代理
         self.proxy = proxy or get_config().get_proxy_url()
+        self.proxies: Optional[Dict[str, str]] = None
         if self.proxy:
-            self.session.proxies = {
+            self.proxies = {
                 "http": self.proxy,
                 "https": self.proxy
             }
@@ -174,6 +216,89 @@ class WebQuoteValidator:
             logger.error(f"[WebQuoteValidator] 数据处理错误: {str(e)}")
             raise ValidationError(f"解析{symbol}行情数据失败: {str(e)}")
 
+    def _build_request(self, formatted_symbol: str) -> tuple:
+        """
+        构建实时行情请求的URL和查询参数
+
+        Args:
+            formatted_symbol: 已格式化的股票代码
+
+        Returns:
+            (url, params) 元组
+        """
+        url = f"{self.config['base_url']}{self.config['realtime_endpoint']}"
+
+        if self.source == "eastmoney":
+            params = {
+                "secid": formatted_symbol,
+                "fields": "f43,f44,f45,f46,f47,f48,f57,f58,f60,f170",
+                "_": int(time.time() * 1000)
+            }
+        elif self.source == "tencent":
+            params = {"q": formatted_symbol}
+        else:
+            params = {"list": formatted_symbol}
+
+        return url, params
+
+    async def get_realtime_quote_async(
+        self,
+        symbol: str,
+        market: Literal["sh", "sz", "hk"],
+        session: "aiohttp.ClientSession"
+    ) -> Dict[str, Any]:
+        """
+        异步获取实时行情数据
+
+        与 get_realtime_quote 解析逻辑一致，但通过共享的 aiohttp 会话发起请求，
+        便于多个数据源并发抓取。每次请求按 self.timeout 设置总超时，
+        不依赖调用方传入的会话是否配置了超时。
+
+        Args:
+            symbol: 股票代码（如 "000001"）
+            market: 市场类型（sh-上证, sz-深证, hk-港股）
+            session: aiohttp客户端会话
+
+        Returns:
+            包含实时行情数据的字典
+        """
+        formatted_symbol = self._format_symbol(symbol, market)
+        url, params = self._build_request(formatted_symbol)
+        logger.info(
+            f"[WebQuoteValidator] 正在从{self.config['name']}异步获取 "
+            f"{market}:{symbol} 的实时行情..."
+        )
+
+        try:
+            async with session.get(
+                url,
+                params=params,
+                headers=self.headers,
+                proxy=self.proxy,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            ) as response:
+                response.raise_for_status()
+                text = await response.text()
+
+            if self.source == "eastmoney":
+                return self._parse_eastmoney(json.loads(text), symbol, market)
+            elif self.source == "tencent":
+                return self._parse_tencent(text, symbol, market)
+            else:
+                return self._parse_sina(text, symbol, market)
+
+        except aiohttp.ClientError as e:
+            logger.error(f"[WebQuoteValidator] 网络请求失败: {str(e)}")
+            raise NetworkError(f"获取{symbol}行情失败: {str(e)}")
+        except asyncio.TimeoutError:
+            logger.error(f"[WebQuoteValidator] 网络请求超时: {url}")
+            raise NetworkError(f"获取{symbol}行情超时")
+        except ValidationError:
+            raise
+        except Exception as e:
+            logger.error(f"[WebQuoteValidator] 数据处理错误: {str(e)}")
+            raise ValidationError(f"解析{symbol}行情数据失败: {str(e)}")
+
     def _fetch_eastmoney_realtime(
         self,
         formatted_symbol: str,
@@ -181,22 +306,26 @@ class WebQuoteValidator:
         market: str
     ) -> Dict[str, Any]:
         """从东方财富获取实时行情"""
-        url = f"{self.config['base_url']}{self.config['realtime_endpoint']}"
-        params = {
-            "secid": formatted_symbol,
-            "fields": "f43,f44,f45,f46,f47,f48,f57,f58,f60,f170",
-            "_": int(time.time() * 1000)
-        }
+        url, params = self._build_request(formatted_symbol)
 
         response = self.session.get(
             url,
             params=params,
-            headers=self.config["headers"],
+            headers=self.headers,
+            proxies=self.proxies,
             timeout=self.timeout
         )
         response.raise_for_status()
 
-        data = response.json()
+        return self._parse_eastmoney(response.json(), original_symbol, market)
+
+    def _parse_eastmoney(
+        self,
+        data: Dict[str, Any],
+        original_symbol: str,
+        market: str
+    ) -> Dict[str, Any]:
+        """解析东方财富返回的JSON数据"""
         if data.get("rc") != 0:
             raise ValidationError(f"东方财富API错误: {data.get('rt')}")
 
@@ -239,18 +368,27 @@ class WebQuoteValidator:
         market: str
     ) -> Dict[str, Any]:
         """从腾讯财经获取实时行情"""
-        url = f"{self.config['base_url']}{self.config['realtime_endpoint']}"
+        url, params = self._build_request(formatted_symbol)
 
         response = self.session.get(
             url,
-            params={"q": formatted_symbol},
-            headers=self.config["headers"],
+            params=params,
+            headers=self.headers,
+            proxies=self.proxies,
             timeout=self.timeout
         )
         response.raise_for_status()
 
+        return self._parse_tencent(response.text, original_symbol, market)
+
+    def _parse_tencent(
+        self,
+        text: str,
+        original_symbol: str,
+        market: str
+    ) -> Dict[str, Any]:
+        """解析腾讯财经返回的文本数据"""
         # 腾讯返回格式为: v_sh600519="1~贵州茅台~600519~...";
-        text = response.text
         try:
             # 提取引号内的数据
             start = text.find('"') + 1
@@ -299,18 +437,27 @@ class WebQuoteValidator:
         market: str
     ) -> Dict[str, Any]:
         """从新浪财经获取实时行情"""
-        url = f"{self.config['base_url']}{self.config['realtime_endpoint']}"
+        url, params = self._build_request(formatted_symbol)
 
         response = self.session.get(
             url,
-            params={"list": formatted_symbol},
-            headers=self.config["headers"],
+            params=params,
+            headers=self.headers,
+            proxies=self.proxies,
             timeout=self.timeout
         )
         response.raise_for_status()
 
+        return self._parse_sina(response.text, original_symbol, market)
+
+    def _parse_sina(
+        self,
+        text: str,
+        original_symbol: str,
+        market: str
+    ) -> Dict[str, Any]:
+        """解析新浪财经返回的文本数据"""
         # 新浪返回格式为: var hq_str_sh600519="贵州茅台,1740.00,...";
-        text = response.text
         try:
             # 提取引号内的数据
             start = text.find('"') + 1
@@ -434,6 +581,7 @@ class WebQuoteValidator:
     description="Web行情验证器 - 通过东方财富/腾讯/新浪获取实时价格，用于验证AkShare数据"
 )
 @log_execution
+@redis_memoize(ttl=5.0)
 def web_quote_validator_tool(
     symbol: str = "",
     market: Literal["sh", "sz", "hk"] = "sh",
@@ -520,11 +668,11 @@ def web_quote_validator_tool(
 
     # 使用自定义headers（如果提供）
     if headers:
-        validator.session.headers.update(headers)
+        validator.headers.update(headers)
 
     # 使用自定义proxies（如果提供，覆盖环境变量）
     if proxies:
-        validator.session.proxies = proxies
+        validator.proxies = proxies
 
     # 获取实时行情
     logger.info(f"[WebQuoteValidator] 开始从{source}获取 {market}:{symbol} 的实时行情...")
@@ -555,3 +703,114 @@ def web_quote_validator_tool(
     )
 
     return quote_data
+
+
+async def web_quote_validator_tool_async(
+    symbol: str = "",
+    market: Literal["sh", "sz", "hk"] = "sh",
+    sources: Optional[List[str]] = None,
+    headers: Optional[Dict[str, str]] = None,
+    proxies: Optional[Dict[str, str]] = None,
+    reference_price: Optional[float] = None,
+    threshold: float = 0.5,
+    timeout: int = 5,
+    session: Optional["aiohttp.ClientSession"] = None
+) -> Dict[str, Any]:
+    """
+    Web行情验证器（异步版本）- 多数据源并发抓取
+
+    通过 aiohttp 在同一个会话中并发请求多个数据源，总耗时由各数据源耗时之和
+    降为其中最慢的一个。返回结果以 sources 中第一个成功的数据源为主，
+    其余数据源的行情放在 cross_check 字段中供交叉比对。
+
+    需要安装可选依赖 aiohttp（pip install "openclaw-stock-research[perf]"）。
+
+    Args:
+        symbol: 股票代码（如"000001"表示平安银行）
+        market: 市场类型（"sh"-上证, "sz"-深证, "hk"-港股）
+        sources: 数据源列表，默认 ["eastmoney", "tencent", "sina"]
+        headers: 自定义HTTP请求头（可选）
+        proxies: 代理配置（可选，默认从环境变量PROXY_URL读取）
+        reference_price: 参考价格用于验证（可选）
+        threshold: 价格差异阈值（百分比，默认0.5%）
+        timeout: 单次请求总超时时间（秒）
+        session: 复用的 aiohttp 会话（可选）。长期运行的事件循环中传入同一个
+            会话可复用 keep-alive 连接；不传则为本次调用临时创建
+
+    Returns:
+        与 web_quote_validator_tool 相同的行情字典，额外包含：
+        - cross_check: 其他数据源的行情 {source: quote}
+        - errors: 抓取失败的数据源 {source: 错误信息}
+
+    Raises:
+        ImportError: 未安装 aiohttp
+        NetworkError: 所有数据源均获取失败
+
+    Examples:
+        >>> result = asyncio.run(web_quote_validator_tool_async(
+        ...     symbol="000001",
+        ...     market="sz",
+        ...     reference_price=10.26
+        ... ))
+    """
+    if not symbol:
+        raise ValueError("必须提供股票代码(symbol)")
+    if aiohttp is None:
+        raise ImportError("异步行情验证需要 aiohttp，请执行: pip install aiohttp")
+
+    sources = sources or list(WebQuoteValidator.DATA_SOURCES.keys())
+    validators = [WebQuoteValidator(source=src, timeout=timeout) for src in sources]
+
+    for validator in validators:
+        if headers:
+            validator.headers.update(headers)
+        if proxies:
+            validator.proxy = proxies.get("https") or proxies.get("http")
+
+    logger.info(f"[WebQuoteValidator] 开始并发从{sources}获取 {market}:{symbol} 的实时行情...")
+
+    if session is not None:
+        results = await asyncio.gather(
+            *(v.get_realtime_quote_async(symbol, market, session) for v in validators),
+            return_exceptions=True
+        )
+    else:
+        # 超时由每次请求按 timeout 设置，临时会话无需再配置
+        async with aiohttp.ClientSession() as own_session:
+            results = await asyncio.gather(
+                *(v.get_realtime_quote_async(symbol, market, own_session) for v in validators),
+                return_exceptions=True
+            )
+
+    quotes: Dict[str, Dict[str, Any]] = {}
+    errors: Dict[str, str] = {}
+    for src, res in zip(sources, results):
+        if isinstance(res, Exception):
+            logger.warning(f"[WebQuoteValidator] {src} 获取失败: {str(res)}")
+            errors[src] = str(res)
+        else:
+            quotes[src] = res
+
+    if not quotes:
+        raise NetworkError(f"获取{symbol}行情失败: 所有数据源均不可用 {errors}")
+
+    primary = next(src for src in sources if src in quotes)
+    quote_data = quotes.pop(primary)
+    quote_data["cross_check"] = quotes
+    quote_data["errors"] = errors
+
+    if reference_price is not None and reference_price > 0:
+        logger.info(f"[WebQuoteValidator] 正在验证价格，参考价格: {reference_price}")
+        quote_data["validation"] = validators[sources.index(primary)].validate_against_reference(
+            web_price=quote_data["price"],
+            reference_price=reference_price,
+            symbol=symbol,
+            threshold=threshold
+        )
+
+    logger.info(
+        f"[WebQuoteValidator] 成功获取 {quote_data.get('name', symbol)} 行情，"
+        f"当前价格: {quote_data['price']}（主数据源: {primary}）"
+    )
+
+    return quote_data
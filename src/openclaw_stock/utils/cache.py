@@ -0,0 +1,401 @@
+"""
+跨进程缓存模块
+
+基于 Redis 的工具结果缓存，使多个进程（调试脚本、定时任务等）共享同一份
+行情/基本面数据，避免在短时间内重复请求数据源。
+
+Redis 为可选依赖：未安装 redis 库或未设置 REDIS_URL 环境变量时，
+被装饰的函数直接透传调用，不影响正常使用。
+
+另提供基于本地文件的 TTL 缓存（file_memoize），无需额外服务；
+设置 FILE_CACHE_PATH 环境变量后启用，未设置时同样直接透传。
+"""
+
+import gzip
+import hashlib
+import inspect
+import io
+import json
+import os
+import threading
+import time
+from functools import wraps
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, TypeVar, Union
+
+import pandas as pd
+
+from ..core.config import get_config
+from .logger import get_logger
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = get_logger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# 超过该字节数的缓存值使用gzip压缩
+_GZIP_THRESHOLD = 1024
+_GZIP_MAGIC = b"\x1f\x8b"
+
+# Redis 读写失败后暂停使用的时间（秒），避免每次调用都等待连接超时
+_REDIS_COOLDOWN = 30.0
+
+_client: Optional["redis.Redis"] = None
+_client_initialized = False
+_suspended_until = 0.0
+
+
+def get_redis_client() -> Optional["redis.Redis"]:
+    """
+    获取全局 Redis 客户端
+
+    从环境变量 REDIS_URL 读取连接地址，首次调用时创建客户端。
+
+    Returns:
+        Redis客户端实例，如果未安装redis或未配置REDIS_URL则返回None
+    """
+    global _client, _client_initialized
+    if _client_initialized:
+        return _client
+
+    _client_initialized = True
+    redis_url = get_config().get("REDIS_URL")
+    if redis is None or not redis_url:
+        logger.debug("[redis_memoize] 未配置Redis，缓存已禁用")
+        return None
+
+    try:
+        _client = redis.Redis.from_url(
+            redis_url,
+            socket_connect_timeout=0.5,
+            socket_timeout=0.5,
+        )
+        logger.info(f"[redis_memoize] 已连接Redis缓存: {redis_url}")
+    except Exception as e:
+        logger.warning(f"[redis_memoize] 创建Redis客户端失败，缓存已禁用: {str(e)}")
+        _client = None
+
+    return _client
+
+
+def reset_redis_client() -> None:
+    """
+    重置 Redis 客户端
+
+    主要用于测试场景，下次调用时重新读取 REDIS_URL
+    """
+    global _client, _client_initialized, _suspended_until
+    _client = None
+    _client_initialized = False
+    _suspended_until = 0.0
+
+
+def _suspend_redis(error: Exception) -> None:
+    """Redis 读写失败后在冷却期内跳过缓存，直接调用被装饰的函数"""
+    global _suspended_until
+    _suspended_until = time.monotonic() + _REDIS_COOLDOWN
+    logger.warning(f"[redis_memoize] Redis访问失败，{_REDIS_COOLDOWN:.0f}秒内直接调用: {str(error)}")
+
+
+def _encode(value: Any) -> bytes:
+    """序列化为 UTF-8 JSON 字节（numpy 标量按数值，其他未知类型转为字符串）"""
+    if orjson is not None:
+        return orjson.dumps(value, default=str, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(value, ensure_ascii=False, default=str).encode("utf-8")
+
+
+def _compress(data: bytes) -> bytes:
+    """序列化后的缓存值超过阈值时gzip压缩"""
+    if len(data) > _GZIP_THRESHOLD:
+        data = gzip.compress(data, compresslevel=1)
+    return data
+
+
+def _loads(data: bytes) -> Any:
+    """反序列化缓存值"""
+    if data[:2] == _GZIP_MAGIC:
+        data = gzip.decompress(data)
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def redis_memoize(
+    ttl: float = 5.0,
+    action_ttl: Optional[Dict[str, float]] = None
+) -> Callable[[F], F]:
+    """
+    Redis 结果缓存装饰器
+
+    缓存键由函数名、调用参数哈希和时间桶（int(time()/ttl)）组成，
+    同一时间桶内的相同调用直接返回缓存结果。Redis 不可用时透传调用，
+    读写失败后在冷却期内不再访问 Redis。
+
+    结果按 JSON 序列化保存，命中时返回的是 JSON 往返后的值（时间等类型为字符串，
+    NaN 为 None）；未命中时同样返回往返后的值，保证两种情况结果一致。
+
+    参数:
+        ttl: 默认缓存有效期（秒），默认为5秒
+        action_ttl: 按 action 参数设置的缓存有效期，如 {"fundamental": 86400}
+
+    示例:
+        @redis_memoize(ttl=5.0, action_ttl={"fundamental": 86400})
+        def ak_market_tool(action="realtime", symbol=""):
+            ...
+    """
+    action_ttl = action_ttl or {}
+
+    def decorator(func: F) -> F:
+        signature = inspect.signature(func)
+
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            client = get_redis_client()
+            if client is None or time.monotonic() < _suspended_until:
+                return func(*args, **kwargs)
+
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            params = bound.arguments
+
+            effective_ttl = action_ttl.get(params.get("action"), ttl)
+            bucket = int(time.time() / effective_ttl)
+            digest = hashlib.blake2b(
+                json.dumps(params, sort_keys=True, default=str).encode("utf-8"),
+                digest_size=8
+            ).hexdigest()
+            key = f"oc:{func.__name__}:{digest}:{bucket}"
+
+            try:
+                cached = client.get(key)
+            except Exception as e:
+                _suspend_redis(e)
+                return func(*args, **kwargs)
+            if cached is not None:
+                logger.debug(f"[redis_memoize] 命中缓存: {key}")
+                return _loads(cached)
+
+            data = _encode(func(*args, **kwargs))
+
+            try:
+                client.set(key, _compress(data), ex=max(int(effective_ttl), 1))
+                logger.debug(f"[redis_memoize] 缓存结果: {key}")
+            except Exception as e:
+                _suspend_redis(e)
+
+            return _loads(data)
+
+        return wrapper  # type: ignore
+
+    return decorator
+
+
+class FileCache:
+    """
+    本地文件 TTL 缓存
+
+    每个结果保存为 {root}/{endpoint}/{key}.json，内容包含写入时间戳；
+    读取时超过 ttl 视为未命中。DataFrame 以 split 格式保存并记录各列类型，
+    读取时不做类型推断，按记录的类型还原；其他值按 JSON 保存，set 返回
+    JSON 往返后的值，调用方据此保证命中与未命中返回的数据一致。
+    """
+
+    def __init__(self, root: Path):
+        """
+        参数:
+            root: 缓存根目录（不存在时自动创建）
+        """
+        self.root = Path(root).expanduser()
+
+    def _path(self, endpoint: str, key: str) -> Path:
+        return self.root / endpoint / f"{key}.json"
+
+    def get(self, endpoint: str, key: str, ttl: float) -> Optional[Any]:
+        """
+        读取缓存
+
+        参数:
+            endpoint: 数据接口名（子目录）
+            key: 缓存键（文件名）
+            ttl: 有效期（秒）
+
+        返回:
+            缓存值，不存在、已过期或读取失败时返回 None
+        """
+        try:
+            data = self._path(endpoint, key).read_bytes()
+        except FileNotFoundError:
+            return None
+
+        try:
+            entry = orjson.loads(data) if orjson is not None else json.loads(data)
+            if time.time() - entry["timestamp"] >= ttl:
+                return None
+            if "frame" in entry:
+                df = pd.read_json(
+                    io.StringIO(entry["frame"]), orient="split", dtype=False, convert_dates=False
+                )
+                return df.astype(dict(zip(df.columns, entry["dtypes"])))
+            return entry["value"]
+        except Exception as e:
+            logger.warning(f"[FileCache] 读取缓存失败: {endpoint}/{key}: {str(e)}")
+            return None
+
+    def set(self, endpoint: str, key: str, value: Any) -> Any:
+        """
+        写入缓存（先写临时文件再替换，读者不会读到半截文件）
+
+        参数:
+            endpoint: 数据接口名（子目录）
+            key: 缓存键（文件名）
+            value: 可 JSON 序列化的值或 DataFrame
+
+        返回:
+            命中缓存时 get 将返回的值：DataFrame 原样返回；其他值为 JSON 往返后的值
+            （时间等类型为字符串，NaN 为 None）
+        """
+        entry: Dict[str, Any] = {"timestamp": time.time()}
+        if isinstance(value, pd.DataFrame):
+            entry["frame"] = value.to_json(orient="split", date_format="iso", force_ascii=False)
+            entry["dtypes"] = [str(dtype) for dtype in value.dtypes]
+        else:
+            entry["value"] = value
+
+        data = _encode(entry)
+        if "value" in entry:
+            value = _loads(data)["value"]
+
+        path = self._path(endpoint, key)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+        except Exception as e:
+            logger.warning(f"[FileCache] 写入缓存失败: {endpoint}/{key}: {str(e)}")
+            tmp.unlink(missing_ok=True)
+        return value
+
+
+def _has_data(value: Any) -> bool:
+    """判断结果是否值得缓存（None 与空 DataFrame/字典/列表不缓存）"""
+    if value is None:
+        return False
+    try:
+        return len(value) > 0
+    except TypeError:
+        return True
+
+
+_file_cache: Optional[FileCache] = None
+_file_cache_initialized = False
+
+
+def get_file_cache() -> Optional[FileCache]:
+    """
+    获取全局文件缓存
+
+    从环境变量 FILE_CACHE_PATH 读取缓存根目录，首次调用时创建。
+
+    Returns:
+        FileCache 实例，未配置 FILE_CACHE_PATH 时返回 None
+    """
+    global _file_cache, _file_cache_initialized
+    if _file_cache_initialized:
+        return _file_cache
+
+    _file_cache_initialized = True
+    path = get_config().get("FILE_CACHE_PATH")
+    if not path:
+        logger.debug("[file_memoize] 未配置FILE_CACHE_PATH，文件缓存已禁用")
+        return None
+
+    _file_cache = FileCache(Path(path))
+    logger.info(f"[file_memoize] 已启用文件缓存: {_file_cache.root}")
+    return _file_cache
+
+
+def reset_file_cache() -> None:
+    """
+    重置文件缓存
+
+    主要用于测试场景，下次调用时重新读取 FILE_CACHE_PATH
+    """
+    global _file_cache, _file_cache_initialized
+    _file_cache = None
+    _file_cache_initialized = False
+
+
+def file_memoize(
+    endpoint: str,
+    ttl: Union[float, Callable[[Dict[str, Any]], float]]
+) -> Callable[[F], F]:
+    """
+    文件结果缓存装饰器
+
+    缓存键为 {symbol}_{调用参数哈希}，保存在 FILE_CACHE_PATH/{endpoint}/ 下；
+    有效期内的相同调用直接读取文件。调用异常或结果为空时不缓存，
+    文件缓存未启用时透传调用。写入缓存的调用同样返回 JSON 往返后的值
+    （NaN 为 None 等），与之后命中缓存时一致。
+
+    参数:
+        endpoint: 数据接口名，作为缓存子目录
+        ttl: 缓存有效期（秒），或按调用参数字典返回有效期的函数
+
+    示例:
+        fetch_realtime_quote = file_memoize("realtime_quote", ttl=60)(fetch_realtime_quote)
+        fetch_news = file_memoize("news", ttl=lambda params: 60 if params["live"] else 3600)(fetch_news)
+    """
+    def decorator(func: F) -> F:
+        signature = inspect.signature(func)
+
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            file_cache = get_file_cache()
+            if file_cache is None:
+                return func(*args, **kwargs)
+
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            params = bound.arguments
+            digest = hashlib.blake2b(
+                json.dumps(params, sort_keys=True, default=str).encode("utf-8"),
+                digest_size=8
+            ).hexdigest()
+            key = f"{params.get('symbol', '')}_{digest}"
+
+            effective_ttl = ttl(params) if callable(ttl) else ttl
+            cached = file_cache.get(endpoint, key, effective_ttl)
+            if cached is not None:
+                logger.debug(f"[file_memoize] 命中缓存: {endpoint}/{key}")
+                return cached
+
+            result = func(*args, **kwargs)
+            if _has_data(result):
+                # 未命中时同样返回缓存中保存的形式，与之后命中时的结果一致
+                result = file_cache.set(endpoint, key, result)
+            return result
+
+        return wrapper  # type: ignore
+
+    return decorator
+
+
+__all__ = [
+    "redis_memoize",
+    "get_redis_client",
+    "reset_redis_client",
+    "FileCache",
+    "file_memoize",
+    "get_file_cache",
+    "reset_file_cache",
+]
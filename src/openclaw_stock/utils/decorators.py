@@ -7,6 +7,7 @@ OpenClaw工具装饰器定义
 from functools import wraps
 from typing import Callable, Any, List, TypeVar, Optional
 import os
+import random
 import time
 import logging
 from datetime import datetime
@@ -143,7 +144,9 @@ def retry(
     max_attempts: int = 3,
     delay: float = 1.0,
     backoff: float = 2.0,
-    exceptions: tuple = (Exception,)
+    exceptions: tuple = (Exception,),
+    max_delay: Optional[float] = None,
+    jitter: float = 0.0
 ) -> Callable[[F], F]:
     """
     重试装饰器
@@ -155,6 +158,9 @@ def retry(
         delay: 初始延迟时间（秒），默认为1.0
         backoff: 退避系数，默认为2.0（每次延迟翻倍）
         exceptions: 需要捕获的异常类型元组，默认为(Exception,)
+        max_delay: 单次延迟上限（秒），默认不限制
+        jitter: 每次延迟额外叠加 [0, jitter) 秒的随机抖动，
+            避免并发请求失败后同时重试，默认为0
 
     示例:
         @retry(max_attempts=5, delay=2.0)
@@ -186,8 +192,10 @@ def retry(
                             f"[retry] {func_name} 第{attempt}次尝试失败: {str(e)}，"
                             f"{current_delay}秒后重试..."
                         )
-                        time.sleep(current_delay)
+                        time.sleep(current_delay + random.uniform(0, jitter))
                         current_delay *= backoff
+                        if max_delay is not None:
+                            current_delay = min(current_delay, max_delay)
                     else:
                         logger.error(
                             f"[retry] {func_name} 所有{max_attempts}次尝试均失败，"
@@ -7,6 +7,7 @@
 import logging
 import sys
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
@@ -54,10 +55,13 @@ class ColoredFormatter(ChineseFormatter):
         return super().format(record)
 
 
+@lru_cache(maxsize=None)
 def get_logger(name: Optional[str] = None) -> logging.Logger:
     """
     获取配置好的日志记录器
 
+    同名记录器只配置一次，之后的调用（如各类 __init__ 中的 get_logger）直接返回缓存
+
     参数:
         name: 日志记录器名称，默认为"openclaw_stock"
 
@@ -7,10 +7,12 @@
 import os
 import sys
 import subprocess
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
 
+@lru_cache(maxsize=None)
 def find_venv_path(start_path: Optional[Path] = None) -> Optional[Path]:
     """
     从给定路径开始向上查找虚拟环境
@@ -20,6 +22,10 @@ def find_venv_path(start_path: Optional[Path] = None) -> Optional[Path]:
     2. 项目根目录下的 venv/ 或 .venv/
     3. 环境变量 VIRTUAL_ENV 指定的路径
 
+    查找过程需要逐级检查多个目录，结果按 start_path 缓存，
+    同一进程内重复调用（如多次 auto_activate）不再重复访问文件系统。
+    如需重新查找，调用 find_venv_path.cache_clear()。
+
     Args:
         start_path: 开始查找的路径，默认为当前文件所在目录
 
@@ -1,21 +1,19 @@
 #!/usr/bin/env python3
 """简洁的接口测试脚本"""
 import sys
-sys.path.insert(0, 'src')
+from concurrent.futures import ThreadPoolExecutor
+if 'src' not in sys.path:
+    sys.path.insert(0, 'src')
 
-def test_interface(name, test_func):
-    """测试单个接口"""
+def test_interface(test_func):
+    """测试单个接口，返回 (是否成功, 失败原因)"""
     try:
         result = test_func()
         if result:
-            print(f"  [OK] {name}")
-            return True
-        else:
-            print(f"  [FAIL] {name} - 返回数据异常")
-            return False
+            return True, ""
+        return False, "返回数据异常"
     except Exception as e:
-        print(f"  [FAIL] {name} - {str(e)[:50]}")
-        return False
+        return False, str(e)[:50]
 
 def main():
     print("=" * 60)
@@ -32,11 +30,6 @@ def main():
                               start_date='20240101', end_date='20240131')
         return df is not None and not df.empty
 
-    if test_interface("1. fetch_market_data", test1):
-        success.append("fetch_market_data")
-    else:
-        failed.append("fetch_market_data")
-
     # 2. calculate_technical_indicators
     def test2():
         import pandas as pd
@@ -54,22 +47,12 @@ def main():
         result = calculate_technical_indicators(df)
         return 'ma5' in result.columns
 
-    if test_interface("2. calculate_technical_indicators", test2):
-        success.append("calculate_technical_indicators")
-    else:
-        failed.append("calculate_technical_indicators")
-
     # 3. analyze_stock
     def test3():
         from openclaw_stock import analyze_stock
         result = analyze_stock('000001', market='sz')
         return result and 'symbol' in result
 
-    if test_interface("3. analyze_stock", test3):
-        success.append("analyze_stock")
-    else:
-        failed.append("analyze_stock")
-
     # 4. calculate_support_resistance
     def test4():
         import pandas as pd
@@ -88,10 +71,23 @@ def main():
         result = calculate_support_resistance('000001', df, method='fibonacci')
         return 'support_levels' in result
 
-    if test_interface("4. calculate_support_resistance", test4):
-        success.append("calculate_support_resistance")
-    else:
-        failed.append("calculate_support_resistance")
+    # 各接口测试相互独立且以网络请求为主，并发执行，总耗时取决于最慢的一个
+    cases = [
+        ("1. fetch_market_data", "fetch_market_data", test1),
+        ("2. calculate_technical_indicators", "calculate_technical_indicators", test2),
+        ("3. analyze_stock", "analyze_stock", test3),
+        ("4. calculate_support_resistance", "calculate_support_resistance", test4),
+    ]
+    with ThreadPoolExecutor(max_workers=len(cases)) as executor:
+        outcomes = list(executor.map(lambda case: test_interface(case[2]), cases))
+
+    for (label, name, _), (ok, reason) in zip(cases, outcomes):
+        if ok:
+            print(f"  [OK] {label}")
+            success.append(name)
+        else:
+            print(f"  [FAIL] {label} - {reason}")
+            failed.append(name)
 
     # 输出结果
     print()
@@ -230,6 +230,35 @@ class TestWebQuoteValidatorMock:
         assert result['price'] == 10.25
         mock_fetch.assert_called_once()
 
+    def test_async_multi_source_with_mock(self):
+        """使用 Mock 测试异步多数据源并发获取"""
+        import asyncio
+        pytest.importorskip("aiohttp")
+        from openclaw_stock.tools.web_quote_validator import (
+            WebQuoteValidator,
+            web_quote_validator_tool_async,
+        )
+        from openclaw_stock.core.exceptions import NetworkError
+
+        async def fake_fetch(self, symbol, market, session):
+            if self.source == "tencent":
+                raise NetworkError("连接失败")
+            price = 10.25 if self.source == "eastmoney" else 10.27
+            return {"source": self.source, "symbol": symbol, "market": market,
+                    "name": "平安银行", "price": price}
+
+        with patch.object(WebQuoteValidator, "get_realtime_quote_async", fake_fetch):
+            result = asyncio.run(web_quote_validator_tool_async(
+                symbol="000001",
+                market="sz",
+                reference_price=10.26
+            ))
+
+        assert result["source"] == "eastmoney"
+        assert result["cross_check"]["sina"]["price"] == 10.27
+        assert "tencent" in result["errors"]
+        assert result["validation"]["is_valid"] is True
+
 
 if __name__ == '__main__':
     # 直接运行测试
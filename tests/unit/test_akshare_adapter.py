@@ -0,0 +1,80 @@
+"""
+AkShare 适配器测试
+
+使用 Mock 的 akshare 模块测试 AKShareAdapter。
+"""
+
+import pytest
+import pandas as pd
+from unittest.mock import MagicMock, patch
+
+from openclaw_stock.adapters.akshare_adapter import AKShareAdapter, reset_adapter
+from openclaw_stock.core.exceptions import DataSourceError
+
+
+@pytest.fixture(autouse=True)
+def fresh_singleton():
+    """每个测试使用新的适配器单例"""
+    reset_adapter()
+    yield
+    reset_adapter()
+
+
+@pytest.mark.unit
+class TestAKShareAdapter:
+    """AKShareAdapter 单元测试"""
+
+    def test_requires_akshare(self):
+        """akshare 不可用时构造失败"""
+        with patch.object(AKShareAdapter, "_ak", None):
+            with pytest.raises(DataSourceError):
+                AKShareAdapter()
+
+    def test_methods_use_class_level_module(self):
+        """各方法直接使用类级别的 akshare 模块"""
+        fake_ak = MagicMock()
+        fake_ak.stock_zh_a_spot_em.return_value = pd.DataFrame({"代码": ["000001"]})
+        fake_ak.stock_fund_flow_individual.return_value = pd.DataFrame()
+
+        with patch.object(AKShareAdapter, "_ak", fake_ak):
+            adapter = AKShareAdapter()
+            assert len(adapter.get_stock_zh_a_spot()) == 1
+            adapter.get_stock_fund_flow_individual("600000")
+
+        fake_ak.stock_fund_flow_individual.assert_called_once_with(symbol="sh600000")
+
+    def test_hist_variants_bind_period_and_adjust(self):
+        """K线请求使用预绑定的周期与复权参数，未知周期回退为日线"""
+        fake_ak = MagicMock()
+        fake_ak.stock_zh_a_hist.return_value = pd.DataFrame({"收盘": [10.0]})
+
+        with patch.object(AKShareAdapter, "_ak", fake_ak):
+            adapter = AKShareAdapter()
+            adapter.get_stock_zh_a_hist("000001", period="weekly", adjust="hfq",
+                                        start_date="20240101", end_date="20240131")
+            adapter.get_stock_zh_a_hist("000001", period="5min",
+                                        start_date="20240101", end_date="20240131")
+
+        first, second = fake_ak.stock_zh_a_hist.call_args_list
+        assert first.kwargs == {"symbol": "000001", "period": "weekly", "adjust": "hfq",
+                                "start_date": "20240101", "end_date": "20240131"}
+        assert second.kwargs["period"] == "daily"
+        assert second.kwargs["adjust"] == "qfq"
+
+    def test_hist_default_start_uses_lookback(self):
+        """未指定开始日期时按回看天数请求，而非完整历史"""
+        from datetime import datetime, timedelta
+
+        fake_ak = MagicMock()
+        fake_ak.stock_zh_a_hist.return_value = pd.DataFrame({"收盘": [10.0]})
+        fake_ak.stock_hk_hist.return_value = pd.DataFrame({"收盘": [300.0]})
+
+        with patch.object(AKShareAdapter, "_ak", fake_ak):
+            adapter = AKShareAdapter()
+            adapter.get_stock_zh_a_hist("000001")
+            adapter.get_stock_hk_hist("00700", lookback_days=90)
+
+        expected = datetime.now() - timedelta(days=AKShareAdapter.DEFAULT_LOOKBACK_DAYS)
+        assert fake_ak.stock_zh_a_hist.call_args.kwargs["start_date"] == expected.strftime("%Y%m%d")
+        expected = datetime.now() - timedelta(days=90)
+        assert fake_ak.stock_hk_hist.call_args.kwargs["start_date"] == expected.strftime("%Y%m%d")
@@ -0,0 +1,399 @@
+"""
+东方财富适配器测试
+
+使用 Mock 的 akshare 模块测试适配器的进程内 TTL 缓存。
+"""
+
+import pytest
+import pandas as pd
+from unittest.mock import MagicMock, patch
+
+from openclaw_stock.adapters.akshare_adapter_em import (
+    AKShareAdapterEM,
+    batch_format_symbols,
+    pooled_requests,
+    reset_adapter_em,
+)
+
+
+@pytest.fixture(autouse=True)
+def fresh_singleton():
+    """每个测试使用新的适配器单例"""
+    reset_adapter_em()
+    yield
+    reset_adapter_em()
+
+
+@pytest.fixture
+def adapter():
+    """创建不依赖真实 akshare 的适配器"""
+    with patch.object(AKShareAdapterEM, "_import_akshare"):
+        instance = AKShareAdapterEM()
+    instance._ak = MagicMock()
+    instance._ak.stock_zh_a_spot_em.return_value = pd.DataFrame(
+        {"代码": ["000001"], "最新价": [10.25]}
+    )
+    instance._ak.stock_zh_a_hist.return_value = pd.DataFrame({"收盘": [10.0, 10.2]})
+    return instance
+
+
+@pytest.mark.unit
+class TestAKShareAdapterEMCache:
+    """AKShareAdapterEM 缓存单元测试"""
+
+    def test_spot_cached_within_ttl(self, adapter):
+        """有效期内重复获取行情只请求一次"""
+        first = adapter.get_stock_zh_a_spot()
+        second = adapter.get_stock_zh_a_spot()
+
+        assert adapter._ak.stock_zh_a_spot_em.call_count == 1
+        assert first.equals(second)
+
+    def test_cached_copy_is_isolated(self, adapter):
+        """修改返回值不影响缓存"""
+        df = adapter.get_stock_zh_a_spot()
+        df["最新价"] = 0
+
+        assert adapter.get_stock_zh_a_spot()["最新价"].iloc[0] == 10.25
+
+    def test_expired_entry_refetches(self, adapter):
+        """过期或清空后重新请求"""
+        adapter.CACHE_TTL = {**AKShareAdapterEM.CACHE_TTL, "spot": 0}
+        adapter.get_stock_zh_a_spot()
+        adapter.get_stock_zh_a_spot()
+        assert adapter._ak.stock_zh_a_spot_em.call_count == 2
+
+        adapter.CACHE_TTL = AKShareAdapterEM.CACHE_TTL
+        adapter.clear_cache()
+        adapter.get_stock_zh_a_spot()
+        assert adapter._ak.stock_zh_a_spot_em.call_count == 3
+
+    def test_hist_keyed_by_arguments(self, adapter):
+        """K线缓存按参数区分"""
+        adapter.get_stock_zh_a_hist("000001", start_date="20240101", end_date="20240131")
+        adapter.get_stock_zh_a_hist("000001", start_date="20240101", end_date="20240131")
+        adapter.get_stock_zh_a_hist("600000", start_date="20240101", end_date="20240131")
+
+        assert adapter._ak.stock_zh_a_hist.call_count == 2
+
+    def test_cache_bounded_lru(self, adapter):
+        """超出条目上限时淘汰最久未使用的条目"""
+        adapter.CACHE_MAX_ENTRIES = 2
+        for symbol in ("000001", "600000"):
+            adapter.get_stock_zh_a_hist(symbol, start_date="20240101", end_date="20240131")
+        adapter.get_stock_zh_a_hist("000001", start_date="20240101", end_date="20240131")
+        adapter.get_stock_zh_a_hist("300750", start_date="20240101", end_date="20240131")
+
+        assert len(adapter._cache) == 2
+        adapter.get_stock_zh_a_hist("000001", start_date="20240101", end_date="20240131")
+        assert adapter._ak.stock_zh_a_hist.call_count == 3
+        adapter.get_stock_zh_a_hist("600000", start_date="20240101", end_date="20240131")
+        assert adapter._ak.stock_zh_a_hist.call_count == 4
+
+    def test_hist_default_start_uses_lookback(self, adapter):
+        """未指定开始日期时按回看天数请求，而非完整历史"""
+        from datetime import datetime, timedelta
+
+        adapter.get_stock_zh_a_hist("000001")
+        adapter.get_stock_zh_a_hist("000001", lookback_days=90)
+
+        first, second = adapter._ak.stock_zh_a_hist.call_args_list
+        expected = datetime.now() - timedelta(days=AKShareAdapterEM.DEFAULT_LOOKBACK_DAYS)
+        assert first.kwargs["start_date"] == expected.strftime("%Y%m%d")
+        expected = datetime.now() - timedelta(days=90)
+        assert second.kwargs["start_date"] == expected.strftime("%Y%m%d")
+
+
+@pytest.mark.unit
+class TestAKShareAdapterEMBatch:
+    """AKShareAdapterEM 异步批量请求单元测试"""
+
+    def test_batch_hist_collects_errors(self, adapter):
+        """单只股票失败时返回异常，其余正常返回"""
+        import asyncio
+
+        def fake_hist(symbol, **kwargs):
+            if symbol == "999999":
+                raise ValueError("no data")
+            return pd.DataFrame({"收盘": [10.0]})
+
+        adapter._ak.stock_zh_a_hist.side_effect = fake_hist
+        result = asyncio.run(adapter.batch_hist(
+            ["000001", "600000", "999999"],
+            max_concurrency=2,
+            start_date="20240101",
+            end_date="20240131"
+        ))
+
+        assert list(result) == ["000001", "600000", "999999"]
+        assert isinstance(result["000001"], pd.DataFrame)
+        assert isinstance(result["999999"], Exception)
+
+    def test_batch_fund_flow_mixed_prefixes(self, adapter):
+        """带前缀与不带前缀的同一代码只请求一次，结果按原始代码对应"""
+        import asyncio
+
+        frames = {}
+
+        def fake_fund_flow(symbol, **kwargs):
+            frames[symbol] = pd.DataFrame({"主力净流入": [1.0]})
+            return frames[symbol]
+
+        with patch.object(adapter, "get_stock_fund_flow_individual", side_effect=fake_fund_flow):
+            result = asyncio.run(adapter.batch_fund_flow(["000001", "sz000001", "600000"]))
+
+        assert sorted(frames) == ["sh600000", "sz000001"]
+        assert list(result) == ["000001", "sz000001", "600000"]
+        assert result["000001"] is frames["sz000001"]
+        assert result["sz000001"] is frames["sz000001"]
+        assert result["600000"] is frames["sh600000"]
+
+
+@pytest.mark.unit
+class TestAKShareAdapterEMReturnType:
+    """AKShareAdapterEM 返回类型单元测试"""
+
+    def test_invalid_return_type(self):
+        """不支持的返回类型抛出异常"""
+        with patch.object(AKShareAdapterEM, "_import_akshare"):
+            with pytest.raises(ValueError):
+                AKShareAdapterEM(return_type="arrow")
+
+    def test_polars_output(self):
+        """return_type='polars' 时返回 polars.DataFrame"""
+        pl = pytest.importorskip("polars")
+        pytest.importorskip("pyarrow")
+
+        with patch.object(AKShareAdapterEM, "_import_akshare"):
+            instance = AKShareAdapterEM(return_type="polars")
+        instance._ak = MagicMock()
+        instance._ak.stock_zh_a_spot_em.return_value = pd.DataFrame(
+            {"代码": ["000001"], "最新价": [10.25]}
+        )
+
+        df = instance.get_stock_zh_a_spot()
+        assert isinstance(df, pl.DataFrame)
+        assert df["最新价"][0] == 10.25
+
+
+@pytest.mark.unit
+class TestAKShareAdapterEMSymbol:
+    """AKShareAdapterEM 代码格式化单元测试"""
+
+    def test_format_hk_symbol(self, adapter):
+        """港股去除前导零，非数字代码原样返回"""
+        assert adapter._format_symbol_for_em("00700", "hk") == "700"
+        assert adapter._format_symbol_for_em("00000", "hk") == "0"
+        assert adapter._format_symbol_for_em("HSI", "hk") == "HSI"
+        assert adapter._format_symbol_for_em("000001", "sz") == "000001"
+
+    def test_batch_format_symbols(self):
+        """批量添加交易所前缀"""
+        assert batch_format_symbols(["600000", "000001", " sz300750 ", "sh688001"]) == [
+            "sh600000", "sz000001", "sz300750", "sh688001"
+        ]
+        assert batch_format_symbols([]) == []
+
+
+@pytest.mark.unit
+class TestAKShareAdapterEMSingleton:
+    """AKShareAdapterEM 单例单元测试"""
+
+    def test_same_instance_per_return_type(self, adapter):
+        """重复构造返回同一实例且保留缓存"""
+        adapter.get_stock_zh_a_spot()
+
+        again = AKShareAdapterEM()
+        assert again is adapter
+        again.get_stock_zh_a_spot()
+        assert adapter._ak.stock_zh_a_spot_em.call_count == 1
+
+    def test_failed_init_not_registered(self):
+        """初始化失败不登记单例"""
+        with patch.object(AKShareAdapterEM, "_import_akshare", side_effect=RuntimeError("boom")):
+            with pytest.raises(RuntimeError):
+                AKShareAdapterEM()
+        assert AKShareAdapterEM._instances == {}
+
+
+@pytest.mark.unit
+class TestAKShareAdapterEMNarrowing:
+    """AKShareAdapterEM 列裁剪与降精度单元测试"""
+
+    def test_columns_and_downcast(self, adapter):
+        """只返回所需列并降低精度，缓存保持完整数据"""
+        adapter._ak.stock_zh_a_spot_em.return_value = pd.DataFrame({
+            "代码": ["000001", "600000"],
+            "名称": ["平安银行", "浦发银行"],
+            "最新价": [10.25, 8.10],
+            "成交额": [1.5e9, 8.0e8],
+        })
+
+        df = adapter.get_stock_zh_a_spot(columns=["代码", "最新价"], downcast=True)
+
+        assert list(df.columns) == ["代码", "最新价"]
+        assert df["最新价"].dtype == "float32"
+        assert df["代码"].dtype == "category"
+        assert df[df["代码"] == "600000"].shape[0] == 1
+
+        full = adapter.get_stock_zh_a_spot()
+        assert list(full.columns) == ["代码", "名称", "最新价", "成交额"]
+        assert full["最新价"].dtype == "float64"
+        assert adapter._ak.stock_zh_a_spot_em.call_count == 1
+
+
+@pytest.mark.unit
+class TestPooledRequests:
+    """pooled_requests 单元测试"""
+
+    def test_patch_and_restore(self):
+        """上下文内 requests.get 使用连接池会话，嵌套退出后恢复"""
+        import requests
+
+        original_get = requests.get
+        with pooled_requests() as session:
+            assert requests.get == session.get
+            with pooled_requests():
+                assert requests.get == session.get
+            assert requests.get == session.get
+        assert requests.get is original_get
+
+    def test_fetch_runs_inside_pool(self, adapter):
+        """akshare 调用期间 requests.get 指向连接池会话"""
+        import requests
+
+        seen = []
+        adapter._ak.stock_zh_a_spot_em.side_effect = lambda: (
+            seen.append(requests.get), pd.DataFrame({"代码": ["000001"]})
+        )[1]
+
+        with pooled_requests() as session:
+            pass
+        original_get = requests.get
+        adapter.get_stock_zh_a_spot()
+
+        assert seen == [session.get]
+        assert requests.get is original_get
+
+
+@pytest.mark.unit
+class TestAKShareAdapterEMKlinePersistence:
+    """AKShareAdapterEM 日K线磁盘缓存单元测试"""
+
+    @staticmethod
+    def _bars(dates):
+        return pd.DataFrame({"日期": dates, "收盘": [float(i) for i in range(len(dates))]})
+
+    def test_incremental_update(self, adapter, tmp_path):
+        """已缓存区间不再请求，只从最后一天增量获取"""
+        pytest.importorskip("pyarrow")
+        adapter._kline_dir = tmp_path
+        adapter._ak.stock_zh_a_hist.side_effect = [
+            self._bars(["2024-01-02", "2024-01-03", "2024-01-04"]),
+            self._bars(["2024-01-04", "2024-01-05"]),
+        ]
+
+        first = adapter.get_stock_zh_a_hist("000001", start_date="20240101",
+                                            end_date="20240104", adjust="")
+        assert len(first) == 3
+        assert (tmp_path / "000001_daily_none.feather").exists()
+
+        adapter.clear_cache()
+        second = adapter.get_stock_zh_a_hist("000001", start_date="20240103",
+                                             end_date="20240105", adjust="")
+
+        delta_call = adapter._ak.stock_zh_a_hist.call_args_list[1]
+        assert delta_call.kwargs["start_date"] == "20240104"
+        assert list(second["日期"]) == ["2024-01-03", "2024-01-04", "2024-01-05"]
+
+    def test_qfq_not_persisted(self, adapter, tmp_path):
+        """前复权数据不写入磁盘"""
+        adapter._kline_dir = tmp_path
+        adapter.get_stock_zh_a_hist("000001", start_date="20240101", end_date="20240131")
+
+        assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.unit
+class TestAKShareAdapterEMArrow:
+    """AKShareAdapterEM Arrow 输出单元测试"""
+
+    def test_fund_flow_arrow(self, adapter):
+        """return_arrow=True 时返回 pyarrow.Table"""
+        pa = pytest.importorskip("pyarrow")
+        adapter._ak.stock_fund_flow_individual.return_value = pd.DataFrame(
+            {"主力净流入": [1.5e7, -2.0e6]}
+        )
+
+        table = adapter.get_stock_fund_flow_individual("000001", return_arrow=True)
+
+        assert isinstance(table, pa.Table)
+        assert table.column("主力净流入").to_pylist() == [1.5e7, -2.0e6]
+
+
+@pytest.mark.unit
+class TestAKShareAdapterEMFundFlowRank:
+    """AKShareAdapterEM 全市场资金流向单元测试"""
+
+    def test_symbols_sliced_from_single_request(self, adapter):
+        """多只股票共用一次全市场请求，缺失代码整行为空"""
+        adapter._ak.stock_individual_fund_flow_rank.return_value = pd.DataFrame({
+            "代码": ["000001", "600000", "300750"],
+            "今日主力净流入-净额": [1.0e7, -5.0e6, 2.0e6],
+        })
+
+        df = adapter.get_fund_flow_for_symbols(["600000", "000001", "999999"])
+        adapter.get_fund_flow_for_symbols(["300750"])
+
+        assert list(df.index) == ["600000", "000001", "999999"]
+        assert df.loc["000001", "今日主力净流入-净额"] == 1.0e7
+        assert pd.isna(df.loc["999999", "今日主力净流入-净额"])
+        adapter._ak.stock_individual_fund_flow_rank.assert_called_once_with(indicator="今日")
+
+    def test_symbols_sliced_polars(self):
+        """return_type='polars' 时同样按代码切片，代码为首列"""
+        pl = pytest.importorskip("polars")
+        pytest.importorskip("pyarrow")
+
+        with patch.object(AKShareAdapterEM, "_import_akshare"):
+            instance = AKShareAdapterEM(return_type="polars")
+        instance._ak = MagicMock()
+        instance._ak.stock_individual_fund_flow_rank.return_value = pd.DataFrame({
+            "代码": ["000001", "600000"],
+            "今日主力净流入-净额": [1.0e7, -5.0e6],
+        })
+
+        df = instance.get_fund_flow_for_symbols(["600000", "999999", "000001"])
+
+        assert isinstance(df, pl.DataFrame)
+        assert df["代码"].to_list() == ["600000", "999999", "000001"]
+        assert df["今日主力净流入-净额"].to_list() == [-5.0e6, None, 1.0e7]
+
+
+@pytest.mark.unit
+class TestAKShareAdapterEMOhlcv:
+    """AKShareAdapterEM OHLCV 数组单元测试"""
+
+    def test_ohlcv_array(self, adapter):
+        """返回 float64 数组，单列连续且结果被缓存"""
+        import numpy as np
+
+        adapter._ak.stock_zh_a_hist.return_value = pd.DataFrame({
+            "日期": ["2024-01-02", "2024-01-03"],
+            "开盘": ["10.0", "10.1"],
+            "最高": [10.5, 10.6],
+            "最低": [9.8, 9.9],
+            "收盘": [10.2, 10.4],
+            "成交量": [120000, 98000],
+        })
+
+        arr = adapter.get_ohlcv_array("000001", start_date="20240101")
+        again = adapter.get_ohlcv_array("000001", start_date="20240101")
+
+        assert arr.shape == (2, 5)
+        assert arr.dtype == np.float64
+        assert arr[:, 3].flags.c_contiguous
+        assert arr[0, 0] == 10.0
+        assert again is arr
+        assert not arr.flags.writeable
+        assert adapter._ak.stock_zh_a_hist.call_count == 1
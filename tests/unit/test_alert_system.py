@@ -0,0 +1,365 @@
+"""
+预警系统测试
+
+使用 Mock 的 akshare 模块测试 AlertSystem 的监控逻辑。
+"""
+
+import dataclasses
+
+import pytest
+import pandas as pd
+from unittest.mock import MagicMock, patch
+
+from openclaw_stock.alert import alert_system
+from openclaw_stock.alert.alert_system import AlertSystem, AlertStatus
+
+
+@pytest.fixture
+def fake_ak():
+    """全市场行情只包含三只股票的 akshare"""
+    ak = MagicMock()
+    ak.stock_zh_a_spot_em.return_value = pd.DataFrame({
+        "代码": ["000001", "600000", "601318"],
+        "名称": ["平安银行", "浦发银行", "中国平安"],
+        "最新价": [12.5, 7.8, 45.0],
+        "成交量": [1200000, 800000, 600000],
+    })
+    with patch.object(alert_system, "ak", ak):
+        yield ak
+
+
+@pytest.mark.unit
+class TestAlertSystemMonitor:
+    """AlertSystem 监控单元测试"""
+
+    def test_one_spot_request_per_cycle(self, fake_ak):
+        """一轮检查只请求一次全市场行情"""
+        system = AlertSystem()
+        above = system.setup_alert("000001", "price", {"operator": "above", "value": 12.0})
+        below = system.setup_alert("600000", "price", {"operator": "below", "value": 7.0})
+        missing = system.setup_alert("300750", "price", {"operator": "above", "value": 1.0})
+
+        with patch.object(system, "_send_notification") as notify:
+            system._check_all_alerts()
+
+        assert fake_ak.stock_zh_a_spot_em.call_count == 1
+        assert system.alerts[above].status == AlertStatus.TRIGGERED
+        assert system.alerts[below].status == AlertStatus.ACTIVE
+        assert system.alerts[missing].status == AlertStatus.ACTIVE
+        notify.assert_called_once()
+
+    def test_quote_fields(self, fake_ak):
+        """批量报价字段与 fetch_realtime_quote 一致，缺失列补零"""
+        quotes = AlertSystem()._fetch_quotes_batch(["600000"])
+
+        assert list(quotes) == ["600000"]
+        quote = quotes["600000"]
+        assert quote["name"] == "浦发银行"
+        assert quote["price"] == 7.8
+        assert quote["volume"] == 800000
+        assert quote["pre_close"] == 0
+
+    def test_notifications_sent_concurrently(self, fake_ak):
+        """同一轮触发的多条预警都会发送通知"""
+        import threading
+
+        system = AlertSystem()
+        ids = [
+            system.setup_alert("000001", "price", {"operator": "above", "value": 12.0}),
+            system.setup_alert("600000", "volume", {"operator": "above", "value": 1000}),
+        ]
+
+        threads = set()
+        with patch.object(system, "_send_notification",
+                          side_effect=lambda alert: threads.add(threading.current_thread().name)) as notify:
+            system._check_all_alerts()
+
+        assert notify.call_count == 2
+        assert all(name.startswith("alert-notify") for name in threads)
+        assert all(system.alerts[i].status == AlertStatus.TRIGGERED for i in ids)
+
+    def test_expired_and_removed_alerts_not_checked(self, fake_ak):
+        """到期预警标记为过期，移除或触发后不再参与检查"""
+        import time
+
+        system = AlertSystem()
+        expired = system.setup_alert("000001", "price", {"operator": "above", "value": 99.0},
+                                     expires_in_hours=1)
+        removed = system.setup_alert("600000", "price", {"operator": "above", "value": 1.0},
+                                     expires_in_hours=1)
+        system.remove_alert(removed)
+
+        system._expire_due(time.time() + 2 * 3600)
+        system._check_all_alerts()
+
+        assert system.alerts[expired].status == AlertStatus.EXPIRED
+        assert system._by_symbol == {}
+        fake_ak.stock_zh_a_spot_em.assert_not_called()
+
+    def test_vectorized_and_scalar_paths(self, fake_ak):
+        """价格/成交量阈值条件走批量比较，其余运算符逐个检查，结果一致"""
+        system = AlertSystem()
+        above = system.setup_alert("000001", "price", {"operator": "above", "value": 12.0})
+        vol_below = system.setup_alert("600000", "volume", {"operator": "below", "value": 900000})
+        between = system.setup_alert("600000", "price",
+                                     {"operator": "between", "value": 7.0, "value2": 8.0})
+        untouched = system.setup_alert("000001", "volume", {"operator": "above", "value": 5e6})
+        equals = system.setup_alert("601318", "price", {"operator": "equals", "value": 44.995})
+        no_upper = system.setup_alert("300750", "price", {"operator": "between", "value": 1.0})
+        surge = system.setup_alert("300750", "volume", {"operator": "sudden_increase", "value": 2.0})
+
+        system._rebuild_condition_arrays()
+        assert set(system._condition_arrays) == {
+            (alert_system.AlertType.PRICE, alert_system.AlertOperator.ABOVE),
+            (alert_system.AlertType.PRICE, alert_system.AlertOperator.BETWEEN),
+            (alert_system.AlertType.PRICE, alert_system.AlertOperator.EQUALS),
+            (alert_system.AlertType.VOLUME, alert_system.AlertOperator.ABOVE),
+            (alert_system.AlertType.VOLUME, alert_system.AlertOperator.BELOW),
+        }
+        assert system._scalar_by_symbol == {"300750": [surge]}
+
+        with patch.object(system, "_send_notification"):
+            system._check_all_alerts()
+
+        statuses = {i: system.alerts[i].status
+                    for i in (above, vol_below, between, untouched, equals, no_upper)}
+        assert statuses == {
+            above: AlertStatus.TRIGGERED,
+            vol_below: AlertStatus.TRIGGERED,
+            between: AlertStatus.TRIGGERED,
+            untouched: AlertStatus.ACTIVE,
+            equals: AlertStatus.TRIGGERED,
+            no_upper: AlertStatus.ACTIVE,
+        }
+        assert system._arrays_dirty
+
+
+@pytest.mark.unit
+class TestIndicatorKernels:
+    """技术指标流式更新单元测试"""
+
+    def test_streaming_matches_batch(self):
+        """递推得到的 MACD 与布林带和整段重算一致"""
+        import numpy as np
+        from openclaw_stock.alert._indicators_nb import macd_update, seed_state
+        from openclaw_stock.analysis.technical_analysis import (
+            calculate_bollinger_bands,
+            calculate_macd,
+        )
+
+        closes = 10 + np.cumsum(np.random.default_rng(0).normal(0, 0.2, 120))
+        price = closes[-1] * 1.01
+        state = seed_state(closes, 6, 20)
+
+        _, _, _, _, hist = macd_update(state[1], state[2], state[3], price)
+        full = pd.Series(np.append(closes, price))
+        assert hist == pytest.approx(calculate_macd(full)[2].iloc[-1])
+
+        count, total, total_sq = state[7:]
+        mid = (total + price) / (count + 1)
+        std = ((total_sq + price * price - (count + 1) * mid * mid) / count) ** 0.5
+        upper, expected_mid, _ = calculate_bollinger_bands(full)
+        assert mid == pytest.approx(expected_mid.iloc[-1])
+        assert mid + 2 * std == pytest.approx(upper.iloc[-1])
+
+    def test_macd_golden_cross_alert(self, fake_ak):
+        """技术指标预警用历史K线初始化，每天只初始化一次"""
+        history = pd.DataFrame({
+            "date": pd.date_range(end=pd.Timestamp.now().normalize() - pd.Timedelta(days=1),
+                                  periods=60).strftime("%Y-%m-%d"),
+            "close": [20.0 - 0.1 * i for i in range(60)],
+        })
+        system = AlertSystem()
+        alert_id = system.setup_alert("000001", "technical",
+                                      {"indicator": "macd", "operator": "golden_cross"})
+
+        with patch.object(alert_system, "fetch_market_data", return_value=history) as fetch:
+            alert = system.alerts[alert_id]
+            assert not system._check_technical_condition(alert, {"price": 13.0})
+            assert system._check_technical_condition(alert, {"price": 30.0})
+
+        fetch.assert_called_once()
+        assert fetch.call_args.kwargs["market"] == "sz"
+        assert system._indicators.hist[system._indicators.rows[("000001", 26)]] < 0
+
+    def test_technical_alerts_share_state_rows(self, fake_ak):
+        """同一股票同一周期的预警共用一行状态，每轮批量计算"""
+        history = pd.DataFrame({
+            "date": pd.date_range(end=pd.Timestamp.now().normalize() - pd.Timedelta(days=1),
+                                  periods=60).strftime("%Y-%m-%d"),
+            "close": [20.0 - 0.1 * i for i in range(60)],
+        })
+        system = AlertSystem()
+        golden = system.setup_alert("600000", "technical",
+                                    {"indicator": "macd", "operator": "golden_cross"})
+        oversold = system.setup_alert("000001", "technical",
+                                      {"indicator": "rsi", "operator": "below", "value": 99.0})
+        # 同一秒内同股票同类型的预警ID相同，直接复制一个死叉预警
+        dead = dataclasses.replace(
+            system.alerts[golden], id="600000_dead",
+            condition=dataclasses.replace(system.alerts[golden].condition,
+                                          operator=alert_system.AlertOperator.DEAD_CROSS))
+        system.alerts[dead.id] = dead
+        system._by_symbol["600000"].add(dead.id)
+        system._indicators = alert_system.IndicatorState(capacity=1)
+
+        with patch.object(alert_system, "fetch_market_data", return_value=history) as fetch, \
+                patch.object(alert_system, "intraday_batch", wraps=alert_system.intraday_batch) as batch, \
+                patch.object(system, "_send_notification"):
+            system._check_all_alerts()
+
+        assert fetch.call_count == 2
+        batch.assert_called_once()
+        assert set(system._indicators.rows) == {("600000", 26), ("000001", 6)}
+        assert system.alerts[golden].status == AlertStatus.ACTIVE
+        assert system.alerts[dead.id].status == AlertStatus.ACTIVE
+        assert system.alerts[oversold].status == AlertStatus.TRIGGERED
+
+
+@pytest.mark.unit
+class TestAlertSystemConcurrency:
+    """AlertSystem 并发修改单元测试"""
+
+    def test_remove_during_check(self, fake_ak):
+        """行情请求期间移除或新增预警不影响本轮检查"""
+        system = AlertSystem()
+        removed = system.setup_alert("000001", "price", {"operator": "above", "value": 1.0})
+        added = []
+
+        original = system._fetch_quotes_batch
+
+        def fetch_and_mutate(symbols):
+            system.remove_alert(removed)
+            added.append(system.setup_alert("600000", "price", {"operator": "above", "value": 1.0}))
+            return original(symbols)
+
+        with patch.object(system, "_fetch_quotes_batch", side_effect=fetch_and_mutate), \
+                patch.object(system, "_send_notification") as notify:
+            system._check_all_alerts()
+
+        notify.assert_not_called()
+        assert removed not in system.alerts
+        assert system.alerts[added[0]].status == AlertStatus.ACTIVE
+        assert system._arrays_dirty
+
+
+@pytest.mark.unit
+class TestAlertCondition:
+    """预警条件单元测试"""
+
+    def test_operator_parsed_once(self):
+        """创建预警时把运算符转换为枚举，不支持的运算符直接报错"""
+        from openclaw_stock.alert.alert_system import AlertOperator
+        from openclaw_stock.core.exceptions import AlertError
+
+        system = AlertSystem()
+        alert_id = system.setup_alert("000001", "price", {"operator": "between", "value": 1, "value2": 2})
+        assert system.alerts[alert_id].condition.operator is AlertOperator.BETWEEN
+
+        with pytest.raises(AlertError):
+            system.setup_alert("000001", "price", {"operator": "sideways", "value": 1})
+        with pytest.raises(AlertError):
+            system.setup_alert("000001", "weather", {"operator": "above", "value": 1})
+
+    def test_standalone_checkers_use_dispatch_tables(self):
+        """PriceAlert/VolumeAlert/TechnicalAlert 按字符串运算符查表判断"""
+        from openclaw_stock.alert.alert_system import PriceAlert, TechnicalAlert, VolumeAlert
+
+        assert PriceAlert("000001", {"operator": "between", "value": 10, "value2": 12}).check({"price": 11})
+        assert not PriceAlert("000001", {"operator": "sideways", "value": 10}).check({"price": 11})
+        assert VolumeAlert("000001", {"operator": "sudden_increase", "value": 2}).check(
+            {"volume": 300, "avg_volume": 100})
+        boll = TechnicalAlert("000001", {"indicator": "boll", "operator": "breakout_down"})
+        assert boll.check({"price": 9.0, "indicators": {"boll_upper": 12.0, "boll_lower": 10.0}})
+        rsi = TechnicalAlert("000001", {"indicator": "rsi", "operator": "oversold"})
+        assert not rsi.check({"indicators": {"rsi6": 35.0}})
+
+    def test_list_alerts_filters_by_status(self):
+        """按状态过滤预警，未知状态返回空列表"""
+        system = AlertSystem()
+        active = system.setup_alert("000001", "price", {"operator": "above", "value": 1.0})
+        disabled = system.setup_alert("600000", "price", {"operator": "above", "value": 1.0})
+        system.alerts[disabled].status = AlertStatus.DISABLED
+
+        assert [a["id"] for a in system.list_alerts(status="active")] == [active]
+        assert system.list_alerts(status="disabled")[0]["status"] == "disabled"
+        assert system.list_alerts(status="unknown") == []
+
+        out = [{"stale": True}]
+        assert system.list_alerts(symbol="000001", out=out) is out
+        assert [a["id"] for a in out] == [active]
+
+    def test_market_inferred_from_code(self):
+        """创建预警时按代码首位推断交易所"""
+        assert [alert_system._infer_market(c) for c in ("600519", "688981", "000001", "300750", "830799", "430047")] \
+            == ["sh", "sh", "sz", "sz", "bj", "bj"]
+        system = AlertSystem()
+        alert_id = system.setup_alert("300750", "price", {"operator": "above", "value": 1.0})
+        assert system.alerts[alert_id].metadata["market"] == "sz"
+
+
+@pytest.mark.unit
+class TestModuleHelpers:
+    """模块级便利函数单元测试"""
+
+    def test_helpers_share_default_system(self):
+        """setup_alert/list_alerts/remove_alert 作用于同一个预警系统"""
+        with patch.object(alert_system, "_default_system", None):
+            alert_id = alert_system.setup_alert("000001", "price", {"operator": "above", "value": 1.0})
+
+            assert [a["id"] for a in alert_system.list_alerts()] == [alert_id]
+            assert alert_system.remove_alert(alert_id)
+            assert alert_system.list_alerts() == []
+
+
+@pytest.mark.unit
+class TestAlertSystemLifecycle:
+    """AlertSystem 监控线程启停单元测试"""
+
+    def test_stop_wakes_monitor_immediately(self, fake_ak):
+        """停止监控时不必等满检查间隔"""
+        system = AlertSystem()
+        system.check_interval = 3600
+        system.start_monitoring()
+
+        system.stop_monitoring()
+
+        assert not system.monitor_thread.is_alive()
+
+    def test_trading_time_windows(self):
+        """交易时段判断及非交易时段的等待时长"""
+        from datetime import datetime
+
+        friday_close = datetime(2024, 6, 7, 15, 0)
+        assert alert_system._is_trading_time(datetime(2024, 6, 7, 9, 30))
+        assert not alert_system._is_trading_time(datetime(2024, 6, 7, 12, 0))
+        assert not alert_system._is_trading_time(friday_close)
+        assert not alert_system._is_trading_time(datetime(2024, 6, 8, 10, 0))
+
+        assert alert_system._seconds_until_next_session(datetime(2024, 6, 7, 11, 45)) == 75 * 60
+        # 周五收盘后等到下周一 09:30
+        assert alert_system._seconds_until_next_session(friday_close) == (2 * 24 + 18.5) * 3600
+
+    def test_off_hours_loop_expires_alerts(self, fake_ak):
+        """非交易时段按北京时间判断，不请求行情但仍清理到期预警"""
+        import time
+
+        system = AlertSystem()
+        alert_id = system.setup_alert("000001", "price", {"operator": "above", "value": 99.0},
+                                      expires_in_hours=1)
+        system.running = True
+        seen = []
+
+        def off_hours(now):
+            seen.append(now)
+            return False
+
+        with patch.object(alert_system, "_is_trading_time", side_effect=off_hours), \
+                patch.object(alert_system.time, "time", return_value=time.time() + 2 * 3600), \
+                patch.object(system._stop_evt, "wait", return_value=True) as wait:
+            system._monitor_loop()
+
+        assert seen[0].utcoffset().total_seconds() == 8 * 3600
+        assert system.alerts[alert_id].status == AlertStatus.EXPIRED
+        fake_ak.stock_zh_a_spot_em.assert_not_called()
+        wait.assert_called_once()
@@ -0,0 +1,207 @@
+"""
+跨进程缓存模块测试
+
+使用内存中的假 Redis 客户端测试 redis_memoize 装饰器，
+使用临时目录测试 file_memoize 装饰器。
+"""
+
+import pandas as pd
+import pytest
+from unittest.mock import patch
+
+from openclaw_stock.utils import cache
+from openclaw_stock.utils.cache import FileCache, file_memoize, redis_memoize
+
+
+class FakeRedis:
+    """模拟 Redis 客户端（仅实现 get/set）"""
+
+    def __init__(self):
+        self.store = {}
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def set(self, key, value, ex=None):
+        self.store[key] = value
+
+
+@pytest.mark.unit
+class TestRedisMemoize:
+    """redis_memoize 单元测试"""
+
+    @pytest.fixture(autouse=True)
+    def reset_client(self):
+        """每个测试重置 Redis 客户端与冷却状态"""
+        cache.reset_redis_client()
+        yield
+        cache.reset_redis_client()
+
+    def test_passthrough_without_redis(self):
+        """未配置Redis时直接调用"""
+        calls = []
+
+        @redis_memoize(ttl=60)
+        def fetch(symbol):
+            calls.append(symbol)
+            return {"symbol": symbol}
+
+        with patch.object(cache, "get_redis_client", return_value=None):
+            fetch("000001")
+            fetch("000001")
+
+        assert calls == ["000001", "000001"]
+
+    def test_cache_hit(self):
+        """相同参数命中缓存，不同参数各自缓存"""
+        calls = []
+        client = FakeRedis()
+
+        @redis_memoize(ttl=60, action_ttl={"fundamental": 86400})
+        def fetch(action="realtime", symbol=""):
+            calls.append((action, symbol))
+            return {"symbol": symbol, "values": list(range(500))}
+
+        with patch.object(cache, "get_redis_client", return_value=client):
+            first = fetch("realtime", symbol="000001")
+            second = fetch(action="realtime", symbol="000001")
+            fetch("fundamental", "000001")
+
+        assert calls == [("realtime", "000001"), ("fundamental", "000001")]
+        assert first == second
+        assert len(client.store) == 2
+
+    def test_hit_matches_miss(self):
+        """未命中时返回与命中相同的 JSON 往返值"""
+
+        @redis_memoize(ttl=60)
+        def fetch(symbol):
+            return {"date": pd.Timestamp("2024-01-02"), "close": float("nan"), "volume": 100}
+
+        with patch.object(cache, "get_redis_client", return_value=FakeRedis()):
+            missed = fetch("000001")
+            hit = fetch("000001")
+
+        assert missed == hit
+        assert missed["date"].startswith("2024-01-02")
+        assert missed["volume"] == 100
+
+    def test_redis_error_falls_back(self):
+        """Redis读取异常时透传调用，冷却期内不再访问 Redis"""
+
+        class BrokenRedis(FakeRedis):
+            gets = 0
+
+            def get(self, key):
+                BrokenRedis.gets += 1
+                raise ConnectionError("redis down")
+
+        @redis_memoize(ttl=60)
+        def fetch(symbol):
+            return {"symbol": symbol}
+
+        client = BrokenRedis()
+        with patch.object(cache, "get_redis_client", return_value=client):
+            assert fetch("000001") == {"symbol": "000001"}
+            assert fetch("000001") == {"symbol": "000001"}
+            assert BrokenRedis.gets == 1
+
+            with patch.object(cache.time, "monotonic", return_value=cache.time.monotonic() + 31):
+                fetch("000001")
+            assert BrokenRedis.gets == 2
+
+
+@pytest.mark.unit
+class TestFileMemoize:
+    """file_memoize 单元测试"""
+
+    def test_cache_hit_and_expiry(self, tmp_path):
+        """有效期内读取文件，过期后重新调用"""
+        calls = []
+
+        @file_memoize("quote", ttl=60)
+        def fetch(symbol, market="sh"):
+            calls.append(symbol)
+            return {"symbol": symbol, "price": 10.5}
+
+        with patch.object(cache, "get_file_cache", return_value=FileCache(tmp_path)):
+            assert fetch("600000") == {"symbol": "600000", "price": 10.5}
+            assert fetch("600000", market="sh") == {"symbol": "600000", "price": 10.5}
+            assert calls == ["600000"]
+            assert len(list((tmp_path / "quote").glob("600000_*.json"))) == 1
+
+            with patch.object(cache.time, "time", return_value=cache.time.time() + 61):
+                fetch("600000")
+            assert calls == ["600000", "600000"]
+
+    def test_dataframe_round_trip(self, tmp_path):
+        """DataFrame 按原列类型还原（命中与未命中一致），空结果不缓存"""
+        frame = pd.DataFrame({
+            "date": ["2024-01-02", "2024-01-03"],
+            "time": pd.to_datetime(["2024-01-02 15:00", "2024-01-03 15:00"]),
+            "close": [10.0, 11.0],
+            "volume": pd.array([100, 200], dtype="int32"),
+        })
+        results = [pd.DataFrame(), frame]
+
+        @file_memoize("kline", ttl=60)
+        def fetch(symbol):
+            return results.pop(0)
+
+        with patch.object(cache, "get_file_cache", return_value=FileCache(tmp_path)):
+            assert fetch("000001").empty
+            missed = fetch("000001")
+            cached = fetch("000001")
+
+        assert results == []
+        assert cached.dtypes.to_dict() == missed.dtypes.to_dict()
+        pd.testing.assert_frame_equal(cached, frame)
+
+    def test_value_hit_matches_miss(self, tmp_path):
+        """非 DataFrame 结果未命中时也返回 JSON 往返后的值（NaN 为 None）"""
+
+        @file_memoize("quote", ttl=60)
+        def fetch(symbol):
+            return {"symbol": symbol, "price": float("nan"), "date": pd.Timestamp("2024-01-02")}
+
+        with patch.object(cache, "get_file_cache", return_value=FileCache(tmp_path)):
+            missed = fetch("000001")
+            hit = fetch("000001")
+
+        assert missed == hit
+        assert missed["price"] is None
+        assert missed["date"].startswith("2024-01-02")
+
+    def test_ttl_from_params(self, tmp_path):
+        """有效期可按调用参数决定"""
+        calls = []
+
+        @file_memoize("kline", ttl=lambda params: 60 if params["live"] else 3600)
+        def fetch(symbol, live=False):
+            calls.append(live)
+            return {"symbol": symbol}
+
+        later = cache.time.time() + 600
+        with patch.object(cache, "get_file_cache", return_value=FileCache(tmp_path)):
+            fetch("000001", live=True)
+            fetch("000001", live=False)
+            with patch.object(cache.time, "time", return_value=later):
+                fetch("000001", live=True)
+                fetch("000001", live=False)
+
+        assert calls == [True, False, True]
+
+    def test_passthrough_without_path(self, tmp_path):
+        """未配置 FILE_CACHE_PATH 时直接调用"""
+        calls = []
+
+        @file_memoize("quote", ttl=60)
+        def fetch(symbol):
+            calls.append(symbol)
+            return {"symbol": symbol}
+
+        with patch.object(cache, "get_file_cache", return_value=None):
+            fetch("000001")
+            fetch("000001")
+
+        assert calls == ["000001", "000001"]
@@ -0,0 +1,46 @@
+"""
+装饰器测试
+
+测试 retry 装饰器的退避与抖动行为。
+"""
+
+import pytest
+from unittest.mock import patch
+
+from openclaw_stock.utils.decorators import retry
+
+
+@pytest.mark.unit
+class TestRetry:
+    """retry 装饰器单元测试"""
+
+    def test_backoff_capped_with_jitter(self):
+        """延迟按系数增长、不超过上限，并叠加抖动"""
+        calls = []
+
+        @retry(max_attempts=4, delay=1.0, backoff=3.0, max_delay=2.0,
+               jitter=0.5, exceptions=(ConnectionError,))
+        def flaky():
+            calls.append(1)
+            if len(calls) < 4:
+                raise ConnectionError("reset")
+            return "ok"
+
+        with patch("openclaw_stock.utils.decorators.time.sleep") as sleep, \
+                patch("openclaw_stock.utils.decorators.random.uniform", return_value=0.25):
+            assert flaky() == "ok"
+
+        assert [c.args[0] for c in sleep.call_args_list] == [1.25, 2.25, 2.25]
+
+    def test_unlisted_exception_not_retried(self):
+        """不在 exceptions 中的异常直接抛出"""
+        calls = []
+
+        @retry(max_attempts=3, delay=0.0, exceptions=(ConnectionError,))
+        def broken():
+            calls.append(1)
+            raise ValueError("bad symbol")
+
+        with pytest.raises(ValueError):
+            broken()
+        assert len(calls) == 1
@@ -0,0 +1,259 @@
+"""
+基本面分析测试
+
+使用 Mock 的 akshare 模块测试基本面指标计算。
+"""
+
+from datetime import datetime
+import json
+
+import numpy as np
+import pytest
+import pandas as pd
+import requests
+from unittest.mock import MagicMock, patch
+
+from openclaw_stock.analysis import fundamental_analysis
+from openclaw_stock.analysis.fundamental_analysis import (
+    FundamentalAnalyzer,
+    FundamentalIndicatorsArray,
+    calculate_fundamental_indicators,
+    calculate_fundamental_indicators_batch,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_fundamental_cache():
+    """每个测试前后清空估值与财务摘要缓存"""
+    FundamentalAnalyzer.cache_clear()
+    yield
+    FundamentalAnalyzer.cache_clear()
+
+
+@pytest.fixture
+def fake_ak():
+    """返回单只股票估值与财务摘要的 akshare"""
+    ak = MagicMock()
+    ak.stock_a_lg_indicator.return_value = pd.DataFrame({
+        "市盈率(TTM)": [12.0],
+        "市净率": [1.5],
+        "总市值": [2.5e11],
+    })
+    ak.stock_zh_a_spot_em.return_value = pd.DataFrame({
+        "代码": ["000001", "600000"],
+        "市盈率-动态": [12.0, "-"],
+        "市净率": [1.5, 0.6],
+        "总市值": [2.5e11, 2.2e11],
+        "流通市值": [2.4e11, 2.2e11],
+    })
+    ak.stock_financial_abstract.return_value = pd.DataFrame({
+        "净资产收益率": [11.0, 10.5],
+        "销售净利率": [25.0, 24.0],
+        "净利润同比增长率": [24.0, 10.0],
+        "资产负债率": [90.0, 91.0],
+    })
+    with patch.object(fundamental_analysis, "ak", ak):
+        yield ak
+
+
+@pytest.mark.unit
+class TestCalculateFundamentalIndicators:
+    """calculate_fundamental_indicators 单元测试"""
+
+    def test_merges_both_sources(self, fake_ak):
+        """估值与财务摘要合并到同一结果，并计算 PEG"""
+        result = calculate_fundamental_indicators("000001")
+
+        assert result["valuation"]["pe_ttm"] == 12.0
+        assert result["valuation"]["peg"] == 0.5
+        assert result["market"]["market_cap"] == 2.5e11
+        assert result["profitability"]["net_margin"] == 25.0
+        assert result["profitability"]["roe"] == 11.0
+        assert result["quality"]["debt_ratio"] == 90.0
+        assert isinstance(result["timestamp"], float)
+
+    def test_failed_source_leaves_other_intact(self, fake_ak):
+        """单个数据源失败只影响对应部分"""
+        fake_ak.stock_a_lg_indicator.side_effect = ConnectionError("timeout")
+
+        result = calculate_fundamental_indicators("000001")
+
+        assert result["valuation"] == {}
+        assert result["growth"]["profit_growth"] == 24.0
+
+    def test_latest_rows_cached_per_symbol(self, fake_ak):
+        """同一天重复计算不重复请求，清除缓存后重新请求"""
+        calculate_fundamental_indicators("000001")
+        calculate_fundamental_indicators("000001")
+        calculate_fundamental_indicators("600000")
+
+        assert fake_ak.stock_a_lg_indicator.call_count == 2
+        assert fake_ak.stock_financial_abstract.call_count == 2
+
+        FundamentalAnalyzer.cache_clear()
+        calculate_fundamental_indicators("000001")
+        assert fake_ak.stock_a_lg_indicator.call_count == 3
+
+    def test_fetches_reuse_pooled_session(self, fake_ak):
+        """akshare 请求期间 requests.get 指向连接池会话，结束后恢复"""
+        pooled = []
+        frame = fake_ak.stock_financial_abstract.return_value
+
+        def record(symbol):
+            pooled.append(isinstance(getattr(requests.get, "__self__", None), requests.Session))
+            return frame
+
+        fake_ak.stock_a_lg_indicator.side_effect = record
+        fake_ak.stock_financial_abstract.side_effect = record
+        calculate_fundamental_indicators("000001")
+
+        assert pooled == [True, True]
+        assert not isinstance(getattr(requests.get, "__self__", None), requests.Session)
+
+    @pytest.mark.parametrize("value, expected", [
+        (12.5, 12.5), (np.float32(1.5), 1.5), ("3", 3.0),
+        (None, None), (float("nan"), None), (np.float32("nan"), None), ("-", None),
+    ])
+    def test_safe_float(self, value, expected):
+        """缺失、NaN 与无法解析的值统一返回 None"""
+        assert fundamental_analysis._safe_float({"pe": value}, "pe") == expected
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_to_json(self, fake_ak, use_orjson):
+        """结果可直接序列化，numpy 标量按数值输出"""
+        if use_orjson:
+            pytest.importorskip("orjson")
+        result = calculate_fundamental_indicators("000001")
+        result["valuation"]["ps"] = np.float32(2.5)
+
+        with patch.object(fundamental_analysis, "orjson", fundamental_analysis.orjson if use_orjson else None):
+            data = fundamental_analysis.to_json(result)
+
+        decoded = json.loads(data)
+        assert decoded["valuation"]["pe_ttm"] == 12.0
+        assert decoded["valuation"]["ps"] == 2.5
+        assert decoded["symbol"] == "000001"
+
+
+@pytest.mark.unit
+class TestCalculateFundamentalIndicatorsBatch:
+    """calculate_fundamental_indicators_batch 单元测试"""
+
+    def test_one_spot_request_for_all_symbols(self, fake_ak):
+        """估值来自一次全市场请求，PEG 按列计算，缺失股票为 NaN"""
+        df = calculate_fundamental_indicators_batch(["000001", "600000", "300750"])
+
+        fake_ak.stock_zh_a_spot_em.assert_called_once()
+        fake_ak.stock_a_lg_indicator.assert_not_called()
+        assert list(df.index) == ["000001", "600000", "300750"]
+        assert df.loc["000001", "peg"] == 0.5
+        assert pd.isna(df.loc["600000", "pe_ttm"]) and pd.isna(df.loc["600000", "peg"])
+        assert df.loc["600000", "pb"] == 0.6
+        assert pd.isna(df.loc["300750", "pb"])
+        assert df["timestamp"].nunique() == 1
+
+    def test_batch_result_feeds_batch_analysis(self, fake_ak):
+        """批量结果可直接交给 analyze_*_batch，与逐只计算后的分类一致（300750 不在行情中但有财务摘要）"""
+        analyzer = FundamentalAnalyzer()
+        df = calculate_fundamental_indicators_batch(["000001", "300750"])
+        arr = FundamentalIndicatorsArray.from_frame(df)
+
+        for source in (df, arr):
+            assert analyzer.analyze_valuation_batch(source).tolist() == ["fair", "unknown"]
+            assert analyzer.analyze_profitability_batch(source).tolist() == ["moderate", "moderate"]
+            assert analyzer.analyze_growth_batch(source).tolist() == ["moderate", "moderate"]
+        assert analyzer.analyze_profitability(calculate_fundamental_indicators("000001")) == "moderate"
+
+    def test_valuation_only(self, fake_ak):
+        """不获取财务摘要时只有估值与市值列"""
+        df = calculate_fundamental_indicators_batch(["000001"], include_finance=False)
+
+        fake_ak.stock_financial_abstract.assert_not_called()
+        assert list(df.columns) == ["pe_ttm", "pb", "market_cap", "float_market_cap", "timestamp"]
+
+
+@pytest.mark.unit
+class TestCalculateFundamentalIndicatorsLazy:
+    """calculate_fundamental_indicators_lazy 单元测试"""
+
+    def test_lazy_matches_batch(self, fake_ak):
+        """collect 后与 pandas 批量结果一致，派生列在 collect 前不计算"""
+        pl = pytest.importorskip("polars")
+        lf = fundamental_analysis.calculate_fundamental_indicators_lazy(["000001", "600000"])
+
+        assert isinstance(lf, pl.LazyFrame)
+        df = lf.filter(pl.col("pb") > 1).select("symbol", "peg").collect()
+        assert df.to_dicts() == [{"symbol": "000001", "peg": 0.5}]
+
+        rows = lf.collect().to_dicts()
+        assert rows[1]["pe_ttm"] is None and rows[1]["peg"] is None
+
+    def test_requires_polars(self, fake_ak):
+        """未安装 polars 时给出安装提示"""
+        with patch.object(fundamental_analysis, "pl", None):
+            with pytest.raises(ImportError):
+                fundamental_analysis.calculate_fundamental_indicators_lazy(["000001"])
+
+
+@pytest.mark.unit
+class TestFundamentalAnalyzerBatch:
+    """FundamentalAnalyzer 批量分类单元测试"""
+
+    def test_batch_matches_scalar(self):
+        """批量分类与逐只分类结果一致"""
+        analyzer = FundamentalAnalyzer()
+        df = pd.DataFrame({
+            "pe_ttm": [8.0, 60.0, 20.0, None, 9.0],
+            "pb": [0.8, 2.0, 2.0, 1.0, 6.0],
+            "roe": [20.0, 10.0, 5.0, None, 16.0],
+            "net_margin": [12.0, 5.0, 1.0, 3.0, 8.0],
+            "profit_growth": [40.0, 15.0, 5.0, None, 35.0],
+            "revenue_growth": [25.0, 10.0, 2.0, 1.0, 10.0],
+        }, index=["a", "b", "c", "d", "e"])
+
+        for symbol, row in df.iterrows():
+            values = {k: (None if pd.isna(v) else v) for k, v in row.items()}
+            indicators = {"valuation": values, "profitability": values, "growth": values}
+            assert analyzer.analyze_valuation_batch(df)[symbol] == analyzer.analyze_valuation(indicators)
+            assert analyzer.analyze_profitability_batch(df)[symbol] == analyzer.analyze_profitability(indicators)
+            assert analyzer.analyze_growth_batch(df)[symbol] == analyzer.analyze_growth(indicators)
+
+    def test_valuation_codes_fallback_matches(self):
+        """numpy 回退实现与当前内核的编码一致"""
+        from openclaw_stock.analysis import _valuation_nb
+
+        pe = np.array([8.0, 60.0, 20.0, np.nan, 9.0, 5.0])
+        pb = np.array([0.8, 2.0, 2.0, 1.0, 6.0, np.nan])
+
+        expected = [1, 3, 2, 0, 3, 0]
+        assert _valuation_nb._valuation_codes_numpy(pe, pb).tolist() == expected
+        assert _valuation_nb.valuation_codes(pe, pb).tolist() == expected
+
+    def test_indicator_array_round_trip(self):
+        """结构化数组按字段取列，可直接批量分类并还原单只指标"""
+        df = pd.DataFrame({"pe_ttm": [8.0, None], "pb": [0.8, 2.0], "unused": [1, 2]},
+                          index=["000001", "600000"])
+        arr = FundamentalIndicatorsArray.from_frame(df)
+
+        assert arr["pb"].dtype == np.float32 and arr["market_cap"].dtype == np.float64
+        assert arr["pb"].tolist() == pytest.approx([0.8, 2.0])
+        assert FundamentalAnalyzer().analyze_valuation_batch(arr).tolist() == ["undervalued", "unknown"]
+        indicators = arr.get("600000")
+        assert indicators.pb == 2.0 and indicators.pe_ttm is None and indicators.roe is None
+
+    def test_generate_report(self):
+        """报告填入各项指标，缺失项显示 N/A"""
+        report = FundamentalAnalyzer().generate_report("000001", {
+            "valuation": {"pe_ttm": 8.0, "pb": 0.8},
+            "growth": {"profit_growth": 12.0},
+            "timestamp": datetime(2024, 1, 2, 9, 30).timestamp(),
+        })
+
+        lines = report.split("\n")
+        assert lines[0] == "=== 000001 基本面分析报告 ==="
+        assert lines[1] == "数据时间: 2024-01-02T09:30:00"
+        assert "  PE(TTM): 8.0" in lines
+        assert "  估值水平: undervalued" in lines
+        assert "  ROE: N/A%" in lines
+        assert "  成长水平: moderate" in lines
+        assert lines[-1] == "=== 报告结束 ==="
@@ -0,0 +1,207 @@
+"""
+通知模块测试
+
+测试各通知器的消息构造，不发送真实请求。
+"""
+
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import smtplib
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from openclaw_stock.alert import notification
+from openclaw_stock.alert.notification import (
+    DingTalkNotifier,
+    EmailNotifier,
+    WeChatNotifier,
+    send_notifications_async,
+)
+
+
+def _response(payload):
+    """构造返回指定 JSON 的响应"""
+    response = MagicMock()
+    response.content = json.dumps(payload).encode("utf-8")
+    return response
+
+
+@pytest.mark.unit
+class TestDingTalkNotifier:
+    """DingTalkNotifier 单元测试"""
+
+    def test_sign_matches_reference(self):
+        """复用 HMAC 原型生成的签名与逐次计算一致"""
+        notifier = DingTalkNotifier({"webhook": "https://example.com/robot?access_token=x",
+                                     "secret": "SEC123"})
+
+        for timestamp in ("1700000000000", "1700000000001"):
+            expected = base64.b64encode(hmac.new(
+                b"SEC123", f"{timestamp}\nSEC123".encode("utf-8"), digestmod=hashlib.sha256
+            ).digest()).decode("utf-8")
+            assert notifier._generate_sign(timestamp) == expected
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_send_posts_utf8_json_body(self, use_orjson):
+        """请求体为 UTF-8 编码的 JSON 字节，未安装 orjson 时结果一致"""
+        session = MagicMock()
+        session.post.return_value = _response({"errcode": 0})
+        notifier = DingTalkNotifier({"webhook": "https://example.com/robot?access_token=x",
+                                     "secret": "SEC123"})
+
+        with patch.object(notification, "_SESSION", session), \
+                patch.object(notification, "orjson", notification.orjson if use_orjson else None):
+            assert notifier.send("价格突破", "股票预警")
+
+        kwargs = session.post.call_args.kwargs
+        assert kwargs["headers"]["Content-Type"].startswith("application/json")
+        assert json.loads(kwargs["data"].decode("utf-8"))["markdown"]["title"] == "股票预警"
+
+
+@pytest.mark.unit
+class TestWeChatNotifier:
+    """WeChatNotifier 单元测试"""
+
+    @pytest.fixture(autouse=True)
+    def clear_token_cache(self):
+        WeChatNotifier._token_cache.clear()
+        yield
+        WeChatNotifier._token_cache.clear()
+
+    def test_token_reused_across_instances(self):
+        """有效期内多次发送只获取一次 token，请求均带超时"""
+        session = MagicMock()
+        session.get.return_value = _response({"access_token": "T1", "expires_in": 7200})
+        session.post.return_value = _response({"errcode": 0})
+
+        with patch.object(notification, "_SESSION", session):
+            config = {"corpid": "c", "corpsecret": "s", "agentid": "1"}
+            assert WeChatNotifier(config).send("hello", "title")
+            assert WeChatNotifier(config).send("again")
+
+        assert session.get.call_count == 1
+        assert session.post.call_count == 2
+        assert all(c.kwargs["timeout"] == notification._REQUEST_TIMEOUT
+                   for c in session.get.call_args_list + session.post.call_args_list)
+
+    def test_expired_token_refreshed_once(self):
+        """token 失效错误码触发刷新并重发"""
+        session = MagicMock()
+        session.get.side_effect = [
+            _response({"access_token": "OLD", "expires_in": 7200}),
+            _response({"access_token": "NEW", "expires_in": 7200}),
+        ]
+        session.post.side_effect = [_response({"errcode": 42001}), _response({"errcode": 0})]
+
+        with patch.object(notification, "_SESSION", session):
+            assert WeChatNotifier({"corpid": "c", "corpsecret": "s"}).send("hello")
+
+        assert "access_token=NEW" in session.post.call_args_list[1].args[0]
+
+
+@pytest.mark.unit
+class TestEmailNotifier:
+    """EmailNotifier 单元测试"""
+
+    CONFIG = {"smtp_server": "smtp.example.com", "smtp_port": 465, "username": "u",
+              "password": "p", "from_addr": "a@example.com", "to_addrs": ["b@example.com"]}
+
+    @pytest.fixture(autouse=True)
+    def clear_connections(self):
+        EmailNotifier._connections.clear()
+        yield
+        EmailNotifier._connections.clear()
+
+    def test_connection_reused_and_reconnected(self):
+        """复用已登录的 SSL 连接，断开后重连重发"""
+        stale, fresh = MagicMock(), MagicMock()
+        stale.send_message.side_effect = [None, smtplib.SMTPServerDisconnected()]
+
+        with patch.object(smtplib, "SMTP_SSL", side_effect=[stale, fresh]) as smtp_ssl:
+            assert EmailNotifier(self.CONFIG).send("first", "title")
+            assert EmailNotifier(self.CONFIG).send("second")
+
+        assert smtp_ssl.call_count == 2
+        stale.starttls.assert_not_called()
+        msg = fresh.send_message.call_args.args[0]
+        assert not msg.is_multipart()
+        assert msg["Subject"] == "股票预警通知"
+        stale.quit.assert_called_once()
+
+    def test_connection_dropped_on_smtp_error(self):
+        """其他 SMTP 错误后关闭连接，下次发送重新建立"""
+        broken, fresh = MagicMock(), MagicMock()
+        broken.send_message.side_effect = smtplib.SMTPRecipientsRefused({})
+
+        with patch.object(smtplib, "SMTP_SSL", side_effect=[broken, fresh]) as smtp_ssl:
+            assert not EmailNotifier(self.CONFIG).send("first")
+            assert EmailNotifier(self.CONFIG).send("second")
+
+        assert smtp_ssl.call_count == 2
+        broken.quit.assert_called_once()
+
+    def test_accounts_do_not_block_each_other(self):
+        """不同账号的连接各自加锁，一个账号发送时另一个账号不必等待"""
+        import threading
+
+        sending = threading.Event()
+        release = threading.Event()
+        slow, quick = MagicMock(), MagicMock()
+        slow.send_message.side_effect = lambda msg: (sending.set(), release.wait(5))
+        other = dict(self.CONFIG, username="v")
+
+        with patch.object(smtplib, "SMTP_SSL", side_effect=[slow, quick]):
+            thread = threading.Thread(target=EmailNotifier(self.CONFIG).send, args=("slow",))
+            thread.start()
+            assert sending.wait(5)
+            assert EmailNotifier(other).send("quick")
+            release.set()
+            thread.join(5)
+
+        quick.send_message.assert_called_once()
+
+    def test_close_all_quits_connections(self):
+        """进程退出时关闭所有缓存的连接"""
+        server = MagicMock()
+        with patch.object(smtplib, "SMTP_SSL", return_value=server):
+            EmailNotifier(self.CONFIG).send("hello")
+
+        EmailNotifier._close_all()
+
+        server.quit.assert_called_once()
+        assert EmailNotifier._connections == {}
+
+
+@pytest.mark.unit
+class TestSendNotificationsAsync:
+    """send_notifications_async 单元测试"""
+
+    def test_batch_shares_async_client(self):
+        """同一批通知共用传入的异步客户端，结果按顺序返回"""
+        client = MagicMock()
+        client.post = AsyncMock(side_effect=[_response({"errcode": 0}), _response({"errcode": 310000})])
+        notifier = DingTalkNotifier({"webhook": "https://example.com/robot?access_token=x",
+                                     "secret": "SEC123"})
+
+        async def run():
+            return await asyncio.gather(notifier.asend("a", client=client),
+                                        notifier.asend("b", client=client))
+
+        assert asyncio.run(run()) == [True, False]
+        assert client.post.await_count == 2
+
+    def test_falls_back_to_threads_without_httpx(self):
+        """未安装 httpx 时在线程池中调用同步 send"""
+        notifier = MagicMock()
+        notifier.asend = lambda message, title=None: asyncio.to_thread(
+            lambda: message == "ok")
+
+        with patch.object(notification, "httpx", None):
+            results = asyncio.run(send_notifications_async(
+                [(notifier, "ok", None), (notifier, "bad", "t")]))
+
+        assert results == [True, False]
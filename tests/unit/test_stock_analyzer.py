@@ -0,0 +1,231 @@
+"""
+个股综合分析测试
+
+使用 Mock 的数据获取函数测试 analyze_stock。
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+from unittest.mock import MagicMock, patch
+
+from openclaw_stock.analysis import stock_analyzer
+from openclaw_stock.analysis.stock_analyzer import analyze_stock, analyze_stocks
+
+
+def _kline(days: int = 80) -> pd.DataFrame:
+    """单边上涨的日K线"""
+    close = np.linspace(10.0, 20.0, days)
+    return pd.DataFrame({
+        "date": pd.date_range("2024-01-01", periods=days).strftime("%Y-%m-%d"),
+        "open": close,
+        "high": close + 0.2,
+        "low": close - 0.2,
+        "close": close,
+        "volume": np.full(days, 1e6),
+    })
+
+
+@pytest.fixture
+def fetchers():
+    """替换 analyze_stock 使用的各数据获取函数"""
+    mocks = {
+        "fetch_realtime_quote": MagicMock(return_value={"name": "平安银行", "price": 20.0}),
+        "fetch_market_data": MagicMock(return_value=_kline()),
+        "calculate_fundamental_indicators": MagicMock(return_value={
+            "valuation": {"pe_ttm": 8.0, "pb": 0.8},
+            "profitability": {"roe": 12.0, "net_margin": 20.0},
+            "growth": {"revenue_growth": 5.0, "profit_growth": 6.0},
+            "quality": {},
+        }),
+        "fetch_capital_flow": MagicMock(return_value={"main_inflow": 1000.0, "retail_inflow": -500.0}),
+        "fetch_stock_news": MagicMock(return_value={"news_count": 1, "news_list": [{"title": "公告"}]}),
+    }
+    with patch.object(stock_analyzer, "ak", MagicMock()), \
+            patch.multiple(stock_analyzer, **mocks):
+        yield mocks
+
+
+@pytest.mark.unit
+class TestAnalyzeStock:
+    """analyze_stock 单元测试"""
+
+    def test_data_stages_run_concurrently(self, fetchers):
+        """行情、K线、基本面、资金流向同时请求"""
+        barrier = threading.Barrier(4, timeout=5)
+        for name in ("fetch_realtime_quote", "fetch_market_data",
+                     "calculate_fundamental_indicators", "fetch_capital_flow"):
+            mock = fetchers[name]
+            value = mock.return_value
+            mock.side_effect = lambda *args, _value=value, **kwargs: (barrier.wait(), _value)[1]
+
+        result = analyze_stock("000001", market="sz")
+
+        assert result["basic_info"]["current_price"] == 20.0
+        assert result["technical_analysis"]["trend"] == "上升趋势"
+        assert result["fundamental_analysis"]["analysis"]["valuation_level"] == "低估值"
+        assert result["fund_flow_analysis"]["main_inflow_5d"] == 1000.0
+
+    def test_latest_indicators_from_last_row(self, fetchers):
+        """最新指标取自最后一行，NaN 与缺失列为 None"""
+        result = analyze_stock("000001", market="sz")
+
+        indicators = result["technical_analysis"]["indicators"]
+        assert result["technical_analysis"]["current_price"] == 20.0
+        assert indicators["ma5"] == pytest.approx(np.linspace(10.0, 20.0, 80)[-5:].mean())
+        assert set(indicators) == {"ma5", "ma10", "ma20", "ma60", "rsi6", "macd_hist"}
+        assert all(v is None or isinstance(v, float) for v in indicators.values())
+
+    def test_max_drawdown_from_kline(self, fetchers):
+        """最大回撤由已获取的K线计算"""
+        df = _kline(5)
+        df["close"] = [10.0, 12.0, 9.0, 11.0, 13.0]
+        fetchers["fetch_market_data"].return_value = df
+
+        risk = analyze_stock("000001", market="sz")["risk_assessment"]
+
+        assert risk["max_drawdown_estimate"] == -0.25
+
+    @pytest.mark.parametrize("close, expected", [
+        ([10.0, np.nan, 12.0, 0.0, 9.0, 13.0], -0.25),
+        ([np.nan, 0.0, np.nan, -1.0, np.nan], None),
+    ])
+    def test_max_drawdown_skips_invalid_close(self, fetchers, close, expected):
+        """NaN 与非正收盘价不参与回撤计算，全部无效时为 None"""
+        df = _kline(len(close))
+        df["close"] = close
+        fetchers["fetch_market_data"].return_value = df
+
+        risk = analyze_stock("000001", market="sz")["risk_assessment"]
+
+        assert risk["max_drawdown_estimate"] == expected
+
+    def test_prediction_score(self, fetchers):
+        """各命中因素按权重累加到 50% 基准上，并按顺序列出"""
+        weights = {"技术趋势向上": 20, "技术指标买入信号": 15, "技术指标卖出信号": -15,
+                   "估值偏低": 10, "主力资金净流入": 10}
+
+        prediction = analyze_stock("000001", market="sz")["prediction"]
+
+        factors = prediction["key_factors"]
+        assert factors[0] == "技术趋势向上"
+        assert factors[-2:] == ["估值偏低", "主力资金净流入"]
+        assert prediction["probability"] == (50 + sum(weights[f] for f in factors)) / 100
+        assert prediction["trend"] == "up" and prediction["trend_cn"] == "上涨"
+
+    def test_missing_price_skips_target_range(self, fetchers):
+        """行情价格缺失（缓存命中时 NaN 为 None）时不计算目标价，不影响其余结果"""
+        fetchers["fetch_realtime_quote"].return_value = {"name": "平安银行", "price": None}
+
+        result = analyze_stock("000001", market="sz")
+
+        assert result["basic_info"]["current_price"] is None
+        assert result["prediction"]["trend"] == "up"
+        assert result["prediction"]["target_price_high"] is None
+
+    def test_news_uses_quote_name(self, fetchers):
+        """新闻在行情返回后按股票名称检索"""
+        result = analyze_stock("000001", market="sz")
+
+        fetchers["fetch_stock_news"].assert_called_once_with(symbol="000001", stock_name="平安银行", limit=10)
+        assert result["news_analysis"]["news_count"] == 1
+
+    def test_failed_stage_is_isolated(self, fetchers):
+        """单个阶段失败不影响其他阶段"""
+        fetchers["fetch_realtime_quote"].side_effect = ConnectionError("timeout")
+        fetchers["calculate_fundamental_indicators"].side_effect = ConnectionError("timeout")
+
+        result = analyze_stock("000001", market="sz")
+
+        assert result["basic_info"] == {}
+        assert result["fundamental_analysis"] == {}
+        assert result["technical_analysis"]["trend"] == "上升趋势"
+        fetchers["fetch_stock_news"].assert_called_once_with(symbol="000001", stock_name="", limit=10)
+
+    @pytest.mark.parametrize("pe, expected", [(8.0, "low"), (30.0, "medium"), (80.0, "high")])
+    def test_overall_risk(self, fetchers, pe, expected):
+        """两项及以上为低/高时综合风险随之变化，否则为中等"""
+        fetchers["calculate_fundamental_indicators"].return_value["valuation"]["pe_ttm"] = pe
+
+        risk = analyze_stock("000001", market="sz")["risk_assessment"]
+
+        assert risk["volatility_risk"] == "high" and risk["trend_risk"] == "low"
+        assert risk["overall_risk"] == expected
+
+
+@pytest.mark.unit
+class TestAnalyzeStocks:
+    """analyze_stocks 单元测试"""
+
+    def test_symbols_analyzed_in_parallel(self, fetchers):
+        """多只股票同时分析，结果按输入顺序返回"""
+        barrier = threading.Barrier(3, timeout=5)
+        value = fetchers["fetch_realtime_quote"].return_value
+        fetchers["fetch_realtime_quote"].side_effect = lambda *args, **kwargs: (barrier.wait(), value)[1]
+
+        results = analyze_stocks(["600000", "000001", "600000", "300750"], max_workers=3)
+
+        assert list(results) == ["600000", "000001", "300750"]
+        assert all(r["basic_info"]["current_price"] == 20.0 for r in results.values())
+
+    def test_failed_symbol_recorded(self, fetchers):
+        """单只股票分析失败时记录错误，不影响其他股票"""
+        with patch.object(stock_analyzer, "analyze_stock",
+                          side_effect=[{"symbol": "600000"}, RuntimeError("boom")]):
+            results = analyze_stocks(["600000", "000001"], max_workers=1)
+
+        assert results["600000"] == {"symbol": "600000"}
+        assert results["000001"] == {"symbol": "000001", "error": "boom"}
+
+
+@pytest.mark.unit
+class TestMarketDataTtl:
+    """_market_data_ttl 单元测试"""
+
+    def test_live_range_uses_short_ttl(self):
+        """区间截止到今天或未指定截止日时短期缓存，历史区间按天缓存"""
+        today = stock_analyzer.datetime.now().strftime("%Y%m%d")
+
+        assert stock_analyzer._market_data_ttl({"end_date": today}) == 60
+        assert stock_analyzer._market_data_ttl({"end_date": None}) == 60
+        assert stock_analyzer._market_data_ttl({"end_date": "20240131"}) == 86400
+
+
+@pytest.mark.unit
+class TestPredictionRecommendation:
+    """_get_prediction_recommendation 单元测试"""
+
+    @pytest.mark.parametrize("trend, probability, risk_level, expected", [
+        ("up", 0.8, "中等", "建议买入"),
+        ("up", 0.8, "高", "建议谨慎买入，注意风险控制"),
+        ("up", 0.6, "高", "建议关注，等待更好的入场时机"),
+        ("up", 0.5, "低", "建议观望"),
+        ("down", 0.75, "低", "建议卖出或观望"),
+        ("down", 0.55, "低", "建议减仓或观望"),
+        ("sideways", 0.9, "低", "建议观望，等待趋势明朗"),
+    ])
+    def test_recommendation(self, trend, probability, risk_level, expected):
+        """按趋势、概率档位和风险等级给出建议"""
+        assert stock_analyzer._get_prediction_recommendation(trend, probability, risk_level) == expected
+
+
+@pytest.mark.unit
+class TestStockAnalyzerReport:
+    """StockAnalyzer.generate_report 单元测试"""
+
+    def test_report_sections(self, fetchers):
+        """报告包含六个章节，首尾为分隔线且无多余换行"""
+        result = analyze_stock("000001", market="sz")
+
+        report = stock_analyzer.StockAnalyzer().generate_report(result)
+
+        lines = report.split("\n")
+        assert lines[0] == lines[-1] == "=" * 60
+        assert lines[1].strip() == "000001 (平安银行) 综合分析报告"
+        for title in ("【一、技术面分析】", "【二、基本面分析】", "【三、资金流向分析】",
+                      "【四、新闻面分析】", "【五、风险评估】", "【六、后市预测】"):
+            assert title in lines
+        assert "近5日主力资金净流入：1000.00 万元" in lines
+        assert "1. 公告" in lines